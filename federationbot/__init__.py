@@ -2,11 +2,11 @@
 
 from __future__ import annotations
 
-from typing import Any, Collection, Sequence, cast
+from typing import Any, AsyncIterator, Awaitable, Callable, Collection, Final, Iterator, Sequence, TypeVar, cast
 from asyncio import QueueEmpty
 from contextlib import suppress
-from datetime import datetime
 from itertools import chain
+from operator import itemgetter
 import asyncio
 import hashlib
 import json
@@ -16,13 +16,15 @@ import time
 from canonicaljson import encode_canonical_json
 from maubot.handlers import command
 from mautrix.errors.request import MForbidden, MTooLarge
-from mautrix.types import EventID, Membership, RoomID
+from mautrix.types import EventID, RoomID
 from more_itertools import partition
 from unpaddedbase64 import encode_base64
 
 from federationbot.commands.room_walk import RoomWalkCommand
 from federationbot.constants import (
     BACKOFF_MULTIPLIER,
+    DELEGATION_ERROR_CACHE_TTL_MS,
+    HTTP_STATUS_OK,
     MAX_NUMBER_OF_SERVERS_TO_ATTEMPT,
     NOT_IN_ROOM_ERROR,
     SECONDS_BETWEEN_EDITS,
@@ -34,22 +36,22 @@ from federationbot.controllers import EmojiReactionCommandStatus
 from federationbot.events import CreateRoomStateEvent, Event, EventBase, EventError, GenericStateEvent, redact_event
 from federationbot.resolver import (
     Diagnostics,
-    ServerDiscoveryDnsResult,
     ServerDiscoveryResult,
     WellKnownDiagnosticResult,
     WellKnownLookupFailure,
-    WellKnownLookupResult,
 )
 from federationbot.responses import MakeJoinResponse, MatrixError, MatrixFederationResponse, MatrixResponse
 from federationbot.protocols import MessageEvent
 from federationbot.utils.bitmap_progress import BitmapProgressBar, BitmapProgressBarStyle
 from federationbot.utils.colors import Colors
-from federationbot.utils.display import DisplayLineColumnConfig, Justify, pad
+from federationbot.utils.display import DisplayLineColumnConfig, Justify, render_table_header
 from federationbot.utils.formatting import (
     add_color,
     bold,
     combine_lines_to_fit_event,
     combine_lines_to_fit_event_html,
+    iter_lines_to_fit_event,
+    pretty_json,
     wrap_in_code_block_markdown,
     wrap_in_details,
 )
@@ -59,12 +61,76 @@ from federationbot.utils.matrix import (
     is_mxid,
     is_room_id,
     is_room_id_or_alias,
+    make_into_code_block_event,
     make_into_text_event,
 )
 from federationbot.utils.numbers import is_int, round_half_up
 from federationbot.utils.time import pretty_print_timestamp
 
-json_decoder = json.JSONDecoder()
+T = TypeVar("T")
+
+# The summary never changes, so build it once instead of on every use of the command
+DELEGATION_SUMMARY: Final[str] = (
+    "Summary of how Delegation is processed for a Matrix homeserver.\n"
+    "The process to determine the ultimate final host:port is defined in "
+    "the [spec](https://spec.matrix.org/v1.9/server-server-api/#resolving-"
+    "server-names)\n"
+    + wrap_in_code_block_markdown(
+        "Basically:\n"
+        "1. If it's a literal IP, then use that either with the port supplied "
+        "or 8448\n"
+        "2. If it's a hostname with an explicit port, resolve with DNS to an "
+        "A, AAAA or CNAME record\n"
+        "3. If it's a hostname with no explicit port, request from\n"
+        "   <server_name>/.well-known/matrix/server and parse the json. "
+        "Anything\n"
+        "   wrong, skip to step 4. Want "
+        "<delegated_server_name>[:<delegated_port>]\n"
+        "   3a. Same as 1 above, except don't just use 8448(step 3e)\n"
+        "   3b. Same as 2 above.\n"
+        "   3c. If no explicit port, check for a SRV record at\n"
+        "       _matrix-fed._tcp.<delegated_server_name> to get the port "
+        "number.\n"
+        "       Resolve with A or AAAA(but not CNAME) record\n"
+        "   3d. (deprecated) Check _matrix._tcp.<delegated_server_name> "
+        "instead\n"
+        "   3e. (there was no port, remember), resolve using provided "
+        "delegated\n"
+        "       hostname and use port 8448\n"
+        "4. (no well-known) Check SRV record(same as 3c above)\n"
+        "5. (deprecated) Check other SRV record(same as 3d above)\n"
+        "6. Use the supplied server_name and try port 8448\n",
+    )
+)
+
+
+def _flatten_verify_keys(server_keys: dict[str, Any], time_now: int) -> list[tuple[str, str]]:
+    """
+    Flatten one server's keys into display rows, current keys first and then the old ones.
+
+    Args:
+        server_keys: A server keys object, either a /key/v2/server response or one entry of a notary response
+        time_now: The current time in milliseconds, keys that expired before it are marked with a *
+
+    Returns:
+        List of (key id, formatted validity timestamp) tuples
+    """
+    key_rows: list[tuple[str, str]] = []
+    # All the current keys share the one valid_until_ts, so only format it once
+    valid_until_ts = server_keys.get("valid_until_ts", 0)
+    valid_until_pretty = (
+        f"{'*' if valid_until_ts < time_now else ''}"
+        f"{pretty_print_timestamp(valid_until_ts) if valid_until_ts > 0 else 'None Found'}"
+    )
+    # cast these to a str explicitly, in case someone gets funny ideas
+    key_rows.extend((str(key_id), valid_until_pretty) for key_id in server_keys.get("verify_keys", {}))
+
+    for key_id, key_data in server_keys.get("old_verify_keys", {}).items():
+        expired_ts = key_data.get("expired_ts", 0)
+        expired_pretty = pretty_print_timestamp(expired_ts) if expired_ts > 0 else "None Found"
+        key_rows.append((str(key_id), f"{'*' if expired_ts < time_now else ''}{expired_pretty}"))
+
+    return key_rows
 
 
 class FederationBot(RoomWalkCommand):
@@ -97,13 +163,15 @@ class FederationBot(RoomWalkCommand):
         )
 
         finish_on_this_round = False
+        # The last frame sent, the caches often sit unchanged between updates and there's no point editing then
+        last_buffered_line = ""
         while True:
             if self.reaction_task_controller.is_stopped(pinned_message):
                 finish_on_this_round = True
 
             if self.reaction_task_controller.is_paused(pinned_message):
                 # A pause just means not adding anything to the screen, until restarted
-                await asyncio.sleep(1)
+                await self.reaction_task_controller.wait_for_status_change(pinned_message, 5.0)
                 continue
 
             # TODO: Lose this after Tom saw
@@ -123,14 +191,16 @@ class FederationBot(RoomWalkCommand):
                 f" Number of task sets: {len(self.reaction_task_controller.tasks_sets)}\n"
                 f" Number of commands with tracked reactions: {len(self.reaction_task_controller.tracked_reactions)}\n"
             )
-            await command_event.respond(
-                make_into_text_event(wrap_in_code_block_markdown(buffered_line)),
-                edits=pinned_message,
-            )
+            if buffered_line != last_buffered_line:
+                await command_event.respond(
+                    make_into_code_block_event(buffered_line),
+                    edits=pinned_message,
+                )
+                last_buffered_line = buffered_line
 
             if finish_on_this_round:
                 break
-            await asyncio.sleep(5.0)
+            await self.reaction_task_controller.wait_for_status_change(pinned_message, 5.0)
 
         await self.reaction_task_controller.cancel(pinned_message, True)
 
@@ -179,9 +249,9 @@ class FederationBot(RoomWalkCommand):
         """
         await command_event.mark_read()
         test_message_list = []
-        test_message_list.extend(["OKAY"])
-        test_message_list.extend(["WARN"])
-        test_message_list.extend(["ERROR"])
+        test_message_list.append("OKAY")
+        test_message_list.append("WARN")
+        test_message_list.append("ERROR")
 
         await command_event.respond(
             make_into_text_event(
@@ -191,9 +261,9 @@ class FederationBot(RoomWalkCommand):
             allow_html=True,
         )
         test_message_list = []
-        test_message_list.extend([add_color(bold("OKAY"), foreground=Colors.WHITE, background=Colors.GREEN)])
-        test_message_list.extend([add_color(bold("WARN"), foreground=Colors.BLACK, background=Colors.YELLOW)])
-        test_message_list.extend([add_color(bold("ERROR"), foreground=Colors.WHITE, background=Colors.RED)])
+        test_message_list.append(add_color(bold("OKAY"), foreground=Colors.WHITE, background=Colors.GREEN))
+        test_message_list.append(add_color(bold("WARN"), foreground=Colors.BLACK, background=Colors.YELLOW))
+        test_message_list.append(add_color(bold("ERROR"), foreground=Colors.WHITE, background=Colors.RED))
 
         await command_event.respond(
             make_into_text_event(
@@ -257,7 +327,10 @@ class FederationBot(RoomWalkCommand):
             room_id_or_alias: Room alias to look up
             target_server: Optional server to query, defaults to alias's server
         """
-        origin_server = self.federation_handler.hosting_server
+        origin_server = await self.get_origin_server_and_assert_key_exists(command_event)
+        if not origin_server:
+            return
+
         destination_server = target_server or room_id_or_alias.split(":", maxsplit=1)[1]
         self.log.warning("alias server: %s, alias: %s", destination_server, room_id_or_alias)
         if room_id_or_alias.startswith("!"):
@@ -268,7 +341,7 @@ class FederationBot(RoomWalkCommand):
             destination_server,
             room_id_or_alias,
         )
-        await command_event.respond(wrap_in_code_block_markdown(json.dumps(stuff.json_response, indent=4)))
+        await command_event.respond(wrap_in_code_block_markdown(pretty_json(stuff.json_response)))
 
     @test_command.subcommand(
         name="room_walk2",
@@ -297,7 +370,7 @@ class FederationBot(RoomWalkCommand):
         # Let the user know the bot is paying attention
         await command_event.mark_read()
 
-        if get_domain_from_id(command_event.sender) != get_domain_from_id(self.client.mxid):
+        if get_domain_from_id(command_event.sender) != self.hosting_server:
             await command_event.reply(
                 "I'm sorry, running this command from a user not on the same server as the bot will not help",
             )
@@ -380,27 +453,24 @@ class FederationBot(RoomWalkCommand):
             Returns:
                 Tuple of (events_found, events_not_found) as sets of event IDs
             """
-            next_batch: set[str] = set()
-            error_batch: set[str] = set()
-
             pulled_event_map = await self.federation_handler.get_events_from_server(
                 origin_server=origin_server,
                 destination_server=destination_server,
                 events_list=event_id_list_of_ancestors,
             )
-            # This is to provide a nice reference, in case an event was not found
-            for _event_id in event_id_list_of_ancestors:
-                pulled_event = pulled_event_map.get(_event_id)
-                if isinstance(pulled_event, EventError):
-                    error_batch.add(_event_id)
-
-                else:
-                    next_batch.add(_event_id)
+            # This is to provide a nice reference, in case an event was not found. Build
+            # both sets in bulk, whatever did not come back as an error was found
+            error_batch = {
+                _event_id
+                for _event_id in event_id_list_of_ancestors
+                if isinstance(pulled_event_map.get(_event_id), EventError)
+            }
+            next_batch = set(event_id_list_of_ancestors) - error_batch
 
             return next_batch, error_batch
 
         # Get the last event that was in the room, for its depth and as a starting spot
-        now = int(time.time() * 1000)
+        now = time.time_ns() // 1_000_000
         # TODO: swap this out for 'fed head'
         ts_response = await self.federation_handler.api.get_timestamp_to_event(
             origin_server=origin_server,
@@ -417,7 +487,7 @@ class FederationBot(RoomWalkCommand):
         pinned_message = cast(
             "EventID",
             await command_event.respond(
-                make_into_text_event(wrap_in_code_block_markdown("Just a moment while I prepare a few things\n")),
+                make_into_code_block_event("Just a moment while I prepare a few things\n"),
             ),
         )
         # The initial starting point for the room walk
@@ -450,7 +520,7 @@ class FederationBot(RoomWalkCommand):
         for host in host_list:
             server_check = self.federation_handler.api.server_discovery_cache.get(host, None)
             if server_check and server_check.unhealthy is None:
-                good_host_list.extend((host,))
+                good_host_list.append(host)
             else:
                 self.log.warning("not using %s for room_walk2", host)
         # Can now use good_host_list as an ordered list of servers to check for Events
@@ -458,8 +528,8 @@ class FederationBot(RoomWalkCommand):
         # Initial messages and lines setup. Never end in newline, as the helper handles
         header_lines = ["Room Back-walking Procedure: Running"]
         static_lines = []
-        static_lines.extend(["------------------------------------"])
-        static_lines.extend([f"Room Depth reported as: {room_depth}"])
+        static_lines.append("------------------------------------")
+        static_lines.append(f"Room Depth reported as: {room_depth}")
 
         discovery_lines: list[str] = []
         progress_bar = BitmapProgressBar(30, room_depth)
@@ -476,23 +546,13 @@ class FederationBot(RoomWalkCommand):
             Returns:
                 Combined string with all sections formatted with newlines
             """
-            combined_lines = ""
-            for line in header_lines:
-                combined_lines += line + "\n"
-            for line in static_lines:
-                combined_lines += line + "\n"
-            for line in discovery_lines:
-                combined_lines += line + "\n"
-            combined_lines += progress_line + "\n"
-            nonlocal roomwalk_lines
-            for line in roomwalk_lines:
-                combined_lines += line + "\n"
-
-            return combined_lines
+            # Build it in one pass, this runs on every progress update
+            all_lines = chain(header_lines, static_lines, discovery_lines, (progress_line,), roomwalk_lines)
+            return "\n".join(all_lines) + "\n"
 
         # Begin the render, replace the original message
         await command_event.respond(
-            make_into_text_event(wrap_in_code_block_markdown(_combine_lines_for_backwalk())),
+            make_into_code_block_event(_combine_lines_for_backwalk()),
             edits=pinned_message,
         )
 
@@ -621,7 +681,7 @@ class FederationBot(RoomWalkCommand):
                     )
 
                 # Tuple of time spent(for calculating backoff) and if we are done
-                render_list.extend([(total_time_spent, False)])
+                render_list.append((total_time_spent, False))
 
                 _event_fetch_queue.task_done()
                 bot_working[worker_name] = False
@@ -800,7 +860,7 @@ class FederationBot(RoomWalkCommand):
                 list_of_pdus_to_send = []
                 for (event_base,) in list_of_server_and_event_id_to_send:
                     assert isinstance(event_base, Event)
-                    list_of_pdus_to_send.extend([event_base.raw_data])
+                    list_of_pdus_to_send.append(event_base.raw_data)
 
                 while list_of_pdus_to_send:
                     limited_list_of_pdus = list_of_pdus_to_send[:50]
@@ -831,7 +891,7 @@ class FederationBot(RoomWalkCommand):
 
                 # Update for the render
                 # end_time = time.time() - start_time
-                render_list.extend([(0.0, False)])
+                render_list.append((0.0, False))
                 _event_error_queue.task_done()
 
                 # Set up the retry task, but only if an event was actually sent
@@ -956,8 +1016,10 @@ class FederationBot(RoomWalkCommand):
             bot_working.setdefault(f"roomwalk_worker_{i}", False)
 
         roomwalk_cumulative_iter_time = 0.0
-        # Number of times we've re-rendered status
+        # Number of status updates that had new work to show
         roomwalk_iterations = 0
+        # The last frame sent, so an update with nothing new doesn't cost an edit
+        last_rendered_frame = ""
         # List of tuples, (time_spent float, bool if we are done)
         render_list: list[tuple[float, bool]] = []
         last_count_of_events_processed = 0
@@ -984,7 +1046,7 @@ class FederationBot(RoomWalkCommand):
 
             if self.reaction_task_controller.is_paused(pinned_message):
                 # A pause just means not adding anything to the screen, until restarted
-                await asyncio.sleep(1)
+                await self.reaction_task_controller.wait_for_status_change(pinned_message, SECONDS_BETWEEN_EDITS)
                 continue
 
             if roomwalk_fetch_queue.qsize() == 0 and roomwalk_error_queue.qsize() == 0:
@@ -996,9 +1058,9 @@ class FederationBot(RoomWalkCommand):
                 else:
                     retry_for_finish = 0
 
-            # pinch off the list of things to work on
-            new_items_to_render = render_list.copy()
-            render_list = []
+            # pinch off the list of things to work on. Swap in a fresh list rather than copying, the fetchers
+            # append through the closure so they pick up the new one straight away
+            new_items_to_render, render_list = render_list, []
             # self.log.info(f"LENGTH of render_list: {len(new_items_to_render)}")
 
             # self.log.info(f"SIZE of queue: {roomwalk_fetch_queue.qsize()}")
@@ -1007,7 +1069,8 @@ class FederationBot(RoomWalkCommand):
                 if finish:
                     finish_on_this_round = True
                 roomwalk_cumulative_iter_time += time_spent
-            roomwalk_iterations = roomwalk_iterations + 1
+            if new_items_to_render:
+                roomwalk_iterations += 1
             current_count_of_events_processed = len(event_id_ok_list.union(event_id_error_list))
             # Want it to look like:
             #
@@ -1037,31 +1100,31 @@ class FederationBot(RoomWalkCommand):
                 f"Total number of workers: {len(self.reaction_task_controller.tasks_sets[pinned_message].tasks)}",
             ]
             if retry_for_finish:
-                roomwalk_lines.extend([f"Might be out of work, retry count:{retry_for_finish}"])
+                roomwalk_lines.append(f"Might be out of work, retry count:{retry_for_finish}")
 
             # Only print something if there is something to say
-            await command_event.respond(
-                make_into_text_event(
-                    wrap_in_code_block_markdown(_combine_lines_for_backwalk()),
-                ),
-                edits=pinned_message,
-            )
+            rendered_frame = _combine_lines_for_backwalk()
+            if rendered_frame != last_rendered_frame:
+                await command_event.respond(
+                    make_into_code_block_event(rendered_frame),
+                    edits=pinned_message,
+                )
+                last_rendered_frame = rendered_frame
             last_count_of_events_processed = current_count_of_events_processed
             if finish_on_this_round:
                 break
 
-            await asyncio.sleep(SECONDS_BETWEEN_EDITS)
+            # A Stop reaction will wake this early, so the walk finishes without waiting out the interval
+            await self.reaction_task_controller.wait_for_status_change(pinned_message, SECONDS_BETWEEN_EDITS)
 
         # Clean up the task controller
         await self.reaction_task_controller.cancel(pinned_message, True)
 
         header_lines = ["Room Back-walking Procedure: Done"]
 
-        roomwalk_lines.extend(["Done"])
+        roomwalk_lines.append("Done")
         await command_event.respond(
-            make_into_text_event(
-                wrap_in_code_block_markdown(_combine_lines_for_backwalk()),
-            ),
+            make_into_code_block_event(_combine_lines_for_backwalk()),
             edits=pinned_message,
         )
         event_ids_that_errored_message = ""
@@ -1179,7 +1242,7 @@ class FederationBot(RoomWalkCommand):
         for host in host_list:
             server_result = self.federation_handler.api.server_discovery_cache.get(host, None)
             if server_result and not server_result.unhealthy:
-                good_host_list.extend((host,))
+                good_host_list.append(host)
                 # TODO: do we want to track the bad host list too?
 
         # 3. Hunt for the event on those hosts, start at the top. Make a note when
@@ -1269,11 +1332,7 @@ class FederationBot(RoomWalkCommand):
                     [event_base.raw_data],
                 )
                 self.log.info("SENT, got response of %s", response.json_response)
-                list_of_buffer_lines.extend(
-                    [
-                        f"response from server_to_fix:\n{json.dumps(response.json_response, indent=4)}",
-                    ]
-                )
+                list_of_buffer_lines.append(f"response from server_to_fix:\n{pretty_json(response.json_response)}")
             else:
                 self.log.info("Unexpectedly not sent %s", event_base)
 
@@ -1342,9 +1401,7 @@ class FederationBot(RoomWalkCommand):
 
         if origin_server_ts:
             # A nice little addition for the status updated before the command runs
-            special_time_formatting = (
-                f"\n  * which took place at: {datetime.fromtimestamp(float(origin_server_ts / 1000))} UTC"
-            )
+            special_time_formatting = f"\n  * which took place at: {pretty_print_timestamp(origin_server_ts)} UTC"
         else:
             special_time_formatting = ""
 
@@ -1372,16 +1429,9 @@ class FederationBot(RoomWalkCommand):
         # Time to start rendering. Build the header lines first
         header_message = "Hosts in order of state membership joins\n"
 
-        list_of_buffer_lines = []
-
-        if limit:
-            # if limit is more than the number of hosts, fix it
-            limit = min(limit, len(host_list))
-            for host_number in range(0, limit):
-                list_of_buffer_lines.extend([f"{host_list[host_number : host_number + 1]}\n"])
-        else:
-            for host in host_list:
-                list_of_buffer_lines.extend([f"['{host}']\n"])
+        # Slicing past the end is fine, so a limit larger than the number of hosts needs no fixing
+        hosts_to_display = host_list[: max(limit, 0)] if limit else host_list
+        list_of_buffer_lines = [f"['{host}']\n" for host in hosts_to_display]
 
         # Chunk the data as there may be a few 'pages' of it
         final_list_of_data = combine_lines_to_fit_event(list_of_buffer_lines, header_message)
@@ -1390,7 +1440,7 @@ class FederationBot(RoomWalkCommand):
             current_message_id = await command_event.respond(
                 make_into_text_event(wrap_in_code_block_markdown(chunk), ignore_body=True),
             )
-            list_of_message_ids.extend([current_message_id])
+            list_of_message_ids.append(current_message_id)
         for message_id in list_of_message_ids:
             await self.reaction_task_controller.add_cleanup_control(message_id, command_event.room_id)
 
@@ -1449,10 +1499,10 @@ class FederationBot(RoomWalkCommand):
 
         if style_type == BitmapProgressBarStyle.SCATTER:
             for i in range(1, max_size_int + 1):
-                range_list.extend([i])
+                range_list.append(i)
         else:
             for i in range(1, int(round_half_up(num_of_intervals)) + 1):
-                range_list.extend([i * how_many_to_pull])
+                range_list.append(i * how_many_to_pull)
         pinned_message = cast(
             "EventID",
             await command_event.respond(
@@ -1462,7 +1512,7 @@ class FederationBot(RoomWalkCommand):
                 ),
             ),
         )
-        list_of_message_ids.extend([pinned_message])
+        list_of_message_ids.append(pinned_message)
 
         finish = False
         while True:
@@ -1628,16 +1678,16 @@ class FederationBot(RoomWalkCommand):
         redacted_data.pop("signatures", None)
         redacted_data.pop("unsigned", None)
         current_message = await command_event.respond(
-            f"Redacted:\n{wrap_in_code_block_markdown(json.dumps(redacted_data, indent=4))}",
+            f"Redacted:\n{wrap_in_code_block_markdown(pretty_json(redacted_data))}",
         )
-        list_of_message_ids.extend([current_message])
+        list_of_message_ids.append(current_message)
 
         encoded_redacted_event_bytes = encode_canonical_json(redacted_data)
         reference_content = hashlib.sha256(encoded_redacted_event_bytes)
         reference_hash = encode_base64(reference_content.digest(), True)
 
         current_message = await command_event.respond(f"Supplied: {event_id}\n\nResolved: {'$' + reference_hash}")
-        list_of_message_ids.extend([current_message])
+        list_of_message_ids.append(current_message)
         for message_id in list_of_message_ids:
             await self.reaction_task_controller.add_cleanup_control(message_id, command_event.room_id)
 
@@ -1654,7 +1704,10 @@ class FederationBot(RoomWalkCommand):
             room_id_or_alias: Room ID or alias to get head for
         """
         await command_event.mark_read()
-        origin_server = get_domain_from_id(self.client.mxid)
+        origin_server = await self.get_origin_server_and_assert_key_exists(command_event)
+        if not origin_server:
+            return
+
         room_id, list_of_room_alias_servers = await self.resolve_room_id_or_alias(
             room_id_or_alias,
             command_event,
@@ -1700,7 +1753,7 @@ class FederationBot(RoomWalkCommand):
             current_message = await command_event.respond(
                 "Failed getting hosts from State over federation, falling back to client API",
             )
-            list_of_message_ids.extend([current_message])
+            list_of_message_ids.append(current_message)
             try:
                 joined_members = await self.client.get_joined_members(RoomID(room_id))
 
@@ -1708,10 +1761,8 @@ class FederationBot(RoomWalkCommand):
                 await command_event.respond(NOT_IN_ROOM_ERROR)
                 return
 
-            for member in joined_members:
-                host = get_domain_from_id(member)
-                if host not in host_list:
-                    host_list.extend([host])
+            # dict.fromkeys() de-duplicates while keeping the order the members came in
+            host_list = list(dict.fromkeys(map(get_domain_from_id, joined_members)))
 
         host_queue: asyncio.Queue[str] = asyncio.Queue()
         for host in host_list:
@@ -1798,19 +1849,17 @@ class FederationBot(RoomWalkCommand):
                     event_from_newest = retrieved_event
 
             assert event_from_newest is not None
-            glyph_auth_events = "".join(["A" for _ in event_from_newest.auth_events])
-            glyph_prev_events = "".join(["P" for _ in event_from_newest.prev_events])
-            list_of_buffered_messages.extend(
-                (
-                    f"{server_name_dc.pad(_host)}: {event_from_newest.event_id} | {pretty_print_timestamp(event_from_newest.origin_server_ts)} | {glyph_auth_events}:{glyph_prev_events}",
-                )
+            glyph_auth_events = "A" * len(event_from_newest.auth_events)
+            glyph_prev_events = "P" * len(event_from_newest.prev_events)
+            list_of_buffered_messages.append(
+                f"{server_name_dc.pad(_host)}: {event_from_newest.event_id} | {pretty_print_timestamp(event_from_newest.origin_server_ts)} | {glyph_auth_events}:{glyph_prev_events}",
             )
             _queue.task_done()
 
         async def _head_error_worker(_queue: asyncio.Queue[tuple[str, MatrixError]]) -> None:
             _host_error, _result_error = _queue.get_nowait()
-            list_of_buffered_messages.extend(
-                (f"{server_name_dc.pad(_host_error)}: {_result_error.http_code}, {_result_error.reason}",)
+            list_of_buffered_messages.append(
+                f"{server_name_dc.pad(_host_error)}: {_result_error.http_code}, {_result_error.reason}",
             )
             _queue.task_done()
 
@@ -1838,7 +1887,7 @@ class FederationBot(RoomWalkCommand):
             current_message = await command_event.respond(
                 make_into_text_event(wrap_in_code_block_markdown(message), ignore_body=True),
             )
-            list_of_message_ids.extend([current_message])
+            list_of_message_ids.append(current_message)
         for message_id in list_of_message_ids:
             await self.reaction_task_controller.add_cleanup_control(message_id, command_event.room_id)
 
@@ -1862,38 +1911,7 @@ class FederationBot(RoomWalkCommand):
 
         current_message = cast(
             "EventID",
-            await command_event.respond(
-                "Summary of how Delegation is processed for a Matrix homeserver.\n"
-                "The process to determine the ultimate final host:port is defined in "
-                "the [spec](https://spec.matrix.org/v1.9/server-server-api/#resolving-"
-                "server-names)\n"
-                + wrap_in_code_block_markdown(
-                    "Basically:\n"
-                    "1. If it's a literal IP, then use that either with the port supplied "
-                    "or 8448\n"
-                    "2. If it's a hostname with an explicit port, resolve with DNS to an "
-                    "A, AAAA or CNAME record\n"
-                    "3. If it's a hostname with no explicit port, request from\n"
-                    "   <server_name>/.well-known/matrix/server and parse the json. "
-                    "Anything\n"
-                    "   wrong, skip to step 4. Want "
-                    "<delegated_server_name>[:<delegated_port>]\n"
-                    "   3a. Same as 1 above, except don't just use 8448(step 3e)\n"
-                    "   3b. Same as 2 above.\n"
-                    "   3c. If no explicit port, check for a SRV record at\n"
-                    "       _matrix-fed._tcp.<delegated_server_name> to get the port "
-                    "number.\n"
-                    "       Resolve with A or AAAA(but not CNAME) record\n"
-                    "   3d. (deprecated) Check _matrix._tcp.<delegated_server_name> "
-                    "instead\n"
-                    "   3e. (there was no port, remember), resolve using provided "
-                    "delegated\n"
-                    "       hostname and use port 8448\n"
-                    "4. (no well-known) Check SRV record(same as 3c above)\n"
-                    "5. (deprecated) Check other SRV record(same as 3d above)\n"
-                    "6. Use the supplied server_name and try port 8448\n",
-                ),
-            ),
+            await command_event.respond(DELEGATION_SUMMARY),
         )
         await self.reaction_task_controller.add_cleanup_control(current_message, command_event.room_id)
 
@@ -1928,50 +1946,11 @@ class FederationBot(RoomWalkCommand):
             command_event: Event that triggered the command
             server_to_check: Server name to check delegation for
         """
-        list_of_servers_to_check = set()
-
         await command_event.mark_read()
 
-        # It may be that they are using their mxid as the server to check, parse that
-        maybe_user_mxid = is_mxid(server_to_check)
-        if maybe_user_mxid:
-            server_to_check = get_domain_from_id(maybe_user_mxid)
-
-        # As an undocumented option, allow passing in a room_id to check an entire room.
-        # This can be rather long(and time consuming) so we'll place limits later.
-        maybe_room_id = is_room_id_or_alias(server_to_check)
-        if maybe_room_id:
-            origin_server = get_domain_from_id(self.client.mxid)
-            room_to_check, _ = await self.resolve_room_id_or_alias(maybe_room_id, command_event, origin_server)
-            # Need to cancel server_to_check, but can't use None
-            server_to_check = ""
-            if not room_to_check:
-                # Don't need to actually display an error, that's handled in the above
-                # function
-                return
-        else:
-            # with server_to_check being set, this will be ignored any way
-            room_to_check = command_event.room_id
-
-        # server_to_check has survived this far, add it to the set of servers to search
-        # for. Since we allow for searching an entire room, it will be the only server
-        # in the set.
-        if server_to_check:
-            list_of_servers_to_check.add(server_to_check)
-
-        # The list of servers was empty. This implies that a room_id was provided,
-        # let's check.
-        if not list_of_servers_to_check:
-            try:
-                assert room_to_check is not None
-                joined_members = await self.client.get_joined_members(RoomID(room_to_check))
-
-            except MForbidden:
-                await command_event.respond(NOT_IN_ROOM_ERROR)
-                return
-
-            for member in joined_members:
-                list_of_servers_to_check.add(get_domain_from_id(member))
+        list_of_servers_to_check = await self.get_servers_to_check(server_to_check, command_event)
+        if list_of_servers_to_check is None:
+            return
 
         number_of_servers = len(list_of_servers_to_check)
 
@@ -1983,44 +1962,68 @@ class FederationBot(RoomWalkCommand):
         )
         list_of_message_ids: list[EventID] = [prerender_message]
 
-        # map of server name -> (server brand, server version)
-        server_to_server_data: dict[str, MatrixResponse] = {}
+        # Create the columns to be used. The workers widen them as their results come in
+        server_name_col = DisplayLineColumnConfig("Server Name")
+        well_known_status_col = DisplayLineColumnConfig("WK")
+        srv_status_col = DisplayLineColumnConfig("SRV")
+        dns_status_col = DisplayLineColumnConfig("DNS")
+        connective_test_status_col = DisplayLineColumnConfig("Test")
+        tls_served_by_col = DisplayLineColumnConfig("TLS served by")
+        retries_col = DisplayLineColumnConfig("Retries")
 
-        async def _delegation_worker(queue: asyncio.Queue[str]) -> None:
-            while True:
-                worker_server_name = await queue.get()
+        def _widen_columns_for(worker_server_name: str, response: MatrixResponse) -> None:
+            server_name_col.maybe_update_column_width(len(worker_server_name))
+            if response.diag_info:
+                maybe_tls_server = response.diag_info.tls_handled_by
+                if maybe_tls_server:
+                    tls_served_by_col.maybe_update_column_width(len(maybe_tls_server))
+
+        # A single server is being actively debugged, so always check it fresh. Room-wide
+        # scans can reuse results for servers that were checked a moment ago.
+        use_cached_results = number_of_servers > 1
+        request_semaphore = asyncio.Semaphore(MAX_NUMBER_OF_SERVERS_TO_ATTEMPT)
 
-                # The 'get_server_version' function was written with the capability of
-                # collecting diagnostic data.
-                try:
-                    server_to_server_data[worker_server_name] = await self.federation_handler.api.get_server_version(
+        async def _delegation_worker(worker_server_name: str) -> tuple[str, MatrixResponse | None]:
+            if use_cached_results and (cached_response := self.delegation_cache.get(worker_server_name)):
+                _widen_columns_for(worker_server_name, cached_response)
+                return worker_server_name, cached_response
+
+            # The 'get_server_version' function was written with the capability of
+            # collecting diagnostic data.
+            try:
+                async with request_semaphore:
+                    response = await self.federation_handler.api.get_server_version(
                         worker_server_name,
                         force_rediscover=True,
                         diagnostics=True,
                     )
-                except Exception as e:
-                    self.log.debug("delegation worker error: %r", e)
-                queue.task_done()
-
-        delegation_queue: asyncio.Queue[str] = asyncio.Queue()
-        for server_name in list_of_servers_to_check:
-            delegation_queue.put_nowait(server_name)
-
-        reference_key = self.reaction_task_controller.setup_task_set(command_event.event_id)
-
-        self.reaction_task_controller.add_tasks(
-            reference_key,
-            _delegation_worker,
-            delegation_queue,
-            limit=MAX_NUMBER_OF_SERVERS_TO_ATTEMPT,
-        )
+            except Exception as e:
+                self.log.debug("delegation worker error: %r", e)
+                return worker_server_name, None
+
+            self.delegation_cache.set(
+                worker_server_name,
+                response,
+                DELEGATION_ERROR_CACHE_TTL_MS if response.http_code != HTTP_STATUS_OK else None,
+            )
+            _widen_columns_for(worker_server_name, response)
+            return worker_server_name, response
 
         started_at = time.monotonic()
-        await delegation_queue.join()
+        # Start eagerly, so servers already in the delegation cache are answered without touching the scheduler
+        loop = asyncio.get_running_loop()
+        delegation_results = await asyncio.gather(
+            *(
+                asyncio.eager_task_factory(loop, _delegation_worker(server_name))
+                for server_name in list_of_servers_to_check
+            ),
+        )
         total_time = time.monotonic() - started_at
 
-        # Cancel our worker tasks.
-        await self.reaction_task_controller.cancel(reference_key, False)
+        # map of server name -> diagnostic response, leaving out any that errored
+        server_to_server_data: dict[str, MatrixResponse] = {
+            server_name: response for server_name, response in delegation_results if response is not None
+        }
 
         # Want the full room version it to look like this for now
         #
@@ -2033,23 +2036,6 @@ class FederationBot(RoomWalkCommand):
         # The single server version will be the same in that a single line like above
         # will be printed, then the rendered diagnostic data
 
-        # Create the columns to be used
-        server_name_col = DisplayLineColumnConfig("Server Name")
-        well_known_status_col = DisplayLineColumnConfig("WK")
-        srv_status_col = DisplayLineColumnConfig("SRV")
-        dns_status_col = DisplayLineColumnConfig("DNS")
-        connective_test_status_col = DisplayLineColumnConfig("Test")
-        tls_served_by_col = DisplayLineColumnConfig("TLS served by")
-        retries_col = DisplayLineColumnConfig("Retries")
-
-        # Iterate through the server names to widen the column, if necessary.
-        for server_name, response in server_to_server_data.items():
-            server_name_col.maybe_update_column_width(len(server_name))
-            if response.diag_info:
-                maybe_tls_server = response.diag_info.tls_handled_by
-                if maybe_tls_server:
-                    tls_served_by_col.maybe_update_column_width(len(maybe_tls_server))
-
         # Just use a fixed width for the results. Should never be larger than 5 for most
         well_known_status_col.maybe_update_column_width(5)
         srv_status_col.maybe_update_column_width(5)
@@ -2058,8 +2044,8 @@ class FederationBot(RoomWalkCommand):
 
         # Begin constructing the message
         #
-        # Use a sorted list of server names, so it displays in alphabetical order.
-        server_results_sorted = sorted(server_to_server_data.keys())
+        # Sort the results by server name, so it displays in alphabetical order.
+        server_results_sorted = sorted(server_to_server_data.items(), key=itemgetter(0))
 
         # Build the header line
         header_message = (
@@ -2077,70 +2063,74 @@ class FederationBot(RoomWalkCommand):
         header_line_size = len(header_message)
 
         # Create the delimiter line under the header
-        header_message += f"{pad('', header_line_size, pad_with='-')}\n"
+        delimiter_line = f"{'-' * header_line_size}\n"
+        header_message += delimiter_line
 
         list_of_result_data = []
         # Use the sorted list from earlier, alphabetical looks nicer
-        for server_name in server_results_sorted:
-            response = server_to_server_data[server_name]
-
+        for server_name, response in server_results_sorted:
             if response:
                 # Shortcut reference the diag_info to cut down line length
                 assert response.diag_info is not None
                 diag_info = response.diag_info
-
-                # The server name column
-                buffered_message = f"{server_name_col.front_pad(server_name)} | "
-                # The well-known status column
-                buffered_message += f"{well_known_status_col.pad(diag_info.get_well_known_status())} | "
-
-                # the SRV record status column
-                buffered_message += f"{srv_status_col.pad(diag_info.get_srv_record_status())} | "
-
-                # the DNS record status column
-                buffered_message += f"{dns_status_col.pad(diag_info.get_dns_record_status())} | "
-
-                # The connectivity status column
-                connectivity_status = diag_info.get_connectivity_test_status()
-                buffered_message += f"{connective_test_status_col.pad(connectivity_status)} | "
                 maybe_tls_server = diag_info.tls_handled_by
 
-                buffered_message += f"{tls_served_by_col.pad(maybe_tls_server if maybe_tls_server else '')} | "
-
-                num_of_retries = diag_info.retries
-                buffered_message += f"{retries_col.pad(num_of_retries)} | "
+                # Collect the pieces of the row and join them once at the end
+                row_parts = [
+                    server_name_col.front_pad(server_name),
+                    " | ",
+                    well_known_status_col.pad(diag_info.get_well_known_status()),
+                    " | ",
+                    srv_status_col.pad(diag_info.get_srv_record_status()),
+                    " | ",
+                    dns_status_col.pad(diag_info.get_dns_record_status()),
+                    " | ",
+                    connective_test_status_col.pad(diag_info.get_connectivity_test_status()),
+                    " | ",
+                    tls_served_by_col.pad(maybe_tls_server if maybe_tls_server else ""),
+                    " | ",
+                    retries_col.pad(diag_info.retries),
+                    " | ",
+                ]
 
                 if response.http_code != 200:
-                    buffered_message += f"{response.reason}"
+                    row_parts.append(f"{response.reason}")
 
-                buffered_message += "\n"
+                row_parts.append("\n")
                 if number_of_servers == 1:
                     # Print the diagnostic summary, since there is only one server there
                     # is no need to be brief.
-                    buffered_message += f"{pad('', header_line_size, pad_with='-')}\n"
-                    for line in diag_info.list_of_results:
-                        buffered_message += f"{pad('', 3)}{line}\n"
-
-                    buffered_message += f"{pad('', header_line_size, pad_with='-')}\n"
+                    row_parts.append(delimiter_line)
+                    row_parts.extend(f"   {line}\n" for line in diag_info.list_of_results)
+                    row_parts.append(delimiter_line)
 
-                list_of_result_data.extend([buffered_message])
+                list_of_result_data.append("".join(row_parts))
 
         footer_message = f"\nTotal time for retrieval: {total_time:.3f} seconds\n"
-        list_of_result_data.extend([footer_message])
+        list_of_result_data.append(footer_message)
 
         # For a single server test, the response will fit into a single message block.
         # However, for a roomful it could be several pages long. Chunk those responses
         # to fit into the size limit of an Event.
-        final_list_of_data = combine_lines_to_fit_event(list_of_result_data, header_message)
+        if number_of_servers == 1:
+            final_list_of_data = [header_message + "".join(list_of_result_data)]
+        else:
+            final_list_of_data = combine_lines_to_fit_event(list_of_result_data, header_message)
 
         for chunk in final_list_of_data:
             current_message = await command_event.respond(
                 make_into_text_event(wrap_in_code_block_markdown(chunk), ignore_body=True),
             )
-            list_of_message_ids.extend([current_message])
-
-        for current_message in list_of_message_ids:
-            await self.reaction_task_controller.add_cleanup_control(current_message, command_event.room_id)
+            list_of_message_ids.append(current_message)
+
+        # The pages are sent one at a time to keep them in order, but the cleanup reactions
+        # don't depend on each other so place them all at once
+        await asyncio.gather(
+            *(
+                self.reaction_task_controller.add_cleanup_control(current_message, command_event.room_id)
+                for current_message in list_of_message_ids
+            ),
+        )
 
     @fed_command.subcommand(name="event_raw")
     @command.argument(name="event_id", parser=is_event_id, required=False)
@@ -2196,7 +2186,7 @@ class FederationBot(RoomWalkCommand):
             current_message = await command_event.respond(wrap_in_code_block_markdown(buffered_message))
         except MTooLarge:
             current_message = await command_event.respond("Somehow, Event is to large to display")
-        list_of_message_ids.extend([current_message])
+        list_of_message_ids.append(current_message)
         for message_id in list_of_message_ids:
             await self.reaction_task_controller.add_cleanup_control(message_id, command_event.room_id)
 
@@ -2234,11 +2224,6 @@ class FederationBot(RoomWalkCommand):
             event_id = command_event.event_id
             extra_info = " last event in this room"
 
-        prerender_message = await command_event.respond(
-            f"Retrieving{extra_info}: {event_id} from {destination_server} using {origin_server}",
-        )
-        list_of_message_ids: list[EventID] = [prerender_message]
-
         # TODO: test by modifying the object. Have to reach into the data as it comes in and
         #  modify that, as the attrib versions will have already been parsed and
         #  won't be read by the verifier. Spoiler alert: works as intended.
@@ -2262,14 +2247,26 @@ class FederationBot(RoomWalkCommand):
             # returned_event.raw_data.update(test_json_dumped)
             # self.log.info(f"dumped raw_data:\n{json.dumps(returned_event.raw_data, indent=4)}")
 
-        returned_event_dict = await self.federation_handler.get_event_from_server(
-            origin_server=origin_server,
-            destination_server=destination_server,
-            event_id=event_id,
-            inject_new_data=json_dumped,
-            keys_to_pop=remove_bit,
+        # The status message doesn't need to land before the request goes out, send it alongside
+        prerender_task = asyncio.create_task(
+            command_event.respond(
+                f"Retrieving{extra_info}: {event_id} from {destination_server} using {origin_server}",
+            ),
         )
 
+        try:
+            returned_event_dict = await self.federation_handler.get_event_from_server(
+                origin_server=origin_server,
+                destination_server=destination_server,
+                event_id=event_id,
+                inject_new_data=json_dumped,
+                keys_to_pop=remove_bit,
+            )
+            list_of_message_ids: list[EventID] = [await prerender_task]
+        finally:
+            # Nothing left to wait on it if the request raised, don't leave it running on its own
+            prerender_task.cancel()
+
         buffered_message = ""
         returned_event = returned_event_dict.get(event_id)
         if isinstance(returned_event, EventError):
@@ -2317,7 +2314,7 @@ class FederationBot(RoomWalkCommand):
             buffered_message += returned_event.to_pretty_summary_footer(event_data_map=a_event_data_map)
 
         current_message = await command_event.respond(wrap_in_code_block_markdown(buffered_message))
-        list_of_message_ids.extend([current_message])
+        list_of_message_ids.append(current_message)
         for message_id in list_of_message_ids:
             await self.reaction_task_controller.add_cleanup_control(message_id, command_event.room_id)
 
@@ -2392,90 +2389,92 @@ class FederationBot(RoomWalkCommand):
 
         if origin_server_ts:
             # A nice little addition for the status updated before the command runs
-            special_time_formatting = (
-                f"\n  * which took place at: {datetime.fromtimestamp(float(origin_server_ts / 1000))} UTC"
-            )
+            special_time_formatting = f"\n  * which took place at: {pretty_print_timestamp(origin_server_ts)} UTC"
         else:
             special_time_formatting = ""
 
-        prerender_message = await command_event.respond(
-            f"Retrieving State for:\n"
-            f"* Room: {room_id_or_alias or room_id}\n"
-            f"* at Event ID: {event_id}{special_time_formatting}\n"
-            f"* From {destination_server} using {origin_server}",
-        )
-        list_of_message_ids: list[EventID] = [prerender_message]
-
         # This will be assigned by now
         assert event_id is not None
 
-        # This will retrieve the events and the auth chain, we only use the former here
-        (
-            pdu_list,
-            _,
-        ) = await self.federation_handler.get_state_ids_from_server(
-            origin_server=origin_server,
-            destination_server=destination_server,
-            room_id=room_id,
-            event_id=event_id,
-        )
-
-        prerender_message_2 = await command_event.respond(
-            f"Retrieving {len(pdu_list)} events from {destination_server}",
-        )
-        list_of_message_ids.extend([prerender_message_2])
-
-        # Keep both the response and the actual event, if there was an error it will be
-        # in the response and the event won't exist here
-        event_to_event_base: dict[str, EventBase]
-
-        started_at = time.monotonic()
-        event_to_event_base = await self.federation_handler.get_events_from_server(
-            origin_server,
-            destination_server,
-            pdu_list,
+        # The status messages don't need to land before the requests go out, send them alongside
+        prerender_task = asyncio.create_task(
+            command_event.respond(
+                f"Retrieving State for:\n"
+                f"* Room: {room_id_or_alias or room_id}\n"
+                f"* at Event ID: {event_id}{special_time_formatting}\n"
+                f"* From {destination_server} using {origin_server}",
+            ),
         )
-        total_time = time.monotonic() - started_at
-
-        # Time to start rendering. Build the header lines first
-        header_message = ""
-        dc_depth = DisplayLineColumnConfig("Depth")
-        dc_eid = DisplayLineColumnConfig("Event ID")
-        dc_etype = DisplayLineColumnConfig("Event Type")
-        dc_sender = DisplayLineColumnConfig("Sender")
-
-        # Preprocessing:
-        # 1. Set the column widths
-        # 2. Get the depth's for row ordering
-        list_of_event_ids: list[tuple[int, EventID]] = []
-        for event_id, event_id_entry in event_to_event_base.items():
-            # Use the about to be constructed list to curate what will be displayed later
-            if no_members and event_id_entry.event_type == "m.room.member":
-                continue
 
-            list_of_event_ids.append((event_id_entry.depth, EventID(event_id)))
+        try:
+            # This will retrieve the events and the auth chain, we only use the former here
+            (
+                pdu_list,
+                _,
+            ) = await self.federation_handler.get_state_ids_from_server(
+                origin_server=origin_server,
+                destination_server=destination_server,
+                room_id=room_id,
+                event_id=event_id,
+            )
+            # Wait for the first status message before sending the second, so they stay in order
+            list_of_message_ids: list[EventID] = [await prerender_task]
 
-            dc_depth.maybe_update_column_width(len(str(event_id_entry.depth)))
-            dc_eid.maybe_update_column_width(len(event_id))
-            dc_etype.maybe_update_column_width(len(event_id_entry.event_type))
-            dc_sender.maybe_update_column_width(len(event_id_entry.sender))
+            prerender_task = asyncio.create_task(
+                command_event.respond(f"Retrieving {len(pdu_list)} events from {destination_server}"),
+            )
 
+            # Keep both the response and the actual event, if there was an error it will be
+            # in the response and the event won't exist here
+            event_to_event_base: dict[str, EventBase] = {}
+
+            # Time to start rendering. Build the header lines first
+            dc_depth = DisplayLineColumnConfig("Depth")
+            dc_eid = DisplayLineColumnConfig("Event ID")
+            dc_etype = DisplayLineColumnConfig("Event Type")
+            dc_sender = DisplayLineColumnConfig("Sender")
+
+            # Preprocessing is done as the events arrive, instead of after all of them have:
+            # 1. Set the column widths
+            # 2. Get the depth's for row ordering
+            list_of_event_ids: list[tuple[int, EventID]] = []
+            started_at = time.monotonic()
+            async for event_id, event_id_entry in self.federation_handler.iter_events_from_server(
+                origin_server,
+                destination_server,
+                pdu_list,
+            ):
+                event_to_event_base[event_id] = event_id_entry
+
+                # Use the about to be constructed list to curate what will be displayed later
+                if no_members and event_id_entry.event_type == "m.room.member":
+                    continue
+
+                list_of_event_ids.append((event_id_entry.depth, EventID(event_id)))
+
+                dc_depth.maybe_update_column_width(len(str(event_id_entry.depth)))
+                dc_eid.maybe_update_column_width(len(event_id))
+                dc_etype.maybe_update_column_width(len(event_id_entry.event_type))
+                dc_sender.maybe_update_column_width(len(event_id_entry.sender))
+            total_time = time.monotonic() - started_at
+            list_of_message_ids.append(await prerender_task)
+        finally:
+            # Nothing left to wait on it if a request raised, don't leave it running on its own
+            prerender_task.cancel()
+
+        # Rows have to be shown in depth order, so the render itself waits for the last event.
         # Sort the list in place by the first of the tuples, which is the depth
-        list_of_event_ids.sort(key=lambda x: x[0])
+        list_of_event_ids.sort(key=itemgetter(0))
 
         # Build the header line...
-        header_message += f"{dc_depth.pad()} "
-        header_message += f"{dc_eid.pad()} "
-        header_message += f"{dc_etype.pad()} "
-        header_message += f"{dc_sender.pad()}\n"
+        header_line = f"{dc_depth.pad()} {dc_eid.pad()} {dc_etype.pad()} {dc_sender.pad()}\n"
 
         # ...and the delimiter
-        header_message += f"{pad('', pad_to=len(header_message), pad_with='-')}\n"
+        header_message = f"{header_line}{'-' * len(header_line)}\n"
         list_of_buffer_lines = []
 
         # Use the sorted list to pull the events in order and begin the render
         for _, event_id in list_of_event_ids:
-            buffered_message = ""
             event_base = event_to_event_base.get(event_id, None)
             if event_base:
                 line_summary = event_base.to_line_summary(
@@ -2484,14 +2483,12 @@ class FederationBot(RoomWalkCommand):
                     dc_etype=dc_etype,
                     dc_sender=dc_sender,
                 )
-                buffered_message += f"{line_summary}\n"
+                list_of_buffer_lines.append(f"{line_summary}\n")
             else:
-                buffered_message += f"{event_id} was not found(unknown reason)\n"
-
-            list_of_buffer_lines.extend([buffered_message])
+                list_of_buffer_lines.append(f"{event_id} was not found(unknown reason)\n")
 
         footer_message = f"\nTotal time for retrieval: {total_time:.3f} seconds\n"
-        list_of_buffer_lines.extend([footer_message])
+        list_of_buffer_lines.append(footer_message)
         # Chunk the data as there may be a few 'pages' of it
         final_list_of_data = combine_lines_to_fit_event(list_of_buffer_lines, header_message)
 
@@ -2499,10 +2496,16 @@ class FederationBot(RoomWalkCommand):
             current_message = await command_event.respond(
                 make_into_text_event(wrap_in_code_block_markdown(chunk), ignore_body=True),
             )
-            list_of_message_ids.extend([current_message])
-
-        for current_message in list_of_message_ids:
-            await self.reaction_task_controller.add_cleanup_control(current_message, command_event.room_id)
+            list_of_message_ids.append(current_message)
+
+        # The pages are sent one at a time to keep them in order, but the cleanup reactions
+        # don't depend on each other so place them all at once
+        await asyncio.gather(
+            *(
+                self.reaction_task_controller.add_cleanup_control(current_message, command_event.room_id)
+                for current_message in list_of_message_ids
+            ),
+        )
 
     @fed_command.subcommand(
         name="ping",
@@ -2532,7 +2535,7 @@ class FederationBot(RoomWalkCommand):
             # First, filter out if the thing passed in was a room. If it wasn't that means it was a server
             if thing_to_test.startswith("#") or thing_to_test.startswith("!"):
                 if bool(is_room_id_or_alias(thing_to_test)):
-                    origin_server = get_domain_from_id(self.client.mxid)
+                    origin_server = self.hosting_server
                     room_to_check, _ = await self.resolve_room_id_or_alias(thing_to_test, command_event, origin_server)
 
                     if room_to_check is None:
@@ -2554,17 +2557,13 @@ class FederationBot(RoomWalkCommand):
                 msg = "room_to_check must be a string"
                 raise TypeError(msg)
             try:
-                joined_members = await self.client.get_joined_members(RoomID(room_to_check))
+                # The joined members API only returns members that are JOINed, so there is nothing to filter out
+                list_of_servers_to_check.update(await self.get_servers_in_room(RoomID(room_to_check)))
 
             except MForbidden:
                 await command_event.respond(NOT_IN_ROOM_ERROR)
                 return
 
-            for member, status in joined_members.items():
-                # In case of members not being JOINed, just filter them out
-                if status.membership == Membership.JOIN:
-                    list_of_servers_to_check.add(get_domain_from_id(member))
-
         number_of_servers = len(list_of_servers_to_check)
 
         current_message_id = await command_event.respond(
@@ -2573,18 +2572,14 @@ class FederationBot(RoomWalkCommand):
         )
         list_of_message_ids: list[EventID] = [current_message_id]
 
-        started_at = time.monotonic()
-        server_to_version_data = await self._get_versions_from_servers(list_of_servers_to_check)
-        total_time = time.monotonic() - started_at
-
         # Establish the initial size of the padding for each row
         server_name_col = DisplayLineColumnConfig("Server Name", horizontal_separator=" | ")
         ok_or_fail_col = DisplayLineColumnConfig("Result", justify=Justify.RIGHT, horizontal_separator=" | ")
         response_time_col = DisplayLineColumnConfig("Response time")
 
-        # Iterate over all the data to collect the column sizes
-        for server in server_to_version_data:
-            server_name_col.maybe_update_column_width(len(server))
+        # Every column width is known before a single request is made, so each row is formatted as its
+        # response arrives. The rows are still only sent once the last server has answered, sorted below
+        server_name_col.maybe_update_column_width(max(map(len, list_of_servers_to_check), default=0))
 
         # Construct the message response now
         #
@@ -2600,33 +2595,31 @@ class FederationBot(RoomWalkCommand):
 
         # Create the delimiter line
         header_message_line_size = len(header_messages[0])
-        header_messages.extend([f"{pad('', header_message_line_size, pad_with='-')}"])
+        header_messages.append("-" * header_message_line_size)
 
-        # Alphabetical looks nicer
-        sorted_list_of_servers = sorted(server_to_version_data.keys())
-
-        # Collect all the output lines for chunking afterward
-        list_of_result_data = []
+        # map of server name -> its rendered line
+        server_to_rendered_line: dict[str, str] = {}
 
-        for server_name in sorted_list_of_servers:
-            buffered_message = ""
-            server_data = server_to_version_data[server_name]
-
-            buffered_message += f"{server_name_col.pad(server_name)}{server_name_col.horizontal_separator}"
+        started_at = time.monotonic()
+        async for server_name, server_data in self._iter_fan_out_to_servers(
+            list_of_servers_to_check,
+            lambda server_name: self.federation_handler.api.get_server_version_new(server_name, diagnostics=True),
+        ):
+            row_parts = [f"{server_name_col.pad(server_name)}{server_name_col.horizontal_separator}"]
             # Federation request may have had an error, handle those errors here
             if server_data.http_code != 200:
                 # Pad the software column with spaces, so the error and the code end up in the version column
                 # Additionally, since this is the error clause, don't include the vertical line to separate
                 # the column, giving a more distinctive visual indicator.
-                buffered_message += f"{add_color(bold(ok_or_fail_col.pad('ERROR')), foreground=Colors.RED)}"
-                buffered_message += f"{ok_or_fail_col.horizontal_separator}"
+                row_parts.append(f"{add_color(bold(ok_or_fail_col.pad('ERROR')), foreground=Colors.RED)}")
+                row_parts.append(f"{ok_or_fail_col.horizontal_separator}")
 
-                buffered_message += f"{str(server_data.http_code) + ': ' if server_data.http_code > 0 else ''}"
-                buffered_message += f"{server_data.reason}"
+                row_parts.append(f"{str(server_data.http_code) + ': ' if server_data.http_code > 0 else ''}")
+                row_parts.append(f"{server_data.reason}")
 
             else:
-                buffered_message += f"{add_color(bold(ok_or_fail_col.pad('PASS')), foreground=Colors.GREEN)}"
-                buffered_message += f"{ok_or_fail_col.horizontal_separator}"
+                row_parts.append(f"{add_color(bold(ok_or_fail_col.pad('PASS')), foreground=Colors.GREEN)}")
+                row_parts.append(f"{ok_or_fail_col.horizontal_separator}")
                 calculated_time = -1.0
                 if server_data.tracing_context:
                     context = server_data.tracing_context
@@ -2637,11 +2630,15 @@ class FederationBot(RoomWalkCommand):
                         # else:
                         #     start_time =
                         calculated_time = (end_time - start_time) * 1000
-                buffered_message += f"{calculated_time:.3f} ms"
-            list_of_result_data.extend([buffered_message])
+                row_parts.append(f"{calculated_time:.3f} ms")
+            server_to_rendered_line[server_name] = "".join(row_parts)
+        total_time = time.monotonic() - started_at
+
+        # Alphabetical looks nicer. Collect all the output lines for chunking afterward
+        list_of_result_data = [server_to_rendered_line[server_name] for server_name in sorted(server_to_rendered_line)]
 
         footer_message = f"\nTotal time for retrieval: {total_time:.3f} seconds"
-        list_of_result_data.extend([footer_message])
+        list_of_result_data.append(footer_message)
 
         final_list_of_data = combine_lines_to_fit_event_html(
             list_of_result_data,
@@ -2657,7 +2654,7 @@ class FederationBot(RoomWalkCommand):
                 make_into_text_event(wrap_in_details(chunk, f" ⏩ Page {count} ⏪"), allow_html=True, ignore_body=True),
                 allow_html=True,
             )
-            list_of_message_ids.extend([current_message_id])
+            list_of_message_ids.append(current_message_id)
         for message_id in list_of_message_ids:
             await self.reaction_task_controller.add_cleanup_control(message_id, command_event.room_id, emoji=True)
 
@@ -2677,45 +2674,9 @@ class FederationBot(RoomWalkCommand):
         # Let the user know the bot is paying attention
         await command_event.mark_read()
 
-        list_of_servers_to_check = set()
-
-        # It may be that they are using their mxid as the server to check, parse that
-        maybe_user_mxid = is_mxid(server_to_check)
-        if maybe_user_mxid:
-            server_to_check = get_domain_from_id(maybe_user_mxid)
-
-        # As an undocumented option, allow passing in a room_id to check an entire room.
-        # This can be rather long(and time consuming) so we'll place limits later.
-        maybe_room_id = is_room_id_or_alias(server_to_check)
-        if maybe_room_id:
-            origin_server = get_domain_from_id(self.client.mxid)
-            room_to_check, _ = await self.resolve_room_id_or_alias(maybe_room_id, command_event, origin_server)
-            # Need to cancel server_to_check, but can't use None
-            server_to_check = ""
-            if not room_to_check:
-                # Don't need to actually display an error, that's handled in the above
-                # function
-                return
-        else:
-            room_to_check = command_event.room_id
-
-        # If the room id was passed in, then this will turn into None
-        if not server_to_check:
-            # Get the members this bot knows about in this room
-            # TODO: try and find a way to not use the client API for this
-            try:
-                assert isinstance(room_to_check, str)
-                joined_members = await self.client.get_joined_members(RoomID(room_to_check))
-
-            except MForbidden:
-                await command_event.respond(NOT_IN_ROOM_ERROR)
-                return
-
-            for member in joined_members:
-                list_of_servers_to_check.add(get_domain_from_id(member))
-
-        else:
-            list_of_servers_to_check.add(server_to_check)
+        list_of_servers_to_check = await self.get_servers_to_check(server_to_check, command_event)
+        if list_of_servers_to_check is None:
+            return
 
         number_of_servers = len(list_of_servers_to_check)
 
@@ -2733,16 +2694,25 @@ class FederationBot(RoomWalkCommand):
         server_software_col = DisplayLineColumnConfig(SERVER_SOFTWARE)
         server_version_col = DisplayLineColumnConfig(SERVER_VERSION)
 
-        # Iterate over all the data to collect the column sizes
-        for server, result in server_to_version_data.items():
-            server_name_col.maybe_update_column_width(len(server))
-
-            if result.http_code == 200:
-                server_block = result.json_response.get("server", {})
-                server_software: str = server_block.get("name", "")
-                server_software_col.maybe_update_column_width(server_software)
-                server_version = server_block.get("version", "")
-                server_version_col.maybe_update_column_width(server_version)
+        # Collect the column sizes, measuring each column in one pass
+        server_name_col.maybe_update_column_width(max(map(len, server_to_version_data), default=0))
+        # Servers answer with whatever they like, so skip a "server" that is not an object and measure
+        # a null or non-string name or version by how it will be displayed
+        server_blocks: list[dict[str, Any]] = [
+            server_block
+            for server_block in (
+                result.json_response.get("server", {})
+                for result in server_to_version_data.values()
+                if result.http_code == 200
+            )
+            if isinstance(server_block, dict)
+        ]
+        server_software_col.maybe_update_column_width(
+            max((len(str(server_block.get("name") or "")) for server_block in server_blocks), default=0)
+        )
+        server_version_col.maybe_update_column_width(
+            max((len(str(server_block.get("version") or "")) for server_block in server_blocks), default=0)
+        )
 
         # Construct the message response now
         #
@@ -2760,7 +2730,7 @@ class FederationBot(RoomWalkCommand):
 
         # Create the delimiter line
         header_message_line_size = len(header_message)
-        header_message += f"{pad('', header_message_line_size, pad_with='-')}\n"
+        header_message += f"{'-' * header_message_line_size}\n"
 
         # Alphabetical looks nicer
         sorted_list_of_servers = sorted(list_of_servers_to_check)
@@ -2769,30 +2739,31 @@ class FederationBot(RoomWalkCommand):
         list_of_result_data = []
 
         for server_name in sorted_list_of_servers:
-            buffered_message = ""
             server_data = server_to_version_data.get(server_name, None)
-            buffered_message += f"{server_name_col.front_pad(server_name)} | "
+            row_start = f"{server_name_col.front_pad(server_name)} | "
             if server_data:
                 # Federation request may have had an error, handle those errors here
                 if server_data.http_code != 200:
                     # Don't include the vertical line to separate the column, giving a more distinctive visual
                     # indicator.
-                    buffered_message += "❌ "
-
-                    buffered_message += f"{str(server_data.http_code) + ': ' if server_data.http_code > 0 else ''}{server_data.reason}\n"
+                    error_code = f"{server_data.http_code}: " if server_data.http_code > 0 else ""
+                    buffered_message = f"{row_start}❌ {error_code}{server_data.reason}\n"
 
                 else:
                     server_block = server_data.json_response.get("server", {})
-                    server_software = server_block.get("name")
+                    if not isinstance(server_block, dict):
+                        server_block = {}
+                    # Display the name the same way it was measured above
+                    server_software = str(server_block.get("name") or "")
                     server_version = server_block.get("version")
-                    buffered_message += f"{server_software_col.pad(server_software)} | {server_version}\n"
+                    buffered_message = f"{row_start}{server_software_col.pad(server_software)} | {server_version}\n"
             else:
-                buffered_message += "Probably a threading error(WIP) sorry bout that"
+                buffered_message = f"{row_start}Probably a threading error(WIP) sorry bout that"
 
-            list_of_result_data.extend([buffered_message])
+            list_of_result_data.append(buffered_message)
 
         footer_message = f"\nTotal time for retrieval: {total_time:.3f} seconds\n"
-        list_of_result_data.extend([footer_message])
+        list_of_result_data.append(footer_message)
 
         final_list_of_data = combine_lines_to_fit_event(list_of_result_data, header_message)
 
@@ -2801,7 +2772,7 @@ class FederationBot(RoomWalkCommand):
             current_message_id = await command_event.respond(
                 make_into_text_event(wrap_in_code_block_markdown(chunk), ignore_body=True),
             )
-            list_of_message_ids.extend([current_message_id])
+            list_of_message_ids.append(current_message_id)
         for message_id in list_of_message_ids:
             await self.reaction_task_controller.add_cleanup_control(message_id, command_event.room_id)
 
@@ -2820,41 +2791,76 @@ class FederationBot(RoomWalkCommand):
         Returns:
             Dict mapping server names to their version response objects
         """
-        # map of server name -> (server brand, server version)
-        # Return this at the end
-        server_to_version_data: dict[str, MatrixResponse] = {}
+        return await self._fan_out_to_servers(
+            servers_to_check,
+            lambda server_name: self.federation_handler.api.get_server_version_new(server_name, diagnostics=True),
+        )
 
-        async def _version_worker(queue: asyncio.Queue[str]) -> None:
-            while True:
-                worker_server_name = await queue.get()
-                try:
-                    result = await self.federation_handler.api.get_server_version_new(
-                        worker_server_name,
-                        diagnostics=True,
-                    )
+    async def _fan_out_to_servers(
+        self,
+        servers_to_check: Collection[str],
+        fetch: Callable[[str], Awaitable[T]],
+    ) -> dict[str, T]:
+        """
+        Make the same kind of federation request to each of a collection of servers concurrently.
 
-                    server_to_version_data[worker_server_name] = result
-                except Exception as e:
-                    self.log.warning("_version_worker: %s: %r", worker_server_name, e)
-                    pass
-                queue.task_done()
+        No more than MAX_NUMBER_OF_SERVERS_TO_ATTEMPT requests are in flight at
+        once. A request that raises is logged and its server is left out of the results.
 
-        version_queue: asyncio.Queue[str] = asyncio.Queue()
-        for server_name in servers_to_check:
-            version_queue.put_nowait(server_name)
+        Args:
+            servers_to_check: Collection of server names to query
+            fetch: Makes the request to the single server it is given
 
-        reference_key = self.reaction_task_controller.setup_task_set()
-        self.reaction_task_controller.add_tasks(
-            reference_key,
-            _version_worker,
-            version_queue,
-            limit=MAX_NUMBER_OF_SERVERS_TO_ATTEMPT,
-        )
-        await version_queue.join()
+        Returns:
+            Dict mapping server names to their response objects
+        """
+        # map of server name -> response, leaving out any that errored
+        return {
+            server_name: result async for server_name, result in self._iter_fan_out_to_servers(servers_to_check, fetch)
+        }
 
-        await self.reaction_task_controller.cancel(reference_key)
+    async def _iter_fan_out_to_servers(
+        self,
+        servers_to_check: Collection[str],
+        fetch: Callable[[str], Awaitable[T]],
+    ) -> AsyncIterator[tuple[str, T]]:
+        """
+        Make the same kind of federation request to each of a collection of servers concurrently, yielding
+        the responses in the order they complete rather than the order the servers were given in.
 
-        return server_to_version_data
+        No more than MAX_NUMBER_OF_SERVERS_TO_ATTEMPT requests are in flight at
+        once. A request that raises is logged and its server is skipped.
+
+        Args:
+            servers_to_check: Collection of server names to query
+            fetch: Makes the request to the single server it is given
+
+        Yields:
+            Tuples of (server name, response), in order of completion
+        """
+        request_semaphore = asyncio.Semaphore(MAX_NUMBER_OF_SERVERS_TO_ATTEMPT)
+
+        async def _fan_out_worker(worker_server_name: str) -> tuple[str, T | None]:
+            try:
+                async with request_semaphore:
+                    return worker_server_name, await fetch(worker_server_name)
+            except Exception as e:
+                self.log.warning("_fan_out_worker: %s: %r", worker_server_name, e)
+                return worker_server_name, None
+
+        # Eager tasks run up to their first real wait straight away, so answers from the api caches come back
+        # without a trip through the scheduler. The loop's own task factory is left alone, it belongs to maubot.
+        loop = asyncio.get_running_loop()
+        tasks = [asyncio.eager_task_factory(loop, _fan_out_worker(server_name)) for server_name in servers_to_check]
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                server_name, result = await next_result
+                if result is not None:
+                    yield server_name, result
+        finally:
+            # Make sure to cancel all tasks, including if the caller stopped iterating early
+            for task in tasks:
+                task.cancel()
 
     @fed_command.subcommand(name="server_keys")
     @command.argument(name="server_to_check", required=True)
@@ -2896,42 +2902,9 @@ class FederationBot(RoomWalkCommand):
         # Let the user know the bot is paying attention
         await command_event.mark_read()
 
-        # It may be that they are using their mxid as the server to check, parse that
-        maybe_user_mxid = is_mxid(server_to_check)
-        if maybe_user_mxid:
-            server_to_check = get_domain_from_id(maybe_user_mxid)
-
-        # As an undocumented option, allow passing in a room_id to check an entire room.
-        # This can be rather long(and time consuming) so we'll place limits later.
-        maybe_room_id = is_room_id_or_alias(server_to_check)
-        if maybe_room_id:
-            origin_server = get_domain_from_id(self.client.mxid)
-            room_to_check, _ = await self.resolve_room_id_or_alias(maybe_room_id, command_event, origin_server)
-            # Need to cancel server_to_check, but can't use None
-            server_to_check = ""
-            if not room_to_check:
-                # Don't need to actually display an error, that's handled in the above
-                # function
-                return
-        else:
-            room_to_check = command_event.room_id
-
-        list_of_servers_to_check = set()
-        # If the room id was passed in, then this will turn into None
-        if not server_to_check:
-            try:
-                assert isinstance(room_to_check, str)
-                joined_members = await self.client.get_joined_members(RoomID(room_to_check))
-
-            except MForbidden:
-                await command_event.respond(NOT_IN_ROOM_ERROR)
-                return
-
-            for member in joined_members:
-                list_of_servers_to_check.add(get_domain_from_id(member))
-
-        else:
-            list_of_servers_to_check.add(server_to_check)
+        list_of_servers_to_check = await self.get_servers_to_check(server_to_check, command_event)
+        if list_of_servers_to_check is None:
+            return
 
         number_of_servers = len(list_of_servers_to_check)
         if number_of_servers > 1 and display_raw:
@@ -2948,43 +2921,23 @@ class FederationBot(RoomWalkCommand):
             )
             return
 
-        server_to_server_data: dict[str, MatrixResponse] = {}
-
         prerender_message = await command_event.respond(
             f"Retrieving data from federation for {number_of_servers} server{'s' if number_of_servers > 1 else ''}",
         )
         list_of_message_ids: list[EventID] = [prerender_message]
 
-        async def _server_keys_worker(queue: asyncio.Queue[str]) -> None:
-            while True:
-                worker_server_name = await queue.get()
-                try:
-                    server_to_server_data[worker_server_name] = await self.federation_handler.api.get_server_keys(
-                        worker_server_name,
-                    )
-                except Exception as e:
-                    self.log.error("_server_keys_worker: %r", e, stack_info=True)
-                    pass
-                queue.task_done()
+        time_now = time.time_ns() // 1_000_000
 
-        keys_queue: asyncio.Queue[str] = asyncio.Queue()
-        for server_name in list_of_servers_to_check:
-            await keys_queue.put(server_name)
-
-        reference_key = self.reaction_task_controller.setup_task_set(command_event.event_id)
-        self.reaction_task_controller.add_tasks(
-            reference_key,
-            _server_keys_worker,
-            keys_queue,
-            limit=MAX_NUMBER_OF_SERVERS_TO_ATTEMPT,
-        )
+        async def _fetch_server_keys(server_name: str) -> tuple[MatrixResponse, list[tuple[str, str]]]:
+            response = await self.federation_handler.api.get_server_keys(server_name)
+            # Flatten the keys into (key id, timestamp) rows as each response arrives, while the rest are
+            # still on their way, so neither the sizing nor the render below have to walk the response
+            key_rows = _flatten_verify_keys(response.json_response, time_now) if response.http_code == 200 else []
+            return response, key_rows
 
         started_at = time.monotonic()
-        await keys_queue.join()
-
+        server_to_server_data = await self._fan_out_to_servers(list_of_servers_to_check, _fetch_server_keys)
         total_time = time.monotonic() - started_at
-        # Cancel our worker tasks.
-        await self.reaction_task_controller.cancel(reference_key)
 
         # Want it to look like this for now
         #
@@ -2998,15 +2951,10 @@ class FederationBot(RoomWalkCommand):
         server_key_col = DisplayLineColumnConfig("Key ID")
         valid_until_ts_col = DisplayLineColumnConfig("Valid until(UTC)")
 
-        for server_name, server_results in server_to_server_data.items():
-            # For sizing columns, don't care about errors
-            server_name_col.maybe_update_column_width(len(server_name))
-            keyid_block = server_results.json_response.get("verify_keys", {})
-            oldkeyid_block = server_results.json_response.get("old_verify_keys", {})
-            for key_id in keyid_block:
-                server_key_col.maybe_update_column_width(key_id)
-            for key_id in oldkeyid_block:
-                server_key_col.maybe_update_column_width(key_id)
+        # For sizing columns, don't care about errors
+        server_name_col.maybe_update_column_width(max(map(len, server_to_server_data), default=0))
+        all_key_ids = (key_id for _, key_rows in server_to_server_data.values() for key_id, _ in key_rows)
+        server_key_col.maybe_update_column_width(max(map(len, all_key_ids), default=0))
 
         # Begin constructing the message
 
@@ -3017,74 +2965,39 @@ class FederationBot(RoomWalkCommand):
         total_srv_line_size = len(header_message)
 
         # Create the delimiter line under the header
-        header_message += f"{pad('', total_srv_line_size, pad_with='-')}\n"
+        header_message += f"{'-' * total_srv_line_size}\n"
 
-        # The collection of rendered lines. This will be chunked into a paged response
-        list_of_result_data = []
-        # Begin the data render. Use the sorted list, alphabetical looks nicer. Even
-        # if there were errors, there will be data available.
-        for server_name, server_results in sorted(server_to_server_data.items()):
-            buffered_message = ""
-            buffered_message += f"{server_name_col.pad(server_name)} | "
-            first_line = True
-            if server_results.http_code != 200:
-                buffered_message += f"{server_results.reason}\n"
+        # The blank server name column in front of every key after the first is the same for every row
+        continuation_prefix = f"{server_name_col.pad('')} | "
 
-            else:
-                time_now = int(time.time() * 1000)
-                keyid_block = server_results.json_response.get("verify_keys", {})
-                oldkeyid_block = server_results.json_response.get("old_verify_keys", {})
-                # Probably don't care much about this one, as it's the end of a line
-                valid_until_ts: int = server_results.json_response.get("valid_until_ts", 0)
-
-                # There will not be more than a single key.
-                for key_id in keyid_block:
-                    valid_until_pretty = "None Found"
-
-                    if valid_until_ts > 0:
-                        valid_until_pretty = pretty_print_timestamp(valid_until_ts)
-
-                    if not first_line:
-                        buffered_message += f"{server_name_col.pad('')} | "
-
-                    # This will mark the display with a * to visually express expired
-                    pretty_expired_marker = "*" if valid_until_ts < time_now else ""
-                    buffered_message += f"{server_key_col.pad(key_id)} | "
-                    buffered_message += f"{pretty_expired_marker}{valid_until_pretty}\n"
-                    first_line = False
-
-                for key_id, key_data in oldkeyid_block.items():
-                    expired_pretty = "None Found"
-                    expired_ts = key_data.get("expired_ts", 0)
-                    if expired_ts > 0:
-                        expired_pretty = pretty_print_timestamp(expired_ts)
-
-                    if not first_line:
-                        buffered_message += f"{server_name_col.pad('')} | "
-
-                    # This will mark the display with a * to visually express expired
-                    pretty_expired_marker = "*" if expired_ts < time_now else ""
-                    buffered_message += f"{server_key_col.pad(key_id)} | "
-                    buffered_message += f"{pretty_expired_marker}{expired_pretty}\n"
-                    # extremely unlikely this is needed
-                    # first_line = False
-
-            list_of_result_data.extend([buffered_message])
-
-            # Only if there was a single server because of the above condition
-            if display_raw:
-                list_of_result_data.extend([f"{json.dumps(server_results.json_response, indent=4)}\n"])
+        def _server_key_rows() -> Iterator[str]:
+            # Begin the data render. Use the sorted list, alphabetical looks nicer. Even
+            # if there were errors, there will be data available.
+            for server_name, (server_results, key_rows) in sorted(server_to_server_data.items(), key=itemgetter(0)):
+                row_parts = [f"{server_name_col.pad(server_name)} | "]
+                if server_results.http_code != 200:
+                    row_parts.append(f"{server_results.reason}\n")
 
-        footer_message = f"\nTotal time for retrieval: {total_time:.3f} seconds\n"
-        list_of_result_data.extend([footer_message])
+                else:
+                    for row_index, (key_id, key_timestamp) in enumerate(key_rows):
+                        if row_index:
+                            row_parts.append(continuation_prefix)
+                        row_parts.append(f"{server_key_col.pad(key_id)} | {key_timestamp}\n")
 
-        final_list_of_data = combine_lines_to_fit_event(list_of_result_data, header_message)
+                yield "".join(row_parts)
 
-        for chunk in final_list_of_data:
+                # Only if there was a single server because of the above condition
+                if display_raw:
+                    yield f"{pretty_json(server_results.json_response)}\n"
+
+        footer_message = f"\nTotal time for retrieval: {total_time:.3f} seconds\n"
+
+        # Each chunk goes out as soon as it is full, rather than rendering everything first
+        for chunk in iter_lines_to_fit_event(chain(_server_key_rows(), (footer_message,)), header_message):
             current_message = await command_event.respond(
                 make_into_text_event(wrap_in_code_block_markdown(chunk), ignore_body=True),
             )
-            list_of_message_ids.extend([current_message])
+            list_of_message_ids.append(current_message)
         for message_id in list_of_message_ids:
             await self.reaction_task_controller.add_cleanup_control(message_id, command_event.room_id)
 
@@ -3149,42 +3062,9 @@ class FederationBot(RoomWalkCommand):
         # Let the user know the bot is paying attention
         await command_event.mark_read()
 
-        # It may be that they are using their mxid as the server to check, parse that
-        maybe_user_mxid = is_mxid(server_to_check)
-        if maybe_user_mxid:
-            server_to_check = get_domain_from_id(maybe_user_mxid)
-
-        # As an undocumented option, allow passing in a room_id to check an entire room.
-        # This can be rather long(and time consuming) so we'll place limits later.
-        maybe_room_id = is_room_id_or_alias(server_to_check)
-        if maybe_room_id:
-            origin_server = get_domain_from_id(self.client.mxid)
-            room_to_check, _ = await self.resolve_room_id_or_alias(maybe_room_id, command_event, origin_server)
-            # Need to cancel server_to_check, but can't use None
-            server_to_check = ""
-            if not room_to_check:
-                # Don't need to actually display an error, that's handled in the above
-                # function
-                return
-        else:
-            room_to_check = command_event.room_id
-
-        list_of_servers_to_check = set()
-        # If the room id was passed in, then this will turn into None
-        if not server_to_check:
-            try:
-                assert isinstance(room_to_check, str)
-                joined_members = await self.client.get_joined_members(RoomID(room_to_check))
-
-            except MForbidden:
-                await command_event.respond(NOT_IN_ROOM_ERROR)
-                return
-
-            for member in joined_members:
-                list_of_servers_to_check.add(get_domain_from_id(member))
-
-        else:
-            list_of_servers_to_check.add(server_to_check)
+        list_of_servers_to_check = await self.get_servers_to_check(server_to_check, command_event)
+        if list_of_servers_to_check is None:
+            return
 
         number_of_servers = len(list_of_servers_to_check)
         if number_of_servers > 1 and display_raw:
@@ -3201,12 +3081,6 @@ class FederationBot(RoomWalkCommand):
             )
             return
 
-        if number_of_servers > 1 and display_raw:
-            await command_event.respond(
-                "Only can see raw JSON data if a single server is selected(as the response would be super spammy).",
-            )
-            return
-
         if not notary_server_to_use:
             notary_server_to_use = get_domain_from_id(command_event.sender)
 
@@ -3221,45 +3095,25 @@ class FederationBot(RoomWalkCommand):
         )
         list_of_message_ids: list[EventID] = [prerender_message]
 
-        server_to_server_data: dict[str, MatrixResponse] = {}
-        minimum_valid_until_ts = int(time.time() * 1000) + (30 * 60 * 1000)  # Add 30 minutes
-
-        async def _server_keys_from_notary_worker(
-            _queue: asyncio.Queue[str],
-        ) -> None:
-            while True:
-                worker_server_name = await _queue.get()
+        time_now = time.time_ns() // 1_000_000
+        minimum_valid_until_ts = time_now + (30 * 60 * 1000)  # Add 30 minutes
 
-                result = await self.federation_handler.api.get_server_notary_keys(
-                    worker_server_name,
-                    notary_server_to_use,
-                    minimum_valid_until_ts,
-                )
-
-                server_to_server_data[worker_server_name] = result
-                _queue.task_done()
-
-        keys_queue: asyncio.Queue[str] = asyncio.Queue()
-        for server_name in list_of_servers_to_check:
-            await keys_queue.put(server_name)
-
-        # Setup the task into the controller
-        reference_key = self.reaction_task_controller.setup_task_set(command_event.event_id)
-
-        self.reaction_task_controller.add_tasks(
-            reference_key,
-            _server_keys_from_notary_worker,
-            keys_queue,
-            limit=MAX_NUMBER_OF_SERVERS_TO_ATTEMPT,
-        )
+        async def _fetch_notary_keys(server_name: str) -> tuple[MatrixResponse, list[tuple[str, str]]]:
+            response = await self.federation_handler.api.get_server_notary_keys(
+                server_name,
+                notary_server_to_use,
+                minimum_valid_until_ts,
+            )
+            # A notary can answer with more than one set of keys for the server, flatten each in turn
+            key_rows: list[tuple[str, str]] = []
+            if response.http_code == 200:
+                for server_key_entry in response.json_response.get("server_keys", []):
+                    key_rows.extend(_flatten_verify_keys(server_key_entry, time_now))
+            return response, key_rows
 
         started_at = time.monotonic()
-
-        await keys_queue.join()
-
+        server_to_server_data = await self._fan_out_to_servers(list_of_servers_to_check, _fetch_notary_keys)
         total_time = time.monotonic() - started_at
-        # Cancel our worker tasks.
-        await self.reaction_task_controller.cancel(reference_key)
 
         # Preprocess the data to get the column sizes
         # Want it to look like this for now, for the whole room version. Obviously a
@@ -3275,18 +3129,10 @@ class FederationBot(RoomWalkCommand):
         server_key_col = DisplayLineColumnConfig("Key ID")
         valid_until_ts_col = DisplayLineColumnConfig("Valid until(UTC)")
 
-        for server_name, server_results in server_to_server_data.items():
-            server_name_col.maybe_update_column_width(len(server_name))
-
-            # Not worried about column size for errors
-            if server_results.http_code == 200:
-                server_key_list: list[dict[str, Any]] = server_results.json_response.get("server_keys", [])
-                for server_key_entry in server_key_list:
-                    key_ids: dict[str, Any] = server_key_entry.get("verify_keys", {})
-                    old_verify_keys: dict[str, Any] = server_key_entry.get("old_verify_keys", {})
-                    for key_id in chain(key_ids, old_verify_keys):
-                        # cast this to a str explicitly, in case someone gets funny ideas
-                        server_key_col.maybe_update_column_width(str(key_id))
+        # Not worried about column size for errors, they have no key rows
+        server_name_col.maybe_update_column_width(max(map(len, server_to_server_data), default=0))
+        all_key_ids = (key_id for _, key_rows in server_to_server_data.values() for key_id, _ in key_rows)
+        server_key_col.maybe_update_column_width(max(map(len, all_key_ids), default=0))
 
         # Begin constructing the message
 
@@ -3297,63 +3143,40 @@ class FederationBot(RoomWalkCommand):
         total_srv_line_size = len(header_message)
 
         # Create the delimiter line under the header
-        header_message += f"{pad('', total_srv_line_size, pad_with='-')}\n"
+        header_message += f"{'-' * total_srv_line_size}\n"
 
-        # The collection of lines to be chunked later
-        list_of_result_data = []
-        # Use a sorted list of server names, so it displays in alphabetical order.
-        for server_name, server_results in sorted(server_to_server_data.items()):
-            # There will only be data for servers that didn't time out
-            first_line = True
-            buffered_message = f"{server_name_col.pad(server_name)} | "
-            if server_results.http_code != 200:
-                buffered_message += f"{server_results.http_code}: {server_results.reason}\n"
-
-            else:
-                time_now = int(time.time() * 1000)
-                server_key_list = server_results.json_response.get("server_keys", [])
-                for server_key_entry in server_key_list:
-                    key_ids = server_key_entry.get("verify_keys", {})
-                    valid_until_ts = server_key_entry.get("valid_until_ts", 0)
-                    valid_until_pretty = pretty_print_timestamp(valid_until_ts)
-                    pretty_expired_mark = "*" if valid_until_ts < time_now else ""
-                    old_verify_keys = server_key_entry.get("old_verify_keys", {})
-                    for key_id in key_ids:
-                        if not first_line:
-                            buffered_message += f"{server_name_col.pad('')} | "
-                        buffered_message += f"{server_key_col.pad(key_id)} | "
-                        # Don't care about padding, as this is end of line
-                        buffered_message += f"{pretty_expired_mark}{valid_until_pretty}\n"
+        # The blank server name column in front of every key after the first is the same for every row
+        continuation_prefix = f"{server_name_col.pad('')} | "
 
-                        first_line = False
+        def _notary_key_rows() -> Iterator[str]:
+            # Use a sorted list of server names, so it displays in alphabetical order.
+            for server_name, (server_results, key_rows) in sorted(server_to_server_data.items(), key=itemgetter(0)):
+                # There will only be data for servers that didn't time out
+                row_parts = [f"{server_name_col.pad(server_name)} | "]
+                if server_results.http_code != 200:
+                    row_parts.append(f"{server_results.http_code}: {server_results.reason}\n")
 
-                    for old_key_id, old_key_data in old_verify_keys.items():
-                        expired_ts = old_key_data.get("expired_ts", 0)
-                        expired_pretty = pretty_print_timestamp(expired_ts)
-                        pretty_expired_mark = "*" if expired_ts < time_now else ""
-                        if not first_line:
-                            buffered_message += f"{server_name_col.pad('')} | "
-                        buffered_message += f"{server_key_col.pad(old_key_id)} | "
+                else:
+                    for row_index, (key_id, key_timestamp) in enumerate(key_rows):
+                        if row_index:
+                            row_parts.append(continuation_prefix)
                         # Don't care about padding, as this is end of line
-                        buffered_message += f"{pretty_expired_mark}{expired_pretty}\n"
-                        first_line = False
+                        row_parts.append(f"{server_key_col.pad(key_id)} | {key_timestamp}\n")
 
-            list_of_result_data.extend([buffered_message])
+                yield "".join(row_parts)
 
-            # Only if there was a single server because of the above condition
-            if display_raw:
-                list_of_result_data.extend([f"{json.dumps(server_results.json_response, indent=4)}\n"])
+                # Only if there was a single server because of the above condition
+                if display_raw:
+                    yield f"{pretty_json(server_results.json_response)}\n"
 
         footer_message = f"\nTotal time for retrieval: {total_time:.3f} seconds\n"
-        list_of_result_data.extend([footer_message])
-
-        final_list_of_data = combine_lines_to_fit_event(list_of_result_data, header_message)
 
-        for chunk in final_list_of_data:
+        # Each chunk goes out as soon as it is full, rather than rendering everything first
+        for chunk in iter_lines_to_fit_event(chain(_notary_key_rows(), (footer_message,)), header_message):
             current_message = await command_event.respond(
                 make_into_text_event(wrap_in_code_block_markdown(chunk), ignore_body=True),
             )
-            list_of_message_ids.extend([current_message])
+            list_of_message_ids.append(current_message)
 
         for message_id in list_of_message_ids:
             await self.reaction_task_controller.add_cleanup_control(message_id, command_event.room_id)
@@ -3403,9 +3226,7 @@ class FederationBot(RoomWalkCommand):
 
         if origin_server_ts:
             # A nice little addition for the status updated before the command runs
-            special_time_formatting = (
-                f"\n  * which took place at: {datetime.fromtimestamp(float(origin_server_ts / 1000))} UTC"
-            )
+            special_time_formatting = f"\n  * which took place at: {pretty_print_timestamp(origin_server_ts)} UTC"
         else:
             special_time_formatting = ""
 
@@ -3429,36 +3250,24 @@ class FederationBot(RoomWalkCommand):
         )
 
         # Time to start rendering. Build the header lines first
-        header_message = ""
         dc_depth = DisplayLineColumnConfig("Depth")
         dc_eid = DisplayLineColumnConfig("Event ID", initial_size=44)
         dc_etype = DisplayLineColumnConfig("Event Type")
         dc_sender = DisplayLineColumnConfig("Sender")
         dc_extras = DisplayLineColumnConfig("Extras")
 
-        # Reconstruct the list so it can be sorted by depth
-        pdu_list: list[tuple[int, EventBase]] = []
-        for event_base in pdu_list_from_response:
-            # Don't worry about resizing the 'Extras' Column,
-            # it's on the end and variable length
-            dc_depth.maybe_update_column_width(len(str(event_base.depth)))
-            dc_etype.maybe_update_column_width(len(event_base.event_type))
-            dc_sender.maybe_update_column_width(len(event_base.sender))
+        # Don't worry about resizing the 'Extras' Column, it's on the end and variable length
+        dc_depth.maybe_update_column_width(max((len(str(e.depth)) for e in pdu_list_from_response), default=0))
+        dc_etype.maybe_update_column_width(max((len(e.event_type) for e in pdu_list_from_response), default=0))
+        dc_sender.maybe_update_column_width(max((len(e.sender) for e in pdu_list_from_response), default=0))
 
-            pdu_list.append((event_base.depth, event_base))
+        # Reconstruct the list so it can be sorted by depth
+        pdu_list: list[tuple[int, EventBase]] = [(event.depth, event) for event in pdu_list_from_response]
 
         # Sort the list in place by the first of the tuples, which is the depth
-        pdu_list.sort(key=lambda x: x[0])
-
-        # Build the header line...
-        header_message += f"{dc_depth.pad()} "
-        header_message += f"{dc_eid.pad()} "
-        header_message += f"{dc_etype.pad()} "
-        header_message += f"{dc_sender.pad()} "
-        header_message += f"{dc_extras.pad()}\n"
+        pdu_list.sort(key=itemgetter(0))
 
-        # ...and the delimiter
-        header_message += f"{pad('', pad_to=len(header_message), pad_with='-')}\n"
+        header_message = render_table_header(dc_depth, dc_eid, dc_etype, dc_sender, dc_extras)
         list_of_buffer_lines = []
 
         # Begin the render, first construct the template list
@@ -3469,12 +3278,9 @@ class FederationBot(RoomWalkCommand):
             (["sender"], dc_sender),
         ]
         for _, event_base in pdu_list:
-            line_summary = event_base.to_template_line_summary(template_list)
-            line_summary += " "
-            line_summary += event_base.to_extras_summary()
-            line_summary += "\n"
-
-            list_of_buffer_lines.extend([line_summary])
+            list_of_buffer_lines.append(
+                f"{event_base.to_template_line_summary(template_list)} {event_base.to_extras_summary()}\n",
+            )
 
         # Chunk the data as there may be a few 'pages' of it
         final_list_of_data = combine_lines_to_fit_event(list_of_buffer_lines, header_message)
@@ -3483,7 +3289,7 @@ class FederationBot(RoomWalkCommand):
             current_message = await command_event.respond(
                 make_into_text_event(wrap_in_code_block_markdown(chunk), ignore_body=True),
             )
-            list_of_message_ids.extend([current_message])
+            list_of_message_ids.append(current_message)
         for message_id in list_of_message_ids:
             await self.reaction_task_controller.add_cleanup_control(message_id, command_event.room_id)
 
@@ -3524,9 +3330,7 @@ class FederationBot(RoomWalkCommand):
 
         if origin_server_ts:
             # A nice little addition for the status updated before the command runs
-            special_time_formatting = (
-                f"\n  * which took place at: {datetime.fromtimestamp(float(origin_server_ts / 1000))} UTC"
-            )
+            special_time_formatting = f"\n  * which took place at: {pretty_print_timestamp(origin_server_ts)} UTC"
         else:
             special_time_formatting = ""
 
@@ -3556,36 +3360,24 @@ class FederationBot(RoomWalkCommand):
         total_time = time.monotonic() - started_at
 
         # Time to start rendering. Build the header lines first
-        header_message = ""
         dc_depth = DisplayLineColumnConfig("Depth")
         dc_eid = DisplayLineColumnConfig("Event ID")
         dc_etype = DisplayLineColumnConfig("Event Type")
         dc_sender = DisplayLineColumnConfig("Sender")
         dc_extras = DisplayLineColumnConfig("Extras")
 
-        ordered_list: list[tuple[int, EventBase]] = []
-        for event in list_of_event_bases:
-            # Don't worry about resizing the 'Extras' Column,
-            # it's on the end and variable length
-            dc_depth.maybe_update_column_width(len(str(event.depth)))
-            dc_eid.maybe_update_column_width(len(str(event.event_id)))
-            dc_etype.maybe_update_column_width(len(event.event_type))
-            dc_sender.maybe_update_column_width(len(event.sender))
+        # Don't worry about resizing the 'Extras' Column, it's on the end and variable length
+        dc_depth.maybe_update_column_width(max((len(str(e.depth)) for e in list_of_event_bases), default=0))
+        dc_eid.maybe_update_column_width(max((len(str(e.event_id)) for e in list_of_event_bases), default=0))
+        dc_etype.maybe_update_column_width(max((len(e.event_type) for e in list_of_event_bases), default=0))
+        dc_sender.maybe_update_column_width(max((len(e.sender) for e in list_of_event_bases), default=0))
 
-            ordered_list.append((event.depth, event))
+        ordered_list: list[tuple[int, EventBase]] = [(event.depth, event) for event in list_of_event_bases]
 
         # Sort the list in place by the first of the tuples, which is the depth
-        ordered_list.sort(key=lambda x: x[0])
+        ordered_list.sort(key=itemgetter(0))
 
-        # Build the header line...
-        header_message += f"{dc_depth.pad()} "
-        header_message += f"{dc_eid.pad()}"
-        header_message += f"{dc_etype.pad()} "
-        header_message += f"{dc_sender.pad()} "
-        header_message += f"{dc_extras.pad()}\n"
-
-        # ...and the delimiter
-        header_message += f"{pad('', pad_to=len(header_message), pad_with='-')}\n"
+        header_message = render_table_header(dc_depth, dc_eid, dc_etype, dc_sender, dc_extras)
         list_of_buffer_lines = []
 
         # Begin the render, first construct the template list
@@ -3596,17 +3388,12 @@ class FederationBot(RoomWalkCommand):
             (["sender"], dc_sender),
         ]
         for _, event_base in ordered_list:
-            buffered_message = ""
-            line_summary = event_base.to_template_line_summary(template_list)
-            line_summary += " "
-            line_summary += event_base.to_extras_summary()
-
-            buffered_message += f"{line_summary}\n"
-
-            list_of_buffer_lines.extend([buffered_message])
+            list_of_buffer_lines.append(
+                f"{event_base.to_template_line_summary(template_list)} {event_base.to_extras_summary()}\n",
+            )
 
         footer_message = f"\nTotal time for retrieval: {total_time:.3f} seconds\n"
-        list_of_buffer_lines.extend([footer_message])
+        list_of_buffer_lines.append(footer_message)
 
         # Chunk the data as there may be a few 'pages' of it
         final_list_of_data = combine_lines_to_fit_event(list_of_buffer_lines, header_message)
@@ -3615,7 +3402,7 @@ class FederationBot(RoomWalkCommand):
             current_message = await command_event.respond(
                 make_into_text_event(wrap_in_code_block_markdown(chunk), ignore_body=True),
             )
-            list_of_message_ids.extend([current_message])
+            list_of_message_ids.append(current_message)
 
         for message_id in list_of_message_ids:
             await self.reaction_task_controller.add_cleanup_control(message_id, command_event.room_id)
@@ -3634,7 +3421,7 @@ class FederationBot(RoomWalkCommand):
         if not origin_server:
             return
 
-        _, destination_server = user_mxid.split(":", maxsplit=1)
+        destination_server = get_domain_from_id(user_mxid)
 
         prerender_message = await command_event.respond(
             f"Retrieving user devices for {user_mxid}\n* From {destination_server} using {origin_server}",
@@ -3650,12 +3437,12 @@ class FederationBot(RoomWalkCommand):
         if response.http_code != 200:
             await command_event.respond(
                 f"Some kind of error\n{response.http_code}:{response.reason}\n\n"
-                f"{json.dumps(response.json_response, indent=4)}",
+                f"{pretty_json(response.json_response)}",
             )
             return
 
-        message_id = await command_event.respond(f"```json\n{json.dumps(response.json_response, indent=4)}\n```\n")
-        list_of_message_ids.extend([message_id])
+        message_id = await command_event.respond(f"```json\n{pretty_json(response.json_response)}\n```\n")
+        list_of_message_ids.append(message_id)
 
         for message_id in list_of_message_ids:
             await self.reaction_task_controller.add_cleanup_control(message_id, command_event.room_id)
@@ -3713,7 +3500,7 @@ class FederationBot(RoomWalkCommand):
             origin_server,
             origin_server,
             room_id,
-            int(time.time() * 1000),
+            time.time_ns() // 1_000_000,
         )
         if ts_response.http_code != 200:
             host_list = []
@@ -3738,7 +3525,7 @@ class FederationBot(RoomWalkCommand):
             current_message = await command_event.respond(
                 "Failed getting hosts from State over federation, falling back to client API",
             )
-            list_of_message_ids.extend([current_message])
+            list_of_message_ids.append(current_message)
             try:
                 joined_members = await self.client.get_joined_members(RoomID(room_id))
 
@@ -3746,33 +3533,47 @@ class FederationBot(RoomWalkCommand):
                 await command_event.respond(NOT_IN_ROOM_ERROR)
                 return
 
-            for member in joined_members:
-                host = get_domain_from_id(member)
-                if host not in host_list:
-                    host_list.extend([host])
+            # dict.fromkeys() de-duplicates while keeping the order the members came in
+            host_list = list(dict.fromkeys(map(get_domain_from_id, joined_members)))
 
         started_at = time.time()
-        host_to_event_status_map = await self.federation_handler.find_event_on_servers(
+        host_to_event_status_map: dict[str, EventBase] = {}
+        # Rooms with a long tail of unreachable servers can take a while, so show how far along it is
+        progress_message: EventID | None = None
+        last_progress_at = time.monotonic()
+        async for host, found in self.federation_handler.iter_find_event_on_servers(
             origin_server,
             event_id,
             host_list,
-        )
+        ):
+            host_to_event_status_map[host] = found
+            if time.monotonic() - last_progress_at > SECONDS_BETWEEN_EDITS:
+                progress_text = f"Hosts that have answered: {len(host_to_event_status_map)} of {len(host_list)}"
+                if progress_message is None:
+                    progress_message = await command_event.respond(progress_text)
+                    list_of_message_ids.append(progress_message)
+                else:
+                    await command_event.respond(progress_text, edits=progress_message)
+                last_progress_at = time.monotonic()
         total_time = time.time() - started_at
 
         # Begin the render
         dc_host_config = DisplayLineColumnConfig("Hosts", justify=Justify.RIGHT)
         dc_result_config = DisplayLineColumnConfig("Results")
-
-        for host in host_to_event_status_map:
-            dc_host_config.maybe_update_column_width(len(host))
+        dc_host_config.maybe_update_column_width(max(map(len, host_to_event_status_map), default=0))
 
         header_message = f"Hosts{'(in oldest order)' if use_ordered_list else ''} that found event '{event_id}'\n"
         list_of_result_data = []
         servers_had = 0
         servers_not_had = 0
+        # These are the same for every row, only build them once
+        separator = dc_host_config.horizontal_separator
+        padded_fail = dc_result_config.pad("Fail")
+        # padded_fail = dc_result_config.pad(add_color(bold("Fail"), foreground=Colors.WHITE, background=Colors.RED))
+        padded_ok = dc_result_config.pad("OK")
+        # padded_ok = dc_result_config.pad(add_color(bold("OK"), foreground=Colors.WHITE, background=Colors.GREEN))
         for host in host_list:
             result = host_to_event_status_map.get(host)
-            buffered_message = ""
             if result:
                 if isinstance(result, EventError):
                     errcode_result = ""
@@ -3780,44 +3581,30 @@ class FederationBot(RoomWalkCommand):
                         try:
                             errcode = int(result.errcode)
                         except ValueError:
-                            errcode_result = dc_host_config.horizontal_separator + result.errcode
+                            errcode_result = separator + result.errcode
                         else:
-                            errcode_result = dc_host_config.horizontal_separator + result.errcode if errcode > 0 else ""
-                    buffered_message += (
-                        f"{dc_host_config.pad(host)}"
-                        f"{dc_host_config.horizontal_separator}"
-                        f"{dc_result_config.pad('Fail')}"
-                        # f"{dc_result_config.pad(add_color(bold('Fail'), foreground=Colors.WHITE, background=Colors.RED))}"
-                        f"{errcode_result}"
-                        f"{dc_host_config.horizontal_separator}{result.error}"
+                            errcode_result = separator + result.errcode if errcode > 0 else ""
+                    # remove the new line for <code> tags
+                    list_of_result_data.append(
+                        f"{dc_host_config.pad(host)}{separator}{padded_fail}{errcode_result}{separator}{result.error}\n"
                     )
                     servers_not_had += 1
                 else:
-                    buffered_message += (
-                        f"{dc_host_config.pad(host)}{dc_host_config.horizontal_separator}{dc_result_config.pad('OK')}"
-                        # f"{dc_result_config.pad(add_color(bold('OK'), foreground=Colors.WHITE, background=Colors.GREEN))}"
-                    )
+                    list_of_result_data.append(f"{dc_host_config.pad(host)}{separator}{padded_ok}\n")
                     servers_had += 1
             else:
                 # The "unlikely to ever be hit" error
-                buffered_message += (
-                    f"{dc_host_config.pad(host)}"
-                    f"{dc_host_config.horizontal_separator}"
-                    f"{dc_result_config.pad('Fail')}"
-                    f"{dc_host_config.horizontal_separator}"
-                    "Plugin error(Host not contacted)"
+                list_of_result_data.append(
+                    f"{dc_host_config.pad(host)}{separator}{padded_fail}{separator}Plugin error(Host not contacted)\n"
                 )
 
-            # remove the new line for <code> tags
-            list_of_result_data.extend([f"{buffered_message}\n"])
-
         # remove the new line for <code> tags
         footer_message = (
             f"\nTotal time for retrieval: {total_time:.3f} seconds\n"
             f"Servers Good: {servers_had}\n"
             f"Servers Fail: {servers_not_had}\n"
         )
-        list_of_result_data.extend([footer_message])
+        list_of_result_data.append(footer_message)
 
         # For a single server test, the response will fit into a single message block.
         # However, for a roomful it could be several pages long. Chunk those responses
@@ -3828,7 +3615,7 @@ class FederationBot(RoomWalkCommand):
             message_id = await command_event.respond(
                 make_into_text_event(wrap_in_code_block_markdown(chunk), ignore_body=True),
             )
-            list_of_message_ids.extend([message_id])
+            list_of_message_ids.append(message_id)
 
         for message_id in list_of_message_ids:
             await self.reaction_task_controller.add_cleanup_control(message_id, command_event.room_id)
@@ -3862,7 +3649,7 @@ class FederationBot(RoomWalkCommand):
             target_server,
             since=since,
         )
-        await command_event.respond(wrap_in_code_block_markdown(json.dumps(public_room_result.json_response, indent=4)))
+        await command_event.respond(wrap_in_code_block_markdown(pretty_json(public_room_result.json_response)))
 
     @fed_command.subcommand(name="publicrooms")
     @command.argument(name="target_server", required=False)
@@ -3955,17 +3742,15 @@ class FederationBot(RoomWalkCommand):
             world_readable = chunk.get("world_readable", "")
             guest_can_join = chunk.get("guest_can_join", "")
             avatar_url = chunk.get("avatar_url", "")
-            list_of_buffered_lines.extend(
-                [
-                    f"{room_id_dc.pad(room_id)}: "
-                    f"{alias_dc.pad(alias)} "
-                    f"{name_dc.pad(name)} "
-                    f"{num_joined_members_dc.pad(num_joined_members)} "
-                    f"{join_rule_dc.pad(join_rule)} "
-                    f"{guest_can_join_dc.pad(guest_can_join)} "
-                    f"{world_readable_dc.pad(world_readable)} "
-                    f"{avatar_url_dc.pad(avatar_url)}",
-                ]
+            list_of_buffered_lines.append(
+                f"{room_id_dc.pad(room_id)}: "
+                f"{alias_dc.pad(alias)} "
+                f"{name_dc.pad(name)} "
+                f"{num_joined_members_dc.pad(num_joined_members)} "
+                f"{join_rule_dc.pad(join_rule)} "
+                f"{guest_can_join_dc.pad(guest_can_join)} "
+                f"{world_readable_dc.pad(world_readable)} "
+                f"{avatar_url_dc.pad(avatar_url)}",
             )
 
         header_message = (
@@ -3984,7 +3769,7 @@ class FederationBot(RoomWalkCommand):
             message_id = await command_event.respond(
                 make_into_text_event(wrap_in_code_block_markdown(line), ignore_body=True),
             )
-            list_of_message_ids.extend([message_id])
+            list_of_message_ids.append(message_id)
         for message_id in list_of_message_ids:
             await self.reaction_task_controller.add_cleanup_control(message_id, command_event.room_id)
 
@@ -4001,50 +3786,11 @@ class FederationBot(RoomWalkCommand):
             command_event: Event that triggered the command
             server_to_check: Server name to check delegation for
         """
-        list_of_servers_to_check = set()
-
         await command_event.mark_read()
 
-        # It may be that they are using their mxid as the server to check, parse that
-        maybe_user_mxid = is_mxid(server_to_check)
-        if maybe_user_mxid:
-            server_to_check = get_domain_from_id(maybe_user_mxid)
-
-        # As an undocumented option, allow passing in a room_id to check an entire room.
-        # This can be rather long(and time consuming) so we'll place limits later.
-        maybe_room_id = is_room_id_or_alias(server_to_check)
-        if maybe_room_id:
-            origin_server = get_domain_from_id(self.client.mxid)
-            room_to_check, _ = await self.resolve_room_id_or_alias(maybe_room_id, command_event, origin_server)
-            # Need to cancel server_to_check, but can't use None
-            server_to_check = ""
-            if not room_to_check:
-                # Don't need to actually display an error, that's handled in the above
-                # function
-                return
-        else:
-            # with server_to_check being set, this will be ignored any way
-            room_to_check = command_event.room_id
-
-        # server_to_check has survived this far, add it to the set of servers to search
-        # for. Since we allow for searching an entire room, it will be the only server
-        # in the set.
-        if server_to_check:
-            list_of_servers_to_check.add(server_to_check)
-
-        # The list of servers was empty. This implies that a room_id was provided,
-        # let's check.
-        if not list_of_servers_to_check:
-            try:
-                assert room_to_check is not None
-                joined_members = await self.client.get_joined_members(RoomID(room_to_check))
-
-            except MForbidden:
-                await command_event.respond(NOT_IN_ROOM_ERROR)
-                return
-
-            for member in joined_members:
-                list_of_servers_to_check.add(get_domain_from_id(member))
+        list_of_servers_to_check = await self.get_servers_to_check(server_to_check, command_event)
+        if list_of_servers_to_check is None:
+            return
 
         number_of_servers = len(list_of_servers_to_check)
 
@@ -4056,44 +3802,13 @@ class FederationBot(RoomWalkCommand):
         )
         list_of_message_ids: list[EventID] = [prerender_message]
 
-        # map of server name -> (server brand, server version)
-        server_to_server_data: dict[str, WellKnownLookupResult] = {}
-        set_of_server_names = set(list_of_servers_to_check)
-
-        async def _delegation_worker(queue: asyncio.Queue[str]) -> None:
-            while True:
-                worker_server_name = await queue.get()
-
-                # The 'get_server_version' function was written with the capability of
-                # collecting diagnostic data.
-                try:
-                    server_to_server_data[worker_server_name] = (
-                        await self.federation_handler.api.federation_transport.server_discovery.get_well_known(
-                            worker_server_name, [], Diagnostics()
-                        )
-                    )
-                    set_of_server_names.discard(worker_server_name)
-                except Exception as e:
-                    self.log.warning("delegation worker error on %s: %r", worker_server_name, e, exc_info=True)
-                    raise
-                queue.task_done()
-
-        delegation_queue: asyncio.Queue[str] = asyncio.Queue()
-        for server_name in list_of_servers_to_check:
-            delegation_queue.put_nowait(server_name)
-
-        reference_key = self.reaction_task_controller.setup_task_set(command_event.event_id)
-
-        self.reaction_task_controller.add_tasks(
-            reference_key,
-            _delegation_worker,
-            delegation_queue,
-            limit=MAX_NUMBER_OF_SERVERS_TO_ATTEMPT,
-        )
-
+        server_discovery = self.federation_handler.api.federation_transport.server_discovery
         started_at = time.monotonic()
-        await delegation_queue.join()
-        await self.reaction_task_controller.cancel(reference_key)
+        # map of server name -> well known lookup result, a server that errored will show up as missing
+        server_to_server_data = await self._fan_out_to_servers(
+            list_of_servers_to_check,
+            lambda server_name: server_discovery.get_well_known(server_name, [], Diagnostics()),
+        )
         total_time = time.monotonic() - started_at
 
         # Want the full room version it to look like this for now
@@ -4131,10 +3846,10 @@ class FederationBot(RoomWalkCommand):
 
         # Begin constructing the message
         #
-        # Use a sorted list of server names, so it displays in alphabetical order.
-        server_results_sorted = sorted(server_to_server_data.keys())
+        # Sort the results by server name, so it displays in alphabetical order.
+        server_results_sorted = sorted(server_to_server_data.items(), key=itemgetter(0))
 
-        servers_missing = list_of_servers_to_check - set(server_results_sorted)
+        servers_missing = list_of_servers_to_check - server_to_server_data.keys()
         # Build the header line
         header_message = (
             f"{server_name_col.front_pad()} | "
@@ -4149,13 +3864,11 @@ class FederationBot(RoomWalkCommand):
         header_line_size = len(header_message)
 
         # Create the delimiter line under the header
-        header_message += f"{pad('', header_line_size, pad_with='-')}\n"
+        header_message += f"{'-' * header_line_size}\n"
 
         list_of_result_data = []
         # Use the sorted list from earlier, alphabetical looks nicer
-        for server_name in server_results_sorted:
-            response = server_to_server_data[server_name]
-
+        for server_name, response in server_results_sorted:
             # Want the full room version it to look like this for now
             #
             #   Server Name | Status | Host                 | Port  | TLS served by  | Errors
@@ -4164,27 +3877,25 @@ class FederationBot(RoomWalkCommand):
             # somewhere.net |    404 | None                 | Error | resty          | Long error....
             #   maunium.net |    200 | meow.host.mau.fi     | 443   | Caddy          |
 
-            buffered_message = f"{server_name_col.front_pad(server_name)} | "
+            row_start = f"{server_name_col.front_pad(server_name)} | "
             if isinstance(response, WellKnownDiagnosticResult):
-                buffered_message += f"{status_col.pad(response.status_code)} | "
-                buffered_message += f"{host_col.pad(response.host)} | "
-                buffered_message += f"{port_col.pad(response.port)} | "
-
                 maybe_tls_server = response.headers.get("server")
-                buffered_message += f"{tls_served_by_col.pad(maybe_tls_server if maybe_tls_server else '')} | "
-
-                buffered_message += "\n"
+                buffered_message = (
+                    f"{row_start}{status_col.pad(response.status_code)} | "
+                    f"{host_col.pad(response.host)} | "
+                    f"{port_col.pad(response.port)} | "
+                    f"{tls_served_by_col.pad(maybe_tls_server if maybe_tls_server else '')} | \n"
+                )
 
             else:
                 assert isinstance(response, WellKnownLookupFailure)
                 # Sometimes status_code can be None, but if we let that ride it shows up as the header name of the column
-                buffered_message += f"{status_col.pad(response.status_code or '')} | "
-                buffered_message += f"{response.reason}\n"
+                buffered_message = f"{row_start}{status_col.pad(response.status_code or '')} | {response.reason}\n"
 
-            list_of_result_data.extend([buffered_message])
+            list_of_result_data.append(buffered_message)
 
         footer_message = f"\nTotal time for retrieval: {total_time:.3f} seconds\nservers missing: {servers_missing}\n"
-        list_of_result_data.extend([footer_message])
+        list_of_result_data.append(footer_message)
 
         # For a single server test, the response will fit into a single message block.
         # However, for a roomful it could be several pages long. Chunk those responses
@@ -4195,7 +3906,7 @@ class FederationBot(RoomWalkCommand):
             current_message = await command_event.respond(
                 make_into_text_event(wrap_in_code_block_markdown(chunk), ignore_body=True),
             )
-            list_of_message_ids.extend([current_message])
+            list_of_message_ids.append(current_message)
 
         for current_message in list_of_message_ids:
             await self.reaction_task_controller.add_cleanup_control(current_message, command_event.room_id)
@@ -4213,50 +3924,11 @@ class FederationBot(RoomWalkCommand):
             command_event: Event that triggered the command
             server_to_check: Server name to check delegation for
         """
-        list_of_servers_to_check = set()
-
         await command_event.mark_read()
 
-        # It may be that they are using their mxid as the server to check, parse that
-        maybe_user_mxid = is_mxid(server_to_check)
-        if maybe_user_mxid:
-            server_to_check = get_domain_from_id(maybe_user_mxid)
-
-        # As an undocumented option, allow passing in a room_id to check an entire room.
-        # This can be rather long(and time consuming) so we'll place limits later.
-        maybe_room_id = is_room_id_or_alias(server_to_check)
-        if maybe_room_id:
-            origin_server = get_domain_from_id(self.client.mxid)
-            room_to_check, _ = await self.resolve_room_id_or_alias(maybe_room_id, command_event, origin_server)
-            # Need to cancel server_to_check, but can't use None
-            server_to_check = ""
-            if not room_to_check:
-                # Don't need to actually display an error, that's handled in the above
-                # function
-                return
-        else:
-            # with server_to_check being set, this will be ignored any way
-            room_to_check = command_event.room_id
-
-        # server_to_check has survived this far, add it to the set of servers to search
-        # for. Since we allow for searching an entire room, it will be the only server
-        # in the set.
-        if server_to_check:
-            list_of_servers_to_check.add(server_to_check)
-
-        # The list of servers was empty. This implies that a room_id was provided,
-        # let's check.
-        if not list_of_servers_to_check:
-            try:
-                assert room_to_check is not None
-                joined_members = await self.client.get_joined_members(RoomID(room_to_check))
-
-            except MForbidden:
-                await command_event.respond(NOT_IN_ROOM_ERROR)
-                return
-
-            for member in joined_members:
-                list_of_servers_to_check.add(get_domain_from_id(member))
+        list_of_servers_to_check = await self.get_servers_to_check(server_to_check, command_event)
+        if list_of_servers_to_check is None:
+            return
 
         number_of_servers = len(list_of_servers_to_check)
 
@@ -4268,42 +3940,13 @@ class FederationBot(RoomWalkCommand):
         )
         list_of_message_ids: list[EventID] = [prerender_message]
 
-        # map of server name -> (server brand, server version)
-        server_to_server_data: dict[str, ServerDiscoveryDnsResult] = {}
-        set_of_server_names = set(list_of_servers_to_check)
-
-        async def _delegation_worker(queue: asyncio.Queue[str]) -> None:
-            while True:
-                worker_server_name = await queue.get()
-
-                try:
-                    server_to_server_data[worker_server_name] = (
-                        await self.federation_handler.api.federation_transport.server_discovery.exp_dns_resolver.resolve_reg_records(
-                            worker_server_name, Diagnostics()
-                        )
-                    )
-                    set_of_server_names.discard(worker_server_name)
-                except Exception as e:
-                    self.log.warning("delegation worker error on %s: %r", worker_server_name, e, exc_info=True)
-                    raise
-                queue.task_done()
-
-        delegation_queue: asyncio.Queue[str] = asyncio.Queue()
-        for server_name in list_of_servers_to_check:
-            delegation_queue.put_nowait(server_name)
-
-        reference_key = self.reaction_task_controller.setup_task_set(command_event.event_id)
-
-        self.reaction_task_controller.add_tasks(
-            reference_key,
-            _delegation_worker,
-            delegation_queue,
-            limit=MAX_NUMBER_OF_SERVERS_TO_ATTEMPT,
-        )
-
+        dns_resolver = self.federation_handler.api.federation_transport.server_discovery.exp_dns_resolver
         started_at = time.monotonic()
-        await delegation_queue.join()
-        await self.reaction_task_controller.cancel(reference_key)
+        # map of server name -> DNS lookup result, a server that errored will show up as missing
+        server_to_server_data = await self._fan_out_to_servers(
+            list_of_servers_to_check,
+            lambda server_name: dns_resolver.resolve_reg_records(server_name, Diagnostics()),
+        )
         total_time = time.monotonic() - started_at
 
         # Want the full room version it to look like this for now
@@ -4341,10 +3984,10 @@ class FederationBot(RoomWalkCommand):
 
         # Begin constructing the message
         #
-        # Use a sorted list of server names, so it displays in alphabetical order.
-        server_results_sorted = sorted(server_to_server_data.keys())
+        # Sort the results by server name, so it displays in alphabetical order.
+        server_results_sorted = sorted(server_to_server_data.items(), key=itemgetter(0))
 
-        servers_missing = list_of_servers_to_check - set(server_results_sorted)
+        servers_missing = list_of_servers_to_check - server_to_server_data.keys()
         # Build the header line
         header_message = (
             f"{server_name_col.front_pad()} | "
@@ -4359,13 +4002,11 @@ class FederationBot(RoomWalkCommand):
         header_line_size = len(header_message)
 
         # Create the delimiter line under the header
-        header_message += f"{pad('', header_line_size, pad_with='-')}\n"
+        header_message += f"{'-' * header_line_size}\n"
 
         list_of_result_data = []
         # Use the sorted list from earlier, alphabetical looks nicer
-        for server_name in server_results_sorted:
-            response = server_to_server_data[server_name]
-
+        for server_name, response in server_results_sorted:
             # Want the full room version it to look like this for now
             #
             #   Server Name | Status | Host                 | Port  | TLS served by  | Errors
@@ -4374,16 +4015,14 @@ class FederationBot(RoomWalkCommand):
             # somewhere.net |    404 | None                 | Error | resty          | Long error....
             #   maunium.net |    200 | meow.host.mau.fi     | 443   | Caddy          |
 
-            buffered_message = f"{server_name_col.front_pad(server_name)} | "
+            buffered_message = f"{server_name_col.front_pad(server_name)} | {results_col.pad(str(response))}\n"
             # if isinstance(response, WellKnownDiagnosticResult):
-            buffered_message += f"{results_col.pad(str(response))}"
             # buffered_message += f"{host_col.pad(response.host)} | "
             # buffered_message += f"{port_col.pad(response.port)} | "
             #
             # maybe_tls_server = response.headers.get("server")
             # buffered_message += f"{tls_served_by_col.pad(maybe_tls_server if maybe_tls_server else '')} | "
             #
-            buffered_message += "\n"
 
             # else:
             #     assert isinstance(response, WellKnownLookupFailure)
@@ -4391,10 +4030,10 @@ class FederationBot(RoomWalkCommand):
             #     buffered_message += f"{status_col.pad(response.status_code or '')} | "
             #     buffered_message += f"{response.reason}\n"
 
-            list_of_result_data.extend([buffered_message])
+            list_of_result_data.append(buffered_message)
 
         footer_message = f"\nTotal time for retrieval: {total_time:.3f} seconds\nservers missing: {servers_missing}\n"
-        list_of_result_data.extend([footer_message])
+        list_of_result_data.append(footer_message)
 
         # For a single server test, the response will fit into a single message block.
         # However, for a roomful it could be several pages long. Chunk those responses
@@ -4405,7 +4044,7 @@ class FederationBot(RoomWalkCommand):
             current_message = await command_event.respond(
                 make_into_text_event(wrap_in_code_block_markdown(chunk), ignore_body=True),
             )
-            list_of_message_ids.extend([current_message])
+            list_of_message_ids.append(current_message)
 
         for current_message in list_of_message_ids:
             await self.reaction_task_controller.add_cleanup_control(current_message, command_event.room_id)
@@ -4423,50 +4062,11 @@ class FederationBot(RoomWalkCommand):
             command_event: Event that triggered the command
             server_to_check: Server name to check delegation for
         """
-        list_of_servers_to_check = set()
-
         await command_event.mark_read()
 
-        # It may be that they are using their mxid as the server to check, parse that
-        maybe_user_mxid = is_mxid(server_to_check)
-        if maybe_user_mxid:
-            server_to_check = get_domain_from_id(maybe_user_mxid)
-
-        # As an undocumented option, allow passing in a room_id to check an entire room.
-        # This can be rather long(and time consuming) so we'll place limits later.
-        maybe_room_id = is_room_id_or_alias(server_to_check)
-        if maybe_room_id:
-            origin_server = get_domain_from_id(self.client.mxid)
-            room_to_check, _ = await self.resolve_room_id_or_alias(maybe_room_id, command_event, origin_server)
-            # Need to cancel server_to_check, but can't use None
-            server_to_check = ""
-            if not room_to_check:
-                # Don't need to actually display an error, that's handled in the above
-                # function
-                return
-        else:
-            # with server_to_check being set, this will be ignored any way
-            room_to_check = command_event.room_id
-
-        # server_to_check has survived this far, add it to the set of servers to search
-        # for. Since we allow for searching an entire room, it will be the only server
-        # in the set.
-        if server_to_check:
-            list_of_servers_to_check.add(server_to_check)
-
-        # The list of servers was empty. This implies that a room_id was provided,
-        # let's check.
-        if not list_of_servers_to_check:
-            try:
-                assert room_to_check is not None
-                joined_members = await self.client.get_joined_members(RoomID(room_to_check))
-
-            except MForbidden:
-                await command_event.respond(NOT_IN_ROOM_ERROR)
-                return
-
-            for member in joined_members:
-                list_of_servers_to_check.add(get_domain_from_id(member))
+        list_of_servers_to_check = await self.get_servers_to_check(server_to_check, command_event)
+        if list_of_servers_to_check is None:
+            return
 
         number_of_servers = len(list_of_servers_to_check)
 
@@ -4478,43 +4078,10 @@ class FederationBot(RoomWalkCommand):
         )
         list_of_message_ids: list[EventID] = [prerender_message]
 
-        # map of server name -> (server brand, server version)
-        server_to_server_data: dict[str, MatrixResponse] = {}
-        set_of_server_names = set(list_of_servers_to_check)
-
-        async def _discover_worker(queue: asyncio.Queue[str]) -> None:
-            while True:
-                worker_server_name = await queue.get()
-
-                try:
-                    server_to_server_data[worker_server_name] = (
-                        await self.federation_handler.api.get_server_version_new(
-                            worker_server_name,
-                            diagnostics=True,
-                        )
-                    )
-                    set_of_server_names.discard(worker_server_name)
-                except Exception:
-                    # self.log.warning("discover worker error on %s: %r", worker_server_name, e, exc_info=True)
-                    pass
-                queue.task_done()
-
-        delegation_queue: asyncio.Queue[str] = asyncio.Queue()
-        for server_name in list_of_servers_to_check:
-            delegation_queue.put_nowait(server_name)
-
-        reference_key = self.reaction_task_controller.setup_task_set(command_event.event_id)
         await self.client.set_typing(command_event.room_id, 1000 * 60 * 2)
-        self.reaction_task_controller.add_tasks(
-            reference_key,
-            _discover_worker,
-            delegation_queue,
-            limit=100,
-        )
-
         started_at = time.monotonic()
-        await delegation_queue.join()
-        await self.reaction_task_controller.cancel(reference_key)
+        # map of server name -> version response with diagnostics
+        server_to_server_data = await self._get_versions_from_servers(list_of_servers_to_check)
         total_time = time.monotonic() - started_at
         await self.client.set_typing(command_event.room_id, 0)
         # Want the full room version to look like this for now
@@ -4559,10 +4126,10 @@ class FederationBot(RoomWalkCommand):
 
         # Begin constructing the message
         #
-        # Use a sorted list of server names, so it displays in alphabetical order.
-        server_results_sorted = sorted(server_to_server_data.keys())
+        # Sort the results by server name, so it displays in alphabetical order.
+        server_results_sorted = sorted(server_to_server_data.items(), key=itemgetter(0))
 
-        servers_missing = list_of_servers_to_check - set(server_results_sorted)
+        servers_missing = list_of_servers_to_check - server_to_server_data.keys()
         # Build the header line
 
         header_message = (
@@ -4581,13 +4148,11 @@ class FederationBot(RoomWalkCommand):
         header_line_size = len(header_message)
 
         # Create the delimiter line under the header
-        header_message += f"{pad('', header_line_size, pad_with='-')}\n"
+        header_message += f"{'-' * header_line_size}\n"
 
         list_of_result_data = []
         # Use the sorted list from earlier, alphabetical looks nicer
-        for server_name in server_results_sorted:
-            response = server_to_server_data[server_name]
-
+        for server_name, response in server_results_sorted:
             # Want the full room version it to look like this for now
             #
             #   Server Name | WK   | SRV  | DNS  | Test  | SNI | SRT | CRT | TLS served by  |
@@ -4596,23 +4161,26 @@ class FederationBot(RoomWalkCommand):
             # somewhere.net | None | None | None | Error |     |     |     | resty          | Long error....
             #   maunium.net | OK   | OK   | OK   | OK    | SNI |     |     | Caddy          |
 
-            buffered_message = f"{server_name_col.front_pad(server_name)} | "
             assert isinstance(response.diagnostics, Diagnostics)
-            buffered_message += f"{well_known_status_col.pad(response.diagnostics.status.well_known)} | "
-            buffered_message += f"{srv_status_col.pad(response.diagnostics.status.srv)} | "
-            buffered_message += f"{dns_status_col.pad(response.diagnostics.status.dns)} | "
-            buffered_message += f"{connective_test_status_col.pad(response.diagnostics.status.connection)} | "
+            status = response.diagnostics.status
+            row_parts = [
+                f"{server_name_col.front_pad(server_name)} | "
+                f"{well_known_status_col.pad(status.well_known)} | "
+                f"{srv_status_col.pad(status.srv)} | "
+                f"{dns_status_col.pad(status.dns)} | "
+                f"{connective_test_status_col.pad(status.connection)} | ",
+            ]
             if isinstance(response, MatrixFederationResponse):
                 assert isinstance(response.server_result, ServerDiscoveryResult)
-                buffered_message += (
+                row_parts.append(
                     f"{sni_col.pad('X' if response.server_result.sni != response.server_result.hostname else '')} | "
+                    f"{srt_col.pad('%.3f' % response.server_result.time_for_complete_delegation)} | "
+                    f"{crt_col.pad('%.3f' % response.time_taken)} | "
+                    f"{tls_served_by_col.pad(response.headers.get('server'))} | ",
                 )
-                buffered_message += f"{srt_col.pad('%.3f' % response.server_result.time_for_complete_delegation)} | "
-                buffered_message += f"{crt_col.pad('%.3f' % response.time_taken)} | "
-                buffered_message += f"{tls_served_by_col.pad(response.headers.get('server'))} | "
             else:
                 assert isinstance(response, MatrixError)
-                buffered_message += f"{response.reason}"
+                row_parts.append(f"{response.reason}")
 
             # maybe_tls_server = response.headers.get("server")
             # buffered_message += f"{tls_served_by_col.pad(maybe_tls_server if maybe_tls_server else '')} | "
@@ -4620,15 +4188,13 @@ class FederationBot(RoomWalkCommand):
             # else:
             #     buffered_message += f"{response}"
 
-            buffered_message += "\n"
+            row_parts.append("\n")
             if number_of_servers == 1:
                 # Print the diagnostic summary, since there is only one server there
                 # is no need to be brief.
-                buffered_message += f"{pad('', header_line_size, pad_with='-')}\n"
-                for line in response.diagnostics.output_list:
-                    buffered_message += f"{pad('', 3)}{line}\n"
-
-                buffered_message += f"{pad('', header_line_size, pad_with='-')}\n"
+                row_parts.append(f"{'-' * header_line_size}\n")
+                row_parts.extend(f"   {line}\n" for line in response.diagnostics.output_list)
+                row_parts.append(f"{'-' * header_line_size}\n")
 
             # else:
             #     assert isinstance(response, WellKnownLookupFailure)
@@ -4636,10 +4202,10 @@ class FederationBot(RoomWalkCommand):
             #     buffered_message += f"{status_col.pad(response.status_code or '')} | "
             #     buffered_message += f"{response.reason}\n"
 
-            list_of_result_data.extend([buffered_message])
+            list_of_result_data.append("".join(row_parts))
 
         footer_message = f"\nTotal time for retrieval: {total_time:.3f} seconds\nservers missing: {servers_missing}\n"
-        list_of_result_data.extend([footer_message])
+        list_of_result_data.append(footer_message)
 
         # For a single server test, the response will fit into a single message block.
         # However, for a roomful it could be several pages long. Chunk those responses
@@ -4650,7 +4216,7 @@ class FederationBot(RoomWalkCommand):
             current_message = await command_event.respond(
                 make_into_text_event(wrap_in_code_block_markdown(chunk), ignore_body=True),
             )
-            list_of_message_ids.extend([current_message])
+            list_of_message_ids.append(current_message)
 
         for current_message in list_of_message_ids:
             await self.reaction_task_controller.add_cleanup_control(current_message, command_event.room_id)
@@ -4681,6 +4247,51 @@ class FederationBot(RoomWalkCommand):
             ValueError: If the event ID is not a string
             TypeError: If the room ID or alias is not valid
         """
+        # A supplied event doesn't depend on the room, so fetch it while the room is resolved
+        event_fetch = (
+            asyncio.ensure_future(
+                self.federation_handler.get_event_from_server(origin_server, destination_server, event_id),
+            )
+            if event_id
+            else None
+        )
+        try:
+            return await self._resolve_discovered_event(
+                origin_server,
+                destination_server,
+                command_event,
+                room_id_or_alias,
+                event_id,
+                event_fetch,
+            )
+        finally:
+            if event_fetch is not None:
+                event_fetch.cancel()
+
+    async def _resolve_discovered_event(
+        self,
+        origin_server: str,
+        destination_server: str,
+        command_event: MessageEvent,
+        room_id_or_alias: str | None,
+        event_id: str | None,
+        event_fetch: Awaitable[dict[str, EventBase]] | None,
+    ) -> tuple[str, str, int] | None:
+        """
+        Body of _discover_event_ids_and_room_ids(), with the supplied event's fetch already in flight.
+
+        Args:
+            origin_server: Server making the request
+            destination_server: Server to query
+            command_event: Event that triggered the command
+            room_id_or_alias: Room ID or alias to resolve
+            event_id: Optional event ID to resolve
+            event_fetch: The pending fetch of event_id, or None to fetch it once it is known
+
+        Returns:
+            Tuple of (room_id, event_id, origin_server_ts) if successful,
+            None if resolution failed
+        """
         room_id, _ = await self.resolve_room_id_or_alias(room_id_or_alias, command_event, origin_server)
         if not room_id:
             # Don't need to actually display an error, that's handled in the above
@@ -4690,7 +4301,7 @@ class FederationBot(RoomWalkCommand):
         origin_server_ts = None
         if not event_id:
             # No event id was supplied, find out what the last event in the room was
-            now = int(time.time() * 1000)
+            now = time.time_ns() // 1_000_000
             ts_response = await self.federation_handler.api.get_timestamp_to_event(
                 origin_server,
                 destination_server,
@@ -4712,7 +4323,9 @@ class FederationBot(RoomWalkCommand):
         if event_id is None:
             msg = "event_id cannot be None at this point"
             raise ValueError(msg)
-        event_result = await self.federation_handler.get_event_from_server(origin_server, destination_server, event_id)
+        if event_fetch is None:
+            event_fetch = self.federation_handler.get_event_from_server(origin_server, destination_server, event_id)
+        event_result = await event_fetch
         event = event_result.get(event_id, None)
         if event:
             if isinstance(event, EventError):
@@ -1,6 +1,5 @@
-from typing import Any, Dict, Optional, Sequence, Tuple, Union
-from asyncio import sleep
-import json
+from typing import Any, Awaitable, Callable, Dict, Optional, Sequence, Tuple, Union
+from asyncio import Future, ensure_future, shield, sleep
 import logging
 import time
 
@@ -9,10 +8,11 @@ from signedjson.key import decode_signing_key_base64
 from signedjson.sign import sign_json
 from yarl import URL
 import backoff
+import orjson
 
-from federationbot.cache import LRUCache
+from federationbot.cache import LRUCache, TTLCache
 from federationbot.controllers import ReactionTaskController
-from federationbot.delegation import DelegationHandler
+from federationbot.delegation import DNS_RECORD_TTL_CEILING_MS, DelegationHandler
 from federationbot.errors import (
     FedBotException,
     PluginTimeout,
@@ -35,6 +35,15 @@ from federationbot.types import RoomAlias
 fedapi_logger = logging.getLogger("federation_api")
 
 SOCKET_TIMEOUT_SECONDS = 5.0
+# Server keys responses are reused for at most this long, or until the keys expire if that is sooner
+SERVER_KEYS_CACHE_MAX_TTL_MS = 5 * 60 * 1000
+# Failed server keys requests are only reused briefly, so a server coming back is noticed quickly
+SERVER_KEYS_ERROR_CACHE_TTL_MS = 5 * 1000
+# Room-wide commands ask about every server in a room, keep only this many server keys responses around
+SERVER_KEYS_CACHE_MAX_ENTRIES = 1024
+# Callers work out minimum_valid_until_ts from the current time, round it up to this so that requests made
+# close together ask for the same thing and can share one round trip
+NOTARY_MINIMUM_VALID_UNTIL_ROUNDING_MS = 60 * 1000
 USER_AGENT_STRING = "AllYourServerBelongsToUs 0.1.1"
 # Some fools have their anti-indexer system on their reverse proxy that filters out things from inside
 # the /_matrix urlspace. 'bot' and 'Python' trigger it, so use a different name
@@ -49,25 +58,63 @@ class FederationApi:
     ):
         self.server_signing_keys = server_signing_keys
         self.task_controller = task_controller
-        self.json_decoder = json.JSONDecoder()
         # Map this cache to server_name -> ServerResult
         self.server_discovery_cache: LRUCache[str, ServerResult] = LRUCache(expire_after_seconds=60 * 30)
-
-        connector = TCPConnector(ttl_dns_cache=60 * 60 * 5, limit=10000, limit_per_host=1, force_close=True)
+        # Map this cache to server_name -> the response to its server keys request
+        self.server_keys_cache: TTLCache[str, MatrixResponse] = TTLCache(
+            ttl_default_ms=SERVER_KEYS_CACHE_MAX_TTL_MS, max_entries=SERVER_KEYS_CACHE_MAX_ENTRIES
+        )
+        # Map of (endpoint, *request args) -> the request already on its way, for commands that overlap to share
+        self.requests_in_flight: Dict[Tuple[Any, ...], Future[MatrixResponse]] = {}
+
+        # A single session shared with the federation transport, so both draw from the one DNS cache and
+        # connection limit. Connections are still closed after each request: both paths address servers by IP
+        # and pick the SNI per request, and aiohttp's pool key leaves out server_hostname, so a kept-alive
+        # connection could answer a different server's request without its certificate ever being checked.
+        connector = TCPConnector(
+            # Hold resolved hostnames no longer than delegation holds its own DNS answers, so both agree
+            ttl_dns_cache=DNS_RECORD_TTL_CEILING_MS // 1000,
+            limit=10000,
+            limit_per_host=3,
+            force_close=True,
+        )
         # TODO: Make a custom Resolver to handle server discovery
         self.http_client = ClientSession(
             connector=connector,
             trace_configs=[make_fresh_trace_config()],
         )
         self.delegation_handler = DelegationHandler(self._federation_request)
-        self.federation_transport = FederationRequests(self.server_signing_keys)
+        self.federation_transport = FederationRequests(self.server_signing_keys, self.http_client)
         # self.server_discovery_resolver = ServerDiscoveryResolver(self.http_client)
 
     async def shutdown(self) -> None:
+        # The federation transport borrows this session, so there is only the one to close
         await self.http_client.close()
-        await self.federation_transport.http_client.close()
         await self.server_discovery_cache.stop()
 
+    async def _single_flight(
+        self,
+        key: Tuple[Any, ...],
+        fetch: Callable[[], Awaitable[MatrixResponse]],
+    ) -> MatrixResponse:
+        """
+        Make a request, unless an identical one is already in progress, in which case wait on that instead.
+
+        Args:
+            key: The endpoint name followed by whatever arguments change the response
+            fetch: Makes the actual request
+
+        Returns: The response, shared with any other callers that asked for the same thing meanwhile
+        """
+        in_flight = self.requests_in_flight.get(key)
+        if in_flight is None:
+            in_flight = ensure_future(fetch())
+            self.requests_in_flight[key] = in_flight
+            in_flight.add_done_callback(lambda _: self.requests_in_flight.pop(key, None))
+
+        # Shield the shared request, so one caller being cancelled doesn't fail the others waiting on it
+        return await shield(in_flight)
+
     @backoff.on_predicate(
         backoff.runtime,
         predicate=lambda r: r.status == 429,
@@ -313,6 +360,18 @@ class FederationApi:
                 **kwargs,
             )
 
+        if server_result.unhealthy and server_result.retry_time_s >= now:
+            # Still blocked from the last failure. Answer from that directly, rather than raising and catching a
+            # ServerUnreachable, which would also push the retry time back again on every request to it
+            diag_info.error("Server was previously unreachable")
+            return MatrixError(
+                http_code=0,
+                errcode=str(0),
+                reason=f"{server_result.unhealthy}: Server was previously unreachable",
+                diag_info=diag_info if diagnostics else None,
+                json_response={},
+            )
+
         try:
             response = await self._federation_request(
                 destination_server_name,
@@ -366,8 +425,8 @@ class FederationApi:
 
             if 200 <= code < 599:
                 try:
-                    result_dict = self.json_decoder.decode(await response.text())
-                except json.decoder.JSONDecodeError:
+                    result_dict = orjson.loads(await response.read())
+                except orjson.JSONDecodeError:
                     diag_info.error("JSONDecodeError")
                     diag_info.add("No usable data in response")
                     result_dict = None
@@ -456,8 +515,11 @@ class FederationApi:
         force_rediscover: bool = False,
         diagnostics: bool = False,
     ) -> MatrixResponse:
-        response = await self.federation_transport.request(
-            server_name, "/_matrix/federation/v1/version", run_diagnostics=diagnostics
+        response = await self._single_flight(
+            ("version", server_name, diagnostics),
+            lambda: self.federation_transport.request(
+                server_name, "/_matrix/federation/v1/version", run_diagnostics=diagnostics
+            ),
         )
 
         if diagnostics:
@@ -475,6 +537,15 @@ class FederationApi:
         #     "/_matrix/key/v2/server",
         #     **kwargs,
         # )
+        # The same servers are asked for their keys by the server_keys commands and while
+        # verifying event signatures, share the answers between them
+        cached_response = self.server_keys_cache.get(server_name)
+        if cached_response is not None:
+            return cached_response
+
+        return await self._single_flight(("server_keys", server_name), lambda: self._request_server_keys(server_name))
+
+    async def _request_server_keys(self, server_name: str) -> MatrixResponse:
         fedapi_logger.debug("Making server keys request to %s", server_name)
         response = await self.federation_transport.request(server_name, "/_matrix/key/v2/server")
         if response.http_code != 200:
@@ -485,6 +556,16 @@ class FederationApi:
                 response.errcode,
                 response.error or response.reason or response.json_response,
             )
+            cache_ttl_ms = SERVER_KEYS_ERROR_CACHE_TTL_MS
+        else:
+            valid_until_ts = response.json_response.get("valid_until_ts")
+            cache_ttl_ms = SERVER_KEYS_CACHE_MAX_TTL_MS
+            if isinstance(valid_until_ts, int):
+                cache_ttl_ms = min(cache_ttl_ms, valid_until_ts - time.time_ns() // 1_000_000)
+
+        # Keys that have already expired are not worth keeping
+        if cache_ttl_ms > 0:
+            self.server_keys_cache.set(server_name, response, cache_ttl_ms)
 
         return response
 
@@ -494,10 +575,15 @@ class FederationApi:
         from_server_name: str,
         minimum_valid_until_ts: int,
     ) -> MatrixResponse:
-        response = await self.federation_transport.request(
-            from_server_name,
-            f"/_matrix/key/v2/query/{fetch_server_name}",
-            query_args=[("minimum_valid_until_ts", minimum_valid_until_ts)],
+        # Rounding up only ever asks for keys that stay valid a little longer than the caller needs
+        minimum_valid_until_ts += -minimum_valid_until_ts % NOTARY_MINIMUM_VALID_UNTIL_ROUNDING_MS
+        response = await self._single_flight(
+            ("notary_keys", fetch_server_name, from_server_name, minimum_valid_until_ts),
+            lambda: self.federation_transport.request(
+                from_server_name,
+                f"/_matrix/key/v2/query/{fetch_server_name}",
+                query_args=[("minimum_valid_until_ts", minimum_valid_until_ts)],
+            ),
         )
 
         if response.http_code != 200:
@@ -714,7 +800,7 @@ class FederationApi:
         pdus_to_send: Sequence[Dict[str, Any]],
     ) -> MatrixResponse:
         formatted_data: Dict[str, Any] = {}
-        now = int(time.time() * 1000)
+        now = time.time_ns() // 1_000_000
         formatted_data["origin"] = origin_server
         formatted_data["origin_server_ts"] = now
         formatted_data["pdus"] = []
@@ -791,7 +877,7 @@ class FederationApi:
 
         query_list = []
         for i in range(0, 11):
-            query_list.extend([("ver", f"{i + 1}")])
+            query_list.append(("ver", f"{i + 1}"))
 
         response = await self.federation_transport.request(
             destination_server,
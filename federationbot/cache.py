@@ -184,20 +184,27 @@ class TTLCache(Generic[KT, VT]):
     setting new entries, you can change that value to be more or less. This way you
     can set a custom TTL for a given entry
 
+    Entries are only dropped when they are read after expiring, so a cache keyed on
+    something open-ended should also be given max_entries. Past that, the least
+    recently used entries are dropped to make room.
+
     Attributes:
         _cache:
         _ttl_default_ms:
+        _max_entries: the most entries kept at once, or None for no limit
         _time_cb: the time callback to get the current time, returns time in seconds as a float
         get:
         set:
 
     """
 
-    def __init__(self, ttl_default_ms: int = 1 * 60 * 60 * 1000) -> None:
+    def __init__(self, ttl_default_ms: int = 1 * 60 * 60 * 1000, max_entries: int | None = None) -> None:
         self._lock = Lock()
         self._time_cb: Callable[..., float] = time.time
+        # Kept in least to most recently used order when max_entries is set
         self._cache: dict[KT, TTLCacheEntry[VT]] = {}
         self._ttl_default_ms: int = ttl_default_ms
+        self._max_entries = max_entries
         self.get = self.__getitem__
         self.set = self.__setitem__
 
@@ -208,7 +215,14 @@ class TTLCache(Generic[KT, VT]):
         else:
             ttl = ttl + self._ttl_default_ms
         with self._lock:
+            if self._max_entries is None:
+                self._cache[key] = TTLCacheEntry(cache_value=value, ttl=ttl)
+                return
+            # Re-insert instead of assigning over it, so the entry moves to the most recently used end
+            self._cache.pop(key, None)
             self._cache[key] = TTLCacheEntry(cache_value=value, ttl=ttl)
+            while len(self._cache) > self._max_entries:
+                self._cache.pop(next(iter(self._cache)))
 
     @overload
     def __getitem__(self, key: KT, _return_raw: Literal[False] = False) -> VT | None: ...  # noqa: E704
@@ -219,8 +233,13 @@ class TTLCache(Generic[KT, VT]):
     def __getitem__(self, key: KT, _return_raw: bool = False) -> TTLCacheEntry[VT] | VT | None:
         with self._lock:
             if cache_entry := self._cache.get(key, None):
-                if cache_entry.ttl < self._time_cb():
+                # The ttl is stored as a timestamp in milliseconds
+                if cache_entry.ttl < self._time_cb() * 1000:
                     self._cache.pop(key)
+                    return None
+                if self._max_entries is not None:
+                    # Mark it as the most recently used
+                    self._cache[key] = self._cache.pop(key)
                 if _return_raw:
                     return cache_entry
                 return cache_entry.cache_value
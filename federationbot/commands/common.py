@@ -8,19 +8,31 @@ shared functionality for command handling.
 
 from __future__ import annotations
 
+from collections import Counter
 from time import time
 import asyncio
 
 from maubot.plugin_base import Plugin
-from mautrix.types import EventType
+from mautrix.errors.request import MForbidden
+from mautrix.types import EventType, RoomID
 from mautrix.util.config import BaseProxyConfig, ConfigUpdateHelper
 
-from federationbot import get_domain_from_id
-from federationbot.constants import HTTP_STATUS_OK
+from federationbot.cache import TTLCache
+from federationbot.constants import (
+    DELEGATION_RESULT_CACHE_TTL_MS,
+    HTTP_STATUS_OK,
+    NOT_IN_ROOM_ERROR,
+    ROOM_SERVERS_CACHE_TTL_MS,
+    SERVER_WARMUP_INTERVAL_SECONDS,
+    SERVER_WARMUP_TOP_SERVERS,
+)
 from federationbot.controllers import ReactionTaskController
 from federationbot.errors import FedBotException, MalformedRoomAliasError
 from federationbot.federation import FederationHandler
 from federationbot.protocols import MessageEvent
+from federationbot.responses import MatrixResponse
+from federationbot.types import RoomAlias
+from federationbot.utils.matrix import classify_id, get_domain_from_id, is_room_alias, is_room_id
 
 
 class MaubotConfig(BaseProxyConfig):
@@ -45,6 +57,16 @@ class FederationBotCommandBase(Plugin):
     server_signing_keys: dict[str, str]
     federation_handler: FederationHandler
     command_conn_timeouts: dict[str, int]
+    # The server name of the bot itself, the mxid does not change while the plugin is running
+    hosting_server: str
+    # Recent delegation check results by server name, shared between room-wide delegation scans
+    delegation_cache: TTLCache[str, MatrixResponse]
+    # Recent server sets of rooms, and the lookups still in progress so concurrent commands can share them
+    room_servers_cache: TTLCache[RoomID, frozenset[str]]
+    room_servers_in_flight: dict[RoomID, asyncio.Future[frozenset[str]]]
+    # How often commands have asked about each server lately, and the background task keeping the top few warm
+    recently_seen_servers: Counter[str]
+    server_warmup_task: asyncio.Task[None]
     # experimental_resolver: ServerDiscoveryResolver
 
     @classmethod
@@ -60,10 +82,15 @@ class FederationBotCommandBase(Plugin):
     async def start(self) -> None:
         """Start the plugin and initialize controllers and handlers."""
         await super().start()
+        self.hosting_server = get_domain_from_id(self.client.mxid)
         self.server_signing_keys = {}
         # Set the default, in case the config file got lost somehow
         max_workers: int = 10
         self.command_conn_timeouts = {}
+        self.delegation_cache = TTLCache(ttl_default_ms=DELEGATION_RESULT_CACHE_TTL_MS)
+        self.room_servers_cache = TTLCache(ttl_default_ms=ROOM_SERVERS_CACHE_TTL_MS)
+        self.room_servers_in_flight = {}
+        self.recently_seen_servers = Counter()
 
         loop = asyncio.get_running_loop()
         loop.set_debug(True)
@@ -87,17 +114,135 @@ class FederationBotCommandBase(Plugin):
 
         # self.experimental_resolver = ServerDiscoveryResolver()
 
+        self.server_warmup_task = asyncio.create_task(self._server_warmup_loop())
+
     async def pre_stop(self) -> None:
         """Stop the plugin and clean up resources."""
-        self.client.remove_event_handler(EventType.REACTION, self.reaction_task_controller.react_control_handler)
-        await self.reaction_task_controller.shutdown()
-        # To stop any caching cleanup tasks
-        await self.federation_handler.stop()
+        # A start() that failed part way may not have got as far as creating these, only tear down what exists
+        server_warmup_task = getattr(self, "server_warmup_task", None)
+        if server_warmup_task is not None:
+            server_warmup_task.cancel()
+            await asyncio.gather(server_warmup_task, return_exceptions=True)
+        reaction_task_controller = getattr(self, "reaction_task_controller", None)
+        if reaction_task_controller is not None:
+            self.client.remove_event_handler(EventType.REACTION, reaction_task_controller.react_control_handler)
+            await reaction_task_controller.shutdown()
+        federation_handler = getattr(self, "federation_handler", None)
+        if federation_handler is not None:
+            # To stop any caching cleanup tasks
+            await federation_handler.stop()
         # await self.experimental_resolver.http_client.close()
 
         loop = asyncio.get_running_loop()
         loop.set_debug(False)
 
+    async def _server_warmup_loop(self) -> None:
+        """
+        Keep the servers that commands ask about most warm, in the background.
+
+        Every SERVER_WARMUP_INTERVAL_SECONDS, ask the busiest few servers for their version and
+        server keys. The keys request refills the server keys cache once an entry runs out, and
+        the version request refreshes their server discovery, so the next command touching them
+        does not have to wait on either.
+        """
+        api = self.federation_handler.api
+        while True:
+            await asyncio.sleep(SERVER_WARMUP_INTERVAL_SECONDS)
+            top_servers = [
+                server_name for server_name, _ in self.recently_seen_servers.most_common(SERVER_WARMUP_TOP_SERVERS)
+            ]
+            # Halve the counts each round, so servers that stop being asked about drop out over time
+            self.recently_seen_servers = Counter(
+                {server_name: count // 2 for server_name, count in self.recently_seen_servers.items() if count > 1}
+            )
+            # Only a handful of requests, well below what the live commands allow at once, so no semaphore
+            results = await asyncio.gather(
+                *(api.get_server_keys(server_name) for server_name in top_servers),
+                *(api.get_server_version_new(server_name) for server_name in top_servers),
+                return_exceptions=True,
+            )
+            # Error responses come back as a MatrixError, anything else means a request raised
+            for server_name, result in zip(top_servers * 2, results):
+                if not isinstance(result, MatrixResponse):
+                    self.log.debug("Server warmup for %s failed: %r", server_name, result)
+
+    async def get_servers_in_room(self, room_id: RoomID) -> frozenset[str]:
+        """
+        Get the servers of the members joined to a room, as the bot's homeserver sees them.
+
+        Results are reused for a short time, so room-wide commands run one after another don't
+        each fetch the whole member list. Concurrent lookups of the same room share one request.
+
+        Args:
+            room_id: The room to get the servers of
+
+        Returns:
+            The set of server names
+
+        Raises:
+            MForbidden: If the bot is not in the room
+        """
+        cached_servers = self.room_servers_cache.get(room_id)
+        if cached_servers is not None:
+            return cached_servers
+
+        in_flight = self.room_servers_in_flight.get(room_id)
+        if in_flight is None:
+
+            async def _fetch_servers() -> frozenset[str]:
+                joined_members = await self.client.get_joined_members(room_id)
+                servers = frozenset(map(get_domain_from_id, joined_members))
+                self.room_servers_cache.set(room_id, servers)
+                return servers
+
+            in_flight = asyncio.ensure_future(_fetch_servers())
+            self.room_servers_in_flight[room_id] = in_flight
+            in_flight.add_done_callback(lambda _: self.room_servers_in_flight.pop(room_id, None))
+
+        # Shield the shared lookup, so one command being cancelled doesn't fail the others waiting on it
+        return await asyncio.shield(in_flight)
+
+    async def get_servers_to_check(self, server_to_check: str, command_event: MessageEvent) -> set[str] | None:
+        """
+        Work out which servers a command should check from the argument it was given.
+
+        The argument can be a server name, or a user's mxid to check their server. As an
+        undocumented option, it can also be a room id or alias to check every server in that
+        room. That can be rather long(and time consuming), so the callers place limits.
+
+        Args:
+            server_to_check: The argument the command was given
+            command_event: The event that triggered the command, for error responses
+
+        Returns:
+            The set of server names, or None if the room could not be used. The user has already been told why
+        """
+        # Classify the argument with a single lookup, rather than testing it for each kind in turn. Every
+        # Matrix identifier has a domain part, a server name with a port but no sigil stays a server name
+        id_kind = classify_id(server_to_check) if ":" in server_to_check else None
+
+        # It may be that they are using their mxid as the server to check, parse that
+        if id_kind == "mxid":
+            server_to_check = get_domain_from_id(server_to_check)
+
+        if id_kind not in ("room", "alias"):
+            self.recently_seen_servers[server_to_check] += 1
+            return {server_to_check}
+
+        room_to_check, _ = await self.resolve_room_id_or_alias(server_to_check, command_event, self.hosting_server)
+        if not room_to_check:
+            # Don't need to actually display an error, that's handled in the above function
+            return None
+
+        try:
+            servers_in_room = set(await self.get_servers_in_room(RoomID(room_to_check)))
+        except MForbidden:
+            await command_event.respond(NOT_IN_ROOM_ERROR)
+            return None
+
+        self.recently_seen_servers.update(servers_in_room)
+        return servers_in_room
+
     async def get_room_depth(
         self,
         origin_server: str,
@@ -233,14 +378,11 @@ class FederationBotCommandBase(Plugin):
         """
         # The only way to request from a different server than what the bot is on is to
         # have the other server's signing keys. So just use the bot's server.
-        if not origin_server:
-            _origin_server = get_domain_from_id(self.client.mxid)
-        else:
-            _origin_server = origin_server
+        _origin_server = origin_server or self.hosting_server
         if _origin_server not in self.server_signing_keys:
             await command_event.respond(
                 "This bot does not seem to have the necessary clearance to make "
-                f"requests on the behalf of it's server({origin_server}). Please add "
+                f"requests on the behalf of it's server({_origin_server}). Please add "
                 "server signing keys to it's config first.",
             )
             return None
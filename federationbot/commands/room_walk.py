@@ -17,11 +17,15 @@ from mautrix.types import EventID, PaginatedMessages, PaginationDirection, RoomI
 from mautrix.util.logging import TraceLogger
 
 from federationbot.commands.common import FederationBotCommandBase
-from federationbot.constants import BACKOFF_MULTIPLIER, SECONDS_BETWEEN_EDITS
+from federationbot.constants import (
+    BACKOFF_MULTIPLIER,
+    HTTP_STATUS_OK,
+    ROOM_WALK_DISCOVERY_SEGMENTS,
+    SECONDS_BETWEEN_EDITS,
+)
 from federationbot.errors import FedBotException
 from federationbot.protocols import MessageEvent
-from federationbot.utils.formatting import wrap_in_code_block_markdown
-from federationbot.utils.matrix import get_domain_from_id, make_into_text_event
+from federationbot.utils.matrix import get_domain_from_id, make_into_code_block_event
 
 logger = TraceLogger("federationbot.commands.room_walk")
 
@@ -51,20 +55,27 @@ class RoomWalkCommand(FederationBotCommandBase):
         queue: asyncio.Queue[tuple[float, SyncToken | None]],
         room_to_check: str,
         per_iteration_int: int,
-        response_list: list[tuple[float, PaginatedMessages]],
+        results_queue: asyncio.Queue[tuple[float, PaginatedMessages, bool]],
+        seen_event_ids: set[EventID] | None = None,
     ) -> None:
         """
         Fetch room events in a specified direction with backoff handling.
 
         Continuously fetches events from the room, handling rate limiting through
-        exponential backoff. Results are stored in the provided response list.
+        exponential backoff. Results are handed off through the provided results queue,
+        flagged with whether this fetcher's segment of the room is finished.
+
+        When several fetchers walk different segments of the same room, they share
+        seen_event_ids. A page made up only of events another fetcher already saw means
+        this segment has run into the next one, so the fetcher stops there.
 
         Args:
             for_direction: Direction to fetch events (forward/backward)
             queue: Queue managing fetch tokens and backoff timing
             room_to_check: Room ID to fetch events from
             per_iteration_int: Number of events to fetch per iteration
-            response_list: List to store fetched responses with timing information
+            results_queue: Queue to receive fetched responses with timing information
+            seen_event_ids: Optional set of event IDs shared between segment fetchers
         """
         retry_token = False
         back_off_time = 0.0
@@ -93,14 +104,141 @@ class RoomWalkCommand(FederationBotCommandBase):
             else:
                 retry_token = False
                 iter_time_spent = iter_finish_time - iter_start_time
-                response_list.extend([(iter_time_spent, worker_response)])
 
                 # type ignore: worker_response is a PagingatedMessages so is a NamedTuple and it doesn't register.
-                if worker_response.end:  # type: ignore[attr-defined]
-                    queue.put_nowait((iter_time_spent * BACKOFF_MULTIPLIER, worker_response.end))  # type: ignore[attr-defined]
-
+                end_token = worker_response.end  # type: ignore[attr-defined]
+                reached_next_segment = False
+                if seen_event_ids is not None:
+                    page_event_ids = {event.event_id for event in worker_response.events}  # type: ignore[attr-defined]
+                    reached_next_segment = bool(page_event_ids) and page_event_ids <= seen_event_ids
+                    seen_event_ids.update(page_event_ids)
+
+                segment_finished = reached_next_segment or not end_token
+                results_queue.put_nowait((iter_time_spent, worker_response, segment_finished))
                 queue.task_done()
 
+                if segment_finished:
+                    return
+
+                queue.put_nowait((iter_time_spent * BACKOFF_MULTIPLIER, end_token))
+
+    @staticmethod
+    async def _room_walk_collect_responses(
+        results_queue: asyncio.Queue[tuple[float, PaginatedMessages, bool]],
+        segments_remaining: int,
+    ) -> tuple[list[tuple[float, PaginatedMessages]], int]:
+        """
+        Collect the responses the fetchers produced during one progress update window.
+
+        Waits on the results queue for up to SECONDS_BETWEEN_EDITS, returning early if
+        the last segment of the room finishes so the final update is not delayed.
+
+        Args:
+            results_queue: Queue the fetchers hand completed responses to
+            segments_remaining: How many segment fetchers had not yet finished
+
+        Returns:
+            Tuple of the responses with timing information(possibly empty), and how many
+                segment fetchers are still running
+        """
+        collected: list[tuple[float, PaginatedMessages]] = []
+        deadline = asyncio.get_running_loop().time() + SECONDS_BETWEEN_EDITS
+
+        while (remaining := deadline - asyncio.get_running_loop().time()) > 0:
+            try:
+                time_spent, response, segment_finished = await asyncio.wait_for(
+                    results_queue.get(),
+                    timeout=remaining,
+                )
+            except asyncio.TimeoutError:
+                break
+
+            collected.append((time_spent, response))
+            if segment_finished:
+                segments_remaining -= 1
+                if not segments_remaining:
+                    break
+
+        return collected, segments_remaining
+
+    async def _room_walk_segment_tokens(
+        self,
+        origin_server: str,
+        room_to_check: str,
+        segments: int,
+    ) -> list[SyncToken | None]:
+        """
+        Find pagination tokens that split a room's history into roughly even segments.
+
+        The room's lifetime, from its first event until now, is cut into equal spans of
+        time. Each boundary is resolved to the event nearest that time, and the context
+        around that event provides a token to walk forward from. The first segment always
+        starts at the beginning of the room. Boundaries that can not be resolved are dropped,
+        at worst leaving a single segment covering the whole room.
+
+        Args:
+            origin_server: Server to make the federation timestamp lookups with
+            room_to_check: Room ID to split up
+            segments: How many segments to aim for
+
+        Returns:
+            List of tokens to start forward walks from, the first always being None
+        """
+        tokens: list[SyncToken | None] = [None]
+        if segments < 2:
+            return tokens
+
+        try:
+            first_page = await self.client.get_messages(
+                room_id=RoomID(room_to_check),
+                direction=PaginationDirection.FORWARD,
+                limit=1,
+            )
+        except MatrixRequestError as e:
+            self.log.warning("Could not find the start of %s to segment it: %s", room_to_check, e)
+            return tokens
+
+        if not first_page.events:  # type: ignore[attr-defined]
+            return tokens
+
+        first_ts = first_page.events[0].timestamp  # type: ignore[attr-defined]
+        span = (time.time_ns() // 1_000_000 - first_ts) // segments
+
+        async def _token_at(ts: int) -> tuple[str, SyncToken] | None:
+            ts_response = await self.federation_handler.api.get_timestamp_to_event(
+                origin_server=origin_server,
+                destination_server=origin_server,
+                room_id=room_to_check,
+                utc_time_at_ms=ts,
+            )
+            event_id = ts_response.json_response.get("event_id") if ts_response.http_code == HTTP_STATUS_OK else None
+            if not isinstance(event_id, str):
+                return None
+            try:
+                context = await self.client.get_event_context(RoomID(room_to_check), EventID(event_id), limit=1)
+            except MatrixRequestError as e:
+                self.log.warning("Could not get context for %s: %s", event_id, e)
+                return None
+            return event_id, context.start
+
+        token_tasks = [asyncio.create_task(_token_at(first_ts + span * i)) for i in range(1, segments)]
+        try:
+            boundaries = await asyncio.gather(*token_tasks)
+        finally:
+            # If one lookup raised or this was cancelled, stop the rest and wait for them to actually finish
+            for task in token_tasks:
+                task.cancel()
+            await asyncio.gather(*token_tasks, return_exceptions=True)
+
+        # Quiet rooms can resolve several boundaries to the same event, only walk from it once
+        seen_boundary_event_ids: set[str] = set()
+        for boundary in boundaries:
+            if boundary is not None and boundary[0] not in seen_boundary_event_ids:
+                seen_boundary_event_ids.add(boundary[0])
+                tokens.append(boundary[1])
+
+        return tokens
+
     @staticmethod
     async def _room_walk_update_progress(
         command_event: MessageEvent,
@@ -143,9 +281,7 @@ class RoomWalkCommand(FederationBotCommandBase):
             lines.extend(extra_lines)
 
         await command_event.respond(
-            make_into_text_event(
-                wrap_in_code_block_markdown("\n".join(lines)),
-            ),
+            make_into_code_block_event("\n".join(lines)),
             edits=pinned_message,
         )
 
@@ -161,6 +297,7 @@ class RoomWalkCommand(FederationBotCommandBase):
         discovery_collection_of_event_ids: set[EventID] | None = None,
         room_depth: int | None = None,
         is_final_phase: bool = False,
+        segment_tokens: list[SyncToken | None] | None = None,
     ) -> set[EventID]:
         """
         Process room events in a loop for discovery or backwalk phases.
@@ -179,6 +316,8 @@ class RoomWalkCommand(FederationBotCommandBase):
             discovery_collection_of_event_ids: Optional set of discovered events
             room_depth: Optional room depth for progress calculation
             is_final_phase: Whether this is the final phase
+            segment_tokens: Optional tokens to walk separate segments of the room from
+                concurrently, defaults to a single walk from the end of the room
 
         Returns:
             Set of event IDs found during this processing phase
@@ -187,24 +326,35 @@ class RoomWalkCommand(FederationBotCommandBase):
         cumulative_iter_time = 0.0
         collection_of_event_ids: set[EventID] = set()
         count_of_new_event_ids = 0
-        response_list: list[tuple[float, PaginatedMessages]] = []
-        fetch_queue: asyncio.Queue[tuple[float, SyncToken | None]] = asyncio.Queue()
-
-        task = asyncio.create_task(
-            self._room_walk_inner_fetcher(
-                direction,
-                fetch_queue,
-                room_to_check,
-                per_iteration_int,
-                response_list,
-            ),
-        )
-        fetch_queue.put_nowait((0.0, None))
+        results_queue: asyncio.Queue[tuple[float, PaginatedMessages, bool]] = asyncio.Queue()
+        segment_tokens = segment_tokens or [None]
+        # Only segmented walks need to watch for running into each other
+        seen_event_ids: set[EventID] | None = set() if len(segment_tokens) > 1 else None
+
+        tasks = []
+        for segment_token in segment_tokens:
+            fetch_queue: asyncio.Queue[tuple[float, SyncToken | None]] = asyncio.Queue()
+            fetch_queue.put_nowait((0.0, segment_token))
+            tasks.append(
+                asyncio.create_task(
+                    self._room_walk_inner_fetcher(
+                        direction,
+                        fetch_queue,
+                        room_to_check,
+                        per_iteration_int,
+                        results_queue,
+                        seen_event_ids,
+                    ),
+                ),
+            )
+        segments_remaining = len(tasks)
 
         try:
             while True:
-                new_responses_to_work_on = response_list.copy()
-                response_list.clear()
+                new_responses_to_work_on, segments_remaining = await self._room_walk_collect_responses(
+                    results_queue,
+                    segments_remaining,
+                )
 
                 # Process responses
                 new_event_ids = {
@@ -215,7 +365,7 @@ class RoomWalkCommand(FederationBotCommandBase):
                 }
                 cumulative_iter_time += sum(time_spent for time_spent, _ in new_responses_to_work_on)
                 iterations += len(new_responses_to_work_on)
-                finish = any(not response.end for _, response in new_responses_to_work_on)  # type: ignore[attr-defined]
+                finish = not segments_remaining
 
                 if discovery_collection_of_event_ids is not None:
                     # Backwalk phase
@@ -255,11 +405,10 @@ class RoomWalkCommand(FederationBotCommandBase):
 
                 if finish:
                     break
-
-                await asyncio.sleep(SECONDS_BETWEEN_EDITS)
         finally:
-            task.cancel()
-            await asyncio.gather(task, return_exceptions=True)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
 
         return collection_of_event_ids
 
@@ -299,23 +448,16 @@ class RoomWalkCommand(FederationBotCommandBase):
         """
         await command_event.mark_read()
 
-        # Validate command context
-        origin_server = get_domain_from_id(self.client.mxid)
-
         # Check user is on same server as bot
-        if get_domain_from_id(command_event.sender) != get_domain_from_id(self.client.mxid):
+        if get_domain_from_id(command_event.sender) != self.hosting_server:
             await command_event.reply(
                 "I'm sorry, running this command from a user not on the same server as the bot will not help",
             )
             return
 
         # Verify bot has necessary signing keys
-        if origin_server not in self.server_signing_keys:
-            await command_event.respond(
-                "This bot does not seem to have the necessary clearance to make "
-                f"requests on the behalf of it's server({origin_server}). Please add "
-                "server signing keys to it's config first.",
-            )
+        origin_server = await self.get_origin_server_and_assert_key_exists(command_event)
+        if not origin_server:
             return
 
         # Resolve room ID and validate per_iteration
@@ -354,27 +496,34 @@ class RoomWalkCommand(FederationBotCommandBase):
         # New Events found during backwalk: 0(0 State)
         #   Time taken: 120 seconds
 
-        # Get room depth
-        try:
-            room_depth = await self.get_room_depth(origin_server, room_to_check, command_event)
-        except FedBotException as e:
-            await command_event.respond(str(e))
-            return
-
-        # Setup initial progress display
-        header_lines = ["Room Back-walking Procedure: Running"]
-        static_lines = [
-            "--------------------------",
-            f"Room Depth reported as: {room_depth}",
-        ]
-
-        pinned_message = await command_event.respond(
-            make_into_text_event(
-                wrap_in_code_block_markdown("\n".join(header_lines + static_lines)),
-            ),
+        # Segment lookups don't depend on the room depth, so start them while the depth is fetched
+        segment_tokens_task = asyncio.create_task(
+            self._room_walk_segment_tokens(origin_server, room_to_check, ROOM_WALK_DISCOVERY_SEGMENTS),
         )
+        try:
+            # Get room depth
+            try:
+                room_depth = await self.get_room_depth(origin_server, room_to_check, command_event)
+            except FedBotException as e:
+                await command_event.respond(str(e))
+                return
+
+            # Setup initial progress display
+            header_lines = ["Room Back-walking Procedure: Running"]
+            static_lines = [
+                "--------------------------",
+                f"Room Depth reported as: {room_depth}",
+            ]
+
+            pinned_message = await command_event.respond(
+                make_into_code_block_event("\n".join(header_lines + static_lines)),
+            )
 
-        # Run discovery phase
+            # Run discovery phase, split into segments that are walked at the same time
+            segment_tokens = await segment_tokens_task
+        finally:
+            # Don't leave the lookups running if anything above bailed out early, including a cancelled command
+            segment_tokens_task.cancel()
         discovery_collection_of_event_ids = await self._room_walk_handle_processing_loop(
             PaginationDirection.FORWARD,
             room_to_check,
@@ -383,6 +532,7 @@ class RoomWalkCommand(FederationBotCommandBase):
             pinned_message,
             header_lines,
             static_lines,
+            segment_tokens=segment_tokens,
         )
 
         # Run backwalk phase with final update
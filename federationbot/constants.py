@@ -10,7 +10,8 @@ from typing import Final
 # Standard HTTP success response code
 HTTP_STATUS_OK: Final[int] = 200
 
-# Maximum number of servers to attempt federation with in room-wide operations
+# Maximum number of servers to attempt federation with in room-wide operations. Also how many of them the
+# room-wide fan-outs ask at once, so a room of this size needs only one round of slow or timed out servers
 MAX_NUMBER_OF_SERVERS_TO_ATTEMPT: Final[int] = 400
 
 # Maximum number of concurrent federation requests to a single server
@@ -19,6 +20,24 @@ MAX_NUMBER_OF_CONCURRENT_TASKS: Final[int] = 10
 # Maximum number of servers to make concurrent federation requests to
 MAX_NUMBER_OF_SERVERS_FOR_CONCURRENT_REQUEST: Final[int] = 100
 
+# Number of segments the room walk discovery phase splits the room into, each walked concurrently
+ROOM_WALK_DISCOVERY_SEGMENTS: Final[int] = 4
+
+# How long the set of servers in a room is reused by room-wide commands, in milliseconds
+ROOM_SERVERS_CACHE_TTL_MS: Final[int] = 30 * 1000
+
+# How long a delegation check result is reused by room-wide delegation scans, in milliseconds
+DELEGATION_RESULT_CACHE_TTL_MS: Final[int] = 2 * 60 * 1000
+
+# How long a failed delegation check is reused, kept short so transient errors are retried soon
+DELEGATION_ERROR_CACHE_TTL_MS: Final[int] = 15 * 1000
+
+# How often the servers commands ask about most are refreshed in the background, in seconds
+SERVER_WARMUP_INTERVAL_SECONDS: Final[float] = 60.0
+
+# Number of the most asked about servers to keep warm
+SERVER_WARMUP_TOP_SERVERS: Final[int] = 20
+
 # Number of seconds to wait between progress message updates
 SECONDS_BETWEEN_EDITS: Final[float] = 5.0
 
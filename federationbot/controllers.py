@@ -67,11 +67,13 @@ class ReactionControlEntry:
 
     Attributes:
         current_status:
+        status_changed: Set whenever current_status is changed, so a waiting command can react to it right away
         related_command_event: The MessageEvent containing data about the original event used to start the command
         client: The MaubotMatrixClient, used to add/cleanup control reactions to the response messages
     """
 
     current_status: ReactionCommandStatus | EmojiReactionCommandStatus
+    status_changed: asyncio.Event
     related_command_event: MessageEvent
     client: MaubotMatrixClient
     reaction_collection_of_event_ids: Set[EventID]
@@ -87,6 +89,7 @@ class ReactionControlEntry:
         self.client = client
         self.related_command_event = command_event
         self.current_status = default_starting_status
+        self.status_changed = asyncio.Event()
         self.emoji = emoji
         self.reaction_collection_of_event_ids = set()
 
@@ -137,12 +140,29 @@ class ReactionControlEntry:
 
     def start(self) -> None:
         self.current_status = EmojiReactionCommandStatus.START if self.emoji else ReactionCommandStatus.START
+        self.status_changed.set()
 
     def stop(self) -> None:
         self.current_status = EmojiReactionCommandStatus.STOP if self.emoji else ReactionCommandStatus.STOP
+        self.status_changed.set()
 
     def pause(self) -> None:
         self.current_status = EmojiReactionCommandStatus.PAUSE if self.emoji else ReactionCommandStatus.PAUSE
+        self.status_changed.set()
+
+    async def wait_for_status_change(self, timeout: float) -> None:
+        """
+        Wait until the status is changed, or the timeout passes. Use in place of a sleep() between updates, so a
+        Stop or Start reaction is acted on immediately instead of after the rest of the sleep.
+
+        Args:
+            timeout: The most seconds to wait
+        """
+        try:
+            await asyncio.wait_for(self.status_changed.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+        self.status_changed.clear()
 
     async def add_cleanup_control(self, pinned_message: EventID, emoji: bool = False) -> None:
         """
@@ -347,6 +367,13 @@ class ReactionTaskController(Generic[T]):
             raise MessageNotWatched
         self.tracked_reactions[pinned_message].stop()
 
+    async def wait_for_status_change(self, pinned_message: EventID, timeout: float) -> None:
+        if pinned_message not in self.tracked_reactions:
+            # Nothing can change the status of an unwatched message, so this is as good as a sleep
+            await asyncio.sleep(timeout)
+            return
+        await self.tracked_reactions[pinned_message].wait_for_status_change(timeout)
+
     def is_started(self, pinned_message: EventID) -> bool:
         if pinned_message in self.tracked_reactions and (
             self.tracked_reactions[pinned_message].get_status() == ReactionCommandStatus.START
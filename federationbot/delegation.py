@@ -1,7 +1,6 @@
 from typing import Any, Callable, Coroutine, Dict, List, Optional, Tuple
 from itertools import chain
 import asyncio
-import json
 import logging
 import time
 
@@ -11,9 +10,10 @@ from dns.message import Message
 from dns.nameserver import Do53Nameserver
 import backoff
 import dns.resolver
+import orjson
 
 from federationbot.cache import TTLCache
-from federationbot.errors import FedBotException, WellKnownSchemeError
+from federationbot.errors import FedBotException, PluginTimeout, WellKnownSchemeError
 from federationbot.requests.backoff import (
     backoff_dns_backoff_logging_handler,
     backoff_dns_giveup_logging_handler,
@@ -76,8 +76,24 @@ def _parse_and_check_well_known_response(
     return host, port
 
 
-DNS_SRV_GOOD_RESULT_CACHE_TTL_MS = 1000 * 60 * 60
 DNS_SRV_BAD_RESULT_CACHE_TTL_MS = 1000 * 60
+# Good answers are cached for as long as their records say, within these bounds
+DNS_RECORD_TTL_FLOOR_MS = 1000 * 60
+DNS_RECORD_TTL_CEILING_MS = 1000 * 60 * 15
+
+
+def _good_dns_response_cache_ttl_ms(response: Message) -> int:
+    """
+    Find how long a successful DNS response can be cached for, from the shortest TTL of its records.
+
+    Args:
+        response: The DNS response Message
+
+    Returns:
+        The TTL in milliseconds, clamped between DNS_RECORD_TTL_FLOOR_MS and DNS_RECORD_TTL_CEILING_MS
+    """
+    record_ttl_ms = min((rrset.ttl * 1000 for rrset in response.answer), default=DNS_RECORD_TTL_CEILING_MS)
+    return max(DNS_RECORD_TTL_FLOOR_MS, min(record_ttl_ms, DNS_RECORD_TTL_CEILING_MS))
 
 
 class DelegationHandler:
@@ -100,7 +116,6 @@ class DelegationHandler:
         # DNS lifetime of requests default is 5 seconds
         # The lifetime we can touch, make it longer to give some more time for slow DNS servers
         # self.dns_resolver.lifetime = 10.0
-        self.json_decoder = json.JSONDecoder()
         self.fed_request_callback = fed_request_callback
 
     def dns_query(
@@ -110,7 +125,8 @@ class DelegationHandler:
         diag_info: DiagnosticInfo = DiagnosticInfo(False),
     ):
         response = self.dns_query_cache.get((server_name, query_type))
-        if not response:
+        from_cache = response is not None
+        if response is None:
             query = dns.message.make_query(server_name, query_type)
 
             # This returns a tuple(Message, used_tcp_bool), just get the first part
@@ -140,11 +156,13 @@ class DelegationHandler:
         # server_discovery_logger.info(f"DNSSEC fallback response: {response.answer}")
         #
         # a_records: dns.resolver.Answer = await self.dns_resolver.resolve(server_name, "A")
-        self.dns_query_cache.set(
-            (server_name, query_type),
-            response,
-            DNS_SRV_BAD_RESULT_CACHE_TTL_MS if bad else DNS_SRV_GOOD_RESULT_CACHE_TTL_MS,
-        )
+        # Only cache a fresh answer, re-setting a cached one would keep pushing back its expiry
+        if not from_cache:
+            self.dns_query_cache.set(
+                (server_name, query_type),
+                response,
+                DNS_SRV_BAD_RESULT_CACHE_TTL_MS if bad else _good_dns_response_cache_ttl_ms(response),
+            )
         return response
 
     def check_dns_from_list_for_reg_records(
@@ -200,9 +218,9 @@ class DelegationHandler:
 
             else:
                 for ip4 in ip4_list:
-                    list_of_ip4_port_tuples.extend(((ip4, port),))
+                    list_of_ip4_port_tuples.append((ip4, port))
                 for ip6 in ip6_list:
-                    list_of_ip6_port_tuples.extend(((ip6, port),))
+                    list_of_ip6_port_tuples.append((ip6, port))
 
         return list_of_ip4_port_tuples, list_of_ip6_port_tuples
 
@@ -248,7 +266,7 @@ class DelegationHandler:
         )
 
         for rdata in a_responses:
-            a_ip_addresses.extend((str(rdata.address),))
+            a_ip_addresses.append(str(rdata.address))
             diag_info.mark_dns_record_found()
             diag_info.add(f"DNS 'A' record found: {server_name} -> {rdata.address}")
 
@@ -256,7 +274,7 @@ class DelegationHandler:
             diag_info.add(f"No 'A' DNS record found for '{server_name}'")
 
         for rdata in a4_responses:
-            a4_ip_addresses.extend((str(rdata.address),))
+            a4_ip_addresses.append(str(rdata.address))
             diag_info.mark_dns_record_found()
             diag_info.add(f"DNS 'AAAA' record found: {server_name} -> {rdata.address}")
 
@@ -390,7 +408,7 @@ class DelegationHandler:
                 port = rdata.port
                 diag_info.mark_srv_record_found()
                 diag_info.add(f"SRV record found: '_matrix-fed._tcp.{server_name}' -> " f"{host}:{port}")
-                host_port_tuples.extend(((host, port),))
+                host_port_tuples.append((host, port))
 
         try:
             dep_responses = self.dns_query(f"_matrix._tcp.{server_name}", "SRV")
@@ -413,7 +431,7 @@ class DelegationHandler:
                 port = rdata.port
                 diag_info.mark_srv_record_found()
                 diag_info.add(f"SRV record found: '_matrix._tcp.{server_name}' -> " f"{host}:{port}")
-                host_port_tuples.extend(((host, port),))
+                host_port_tuples.append((host, port))
 
         if not host_port_tuples:
             diag_info.add("No 'SRV' records found")
@@ -546,7 +564,7 @@ class DelegationHandler:
         except FedBotException as e:
             stop_time = time.monotonic()
             diag_info.error(f"{prerender_diag}, Errored: {e.summary_exception}")
-            if e.__class__.__name__ != "PluginTimeout":
+            if not isinstance(e, PluginTimeout):
                 diag_info.add(f"{e.long_exception}")
             return 0, stop_time - start_time, None
 
@@ -561,19 +579,18 @@ class DelegationHandler:
             if status == 200:
                 # Potentially anything from 200 up to 500 can have something to say
                 try:
-                    content = await response.json()
+                    content = await response.json(loads=orjson.loads)
                 except client_exceptions.ContentTypeError:
                     diag_info.error("Response had Content-Type: " f"{headers.get('Content-Type', 'None Found')}")
                     diag_info.add("Expected Content-Type of 'application/json', will try work-around")
-                except json.decoder.JSONDecodeError:
+                except orjson.JSONDecodeError:
                     server_discovery_logger.warning("JSONDecodeError from request on %s to %s", hostname, path)
                     diag_info.error("JSONDecodeError")
                     diag_info.add("Content-Type was correct, but contained unusable data")
                 if not content:
                     try:
-                        text_result = await response.text()
-                        content = self.json_decoder.decode(text_result)
-                    except json.decoder.JSONDecodeError:
+                        content = orjson.loads(await response.read())
+                    except orjson.JSONDecodeError:
                         # self.logger.info(f"text_result: {text_result}")
                         diag_info.error("JSONDecodeError, work-around failed")
 
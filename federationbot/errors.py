@@ -27,11 +27,16 @@ error handling and reporting in the bot's federation inspection commands.
 
 from __future__ import annotations
 
+from typing import final
+
 
 # General or legacy exceptions
 class FedBotException(Exception):
     """Base exception for federation-specific errors."""
 
+    # Fan-outs can raise thousands of these, slots keep them from each allocating an instance dict
+    __slots__ = ("long_exception", "summary_exception")
+
     summary_exception: str
     long_exception: str
 
@@ -43,23 +48,36 @@ class FedBotException(Exception):
             summary_exception: Brief error description
             long_exception: Optional detailed error message
         """
-        super().__init__(summary_exception, long_exception)
+        long_exception = long_exception or ""
+        # Leave an empty detail out of args, so str() of the exception is just the summary rather than a tuple
+        if long_exception:
+            super().__init__(summary_exception, long_exception)
+        else:
+            super().__init__(summary_exception)
         self.summary_exception = summary_exception
-        self.long_exception = long_exception or ""
+        self.long_exception = long_exception
 
 
+@final
 class PluginTimeout(FedBotException):
     """Specialized timeout for bot operations."""
 
+    __slots__ = ()
+
 
 class BotConnectionError(FedBotException):
     """Base error for connection failures."""
 
+    __slots__ = ()
+
 
 class ServerSSLException(BotConnectionError):
     """SSL/TLS connection error with Matrix server."""
 
+    __slots__ = ()
+
 
+@final
 class MalformedServerNameError(Exception):
     """Server name contains invalid scheme prefix, e.g. 'https://' or 'http://'."""
 
@@ -67,32 +85,35 @@ class MalformedServerNameError(Exception):
 class MalformedRoomAliasError(FedBotException):
     """Room alias missing required '#' prefix or ':' domain separator."""
 
+    __slots__ = ()
+
 
 class ServerUnreachable(FedBotException):
     """Server was offline last time we checked, and temporarily blocked from retries."""
 
+    __slots__ = ()
 
-# Errors while making requests
-class RedirectRetry(Exception):
-    """
-    Not really an error, but used to raise a signal to try the redirect again
-    """
 
-    location: str
+class _ReasonError(Exception):
+    """Base for the request and discovery errors, which only carry a reason."""
 
-    def __init__(self, location) -> None:
-        self.location = location
+    __slots__ = ("reason",)
 
+    reason: str
+
+    def __init__(self, reason: str) -> None:
+        # Raised with reason= as a keyword, which BaseException would otherwise leave out of args and str()
+        super().__init__(reason)
+        self.reason = reason
 
-class RequestError(Exception):
+
+# Errors while making requests
+class RequestError(_ReasonError):
     """
     General Error during a request
     """
 
-    reason: str
-
-    def __init__(self, reason: str) -> None:
-        self.reason = reason
+    __slots__ = ()
 
 
 class RequestServerError(RequestError):
@@ -100,77 +121,103 @@ class RequestServerError(RequestError):
     The server receiving the request had an error
     """
 
+    __slots__ = ()
+
 
 class RequestClientError(RequestError):
     """
     The client placing the request had an error
     """
 
+    __slots__ = ()
+
 
 class RequestTimeout(RequestError):
     """
     The request timed out
     """
 
+    __slots__ = ()
+
 
 # Errors during the discovery process
-class ServerDiscoveryError(Exception):
+class ServerDiscoveryError(_ReasonError):
     """Error during Matrix server discovery process."""
 
-    reason: str
-
-    def __init__(self, reason: str) -> None:
-        self.reason = reason
+    __slots__ = ()
 
 
 class ServerDiscoveryDNSError(ServerDiscoveryError):
     """Error during DNS query"""
 
+    __slots__ = ()
+
 
 class WellKnownError(ServerDiscoveryError):
     """Unknown error during .well-known federation discovery."""
 
+    __slots__ = ()
+
 
 class WellKnownServerError(WellKnownError):
     """Connection error from Matrix server to client."""
 
+    __slots__ = ()
 
+
+@final
 class WellKnownServerTimeout(WellKnownServerError):
     """Connection Timeout waiting for Matrix server response."""
 
+    __slots__ = ()
+
 
 class WellKnownClientError(WellKnownError):
     """Connection error from client to Matrix server."""
 
+    __slots__ = ()
+
 
 class WellKnownSchemeError(WellKnownError):
     """Invalid server name format (contains scheme)."""
 
+    __slots__ = ()
+
 
 class WellKnownParsingError(WellKnownError):
     """Error occurred while parsing the well-known response."""
 
+    __slots__ = ()
 
+
+@final
 class WellKnownClientTimeout(WellKnownClientError):
     """Connection Timeout submitting Matrix server request."""
 
+    __slots__ = ()
+
 
 # Internal Fedbot exceptions
+@final
 class MessageAlreadyHasReactions(Exception):
     """The Message given already has Reactions attached."""
 
 
+@final
 class MessageNotWatched(Exception):
     """The Message given is not being watched."""
 
 
+@final
 class ReferenceKeyAlreadyExists(Exception):
     """The Reference Key given already exists."""
 
 
+@final
 class ReferenceKeyNotFound(Exception):
     """The Reference Key was not found."""
 
 
+@final
 class EventKeyMissing(Exception):
     """The key needed from an Event was missing."""
@@ -1,11 +1,10 @@
 from typing import Any, Dict, List, Optional, Sequence, Tuple
-from datetime import datetime
 import hashlib
-import json
 
 from canonicaljson import encode_canonical_json
 from mautrix.types import EventID
 from unpaddedbase64 import decode_base64, encode_base64
+import orjson
 
 from federationbot.primitives import KeyID, ServerName
 from federationbot.types import Signature, Signatures, SignatureVerifyResult
@@ -14,6 +13,8 @@ from federationbot.utils import (
     extract_max_key_len_from_dict,
     extract_max_value_len_from_dict,
     full_dict_copy,
+    pretty_json,
+    pretty_print_timestamp,
 )
 
 EVENT_ID = "Event ID"
@@ -22,9 +23,6 @@ EVENT_SENDER = "Sender"
 EVENT_DEPTH = "Depth"
 
 
-json_decoder = json.JSONDecoder()
-
-
 class EventBase:
     """
     The lowest common denominator of an Event.
@@ -95,9 +93,9 @@ class EventBase:
         return generated_event_id == event_id_to_test
 
     def to_json(self, condensed: bool = False) -> str:
-        indent = None if condensed else 4
-        separators = (",", ":") if condensed else (", ", ": ")
-        return json.dumps(self.raw_data, indent=indent, separators=separators)
+        if condensed:
+            return orjson.dumps(self.raw_data).decode()
+        return pretty_json(self.raw_data)
 
     def to_template_line_summary(
         self,
@@ -111,13 +109,14 @@ class EventBase:
         attribute to look for on the EventBase, and the DisplayLineColumnConfig
         to handle the render for the line
         """
-        summary = ""
-        for template_item in template_list:
-            attributes, dc = template_item
-            for each_attr in attributes:
-                if getattr(self, each_attr, False):
-                    summary += f"{dc.pad(getattr(self, each_attr))} "
-        return summary
+        # Only look up each attribute once, the names are dynamic so getattr() stays. The
+        # walrus keeps that single lookup while skipping the attributes that are missing
+        return "".join(
+            f"{dc.pad(attr_value)} "
+            for attributes, dc in template_list
+            for each_attr in attributes
+            if (attr_value := getattr(self, each_attr, False))
+        )
 
     def to_line_summary(
         self,
@@ -227,7 +226,7 @@ class EventBase:
         summary = ""
         if self.content:
             summary += f"{dc.front_pad()}:\n"
-            summary += f"{json.dumps(self.content, indent=4)}\n"
+            summary += f"{pretty_json(self.content)}\n"
             summary += "\n"
         return summary
 
@@ -256,7 +255,7 @@ class EventBase:
 
         if self.unrecognized:
             summary = f"{dc.front_pad()}:\n"
-            summary += f"{json.dumps(self.unrecognized, indent=4)}\n"
+            summary += f"{pretty_json(self.unrecognized)}\n"
             summary += "\n"
 
         return summary
@@ -501,9 +500,7 @@ class Event(EventBase):
         summary += dc.render_pretty_line(depth_header, self.depth)
         summary += dc.render_pretty_line(origin_header, self.origin)
 
-        # datetime.fromtimestamp() will give a 'datetime' object, it will render as a
-        # date and a time string for this purpose.
-        summary += dc.render_pretty_line(origin_ts_header, datetime.fromtimestamp(self.origin_server_ts / 1000))
+        summary += dc.render_pretty_line(origin_ts_header, f"{pretty_print_timestamp(self.origin_server_ts)} UTC")
 
         # There is no helper class specifically designed around signatures and hashes.
         # Custom code it for now. Should look like:
@@ -624,7 +621,7 @@ class Mentions:
     def to_list(self) -> List[str]:
         summary_list = []
         if self.room:
-            summary_list.extend(["@room"])
+            summary_list.append("@room")
         if self.user_ids:
             summary_list.extend(self.user_ids)
         return summary_list
@@ -685,13 +682,13 @@ class MediaMetadata:
     def to_pretty_summary_as_list(self) -> List[str]:
         summary_list = []
         if self.mimetype:
-            summary_list.extend([f"Mimetype: {self.mimetype}"])
+            summary_list.append(f"Mimetype: {self.mimetype}")
         if self.size:
-            summary_list.extend([f"File Size: {self.size}"])
+            summary_list.append(f"File Size: {self.size}")
         if self.h and self.w:
-            summary_list.extend([f"h: {self.h}  w: {self.w}"])
+            summary_list.append(f"h: {self.h}  w: {self.w}")
         if self.duration:
-            summary_list.extend([f"Duration: {self.duration}"])
+            summary_list.append(f"Duration: {self.duration}")
         return summary_list
 
 
@@ -1038,8 +1035,8 @@ class PreviousRoom:
 
     def to_pretty_list(self) -> List[str]:
         summary_list = []
-        summary_list.extend([f" Room ID: {self.room_id}"])
-        summary_list.extend([f"Event ID: {self.event_id}"])
+        summary_list.append(f" Room ID: {self.room_id}")
+        summary_list.append(f"Event ID: {self.event_id}")
         return summary_list
 
 
@@ -1134,8 +1131,8 @@ class AllowConditions:
     def to_pretty_list(self) -> List[str]:
         summary_list = []
         for cond in self.list_of_conditions:
-            summary_list.extend([f"*   Type: {cond.condition_type}"])
-            summary_list.extend([f" Room ID: {cond.room_id}"])
+            summary_list.append(f"*   Type: {cond.condition_type}")
+            summary_list.append(f" Room ID: {cond.room_id}")
 
         return summary_list
 
@@ -1361,7 +1358,7 @@ class PowerLevelStateEvent(GenericStateEvent):
         # Prepare the whole list of entries, so we know how many lines will be needed
         complex_buffer_lines_list = []
         for _ in range(max_entries_to_display):
-            complex_buffer_lines_list.extend([""])
+            complex_buffer_lines_list.append("")
 
         # Calculate the width of each detail column, may only use two of the three
         if self.users:
@@ -1430,9 +1427,8 @@ class PowerLevelStateEvent(GenericStateEvent):
 
         # In case one of the above wasn't the end, make it so
         summary += "\n"
-        if complex_buffer_lines_list:
-            for line_item in complex_buffer_lines_list:
-                summary += f"{line_item}\n"
+        # Rooms can carry thousands of users here, so join the lines once rather than growing summary per line
+        summary += "".join(f"{line_item}\n" for line_item in complex_buffer_lines_list)
         return summary
 
 
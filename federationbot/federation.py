@@ -1,6 +1,6 @@
-from typing import Any, Collection, Dict, List, Optional, Sequence, Set, Tuple, Union, cast
+from typing import Any, AsyncIterator, Collection, Dict, List, Optional, Sequence, Set, Tuple, Union
+from operator import attrgetter
 import asyncio
-import json
 import logging
 import time
 
@@ -10,6 +10,7 @@ from signedjson.sign import SignatureVerifyException, verify_signed_json
 
 from federationbot.api import FederationApi
 from federationbot.cache import LRUCache
+from federationbot.constants import MAX_NUMBER_OF_SERVERS_FOR_CONCURRENT_REQUEST
 from federationbot.controllers import ReactionTaskController
 from federationbot.errors import FedBotException
 from federationbot.events import (
@@ -38,7 +39,6 @@ class FederationHandler:
         self.hosting_server = get_domain_from_id(bot_mxid)
         self.bot_mxid = bot_mxid
         self.server_signing_keys = server_signing_keys
-        self.json_decoder = json.JSONDecoder()
         self.task_controller = task_controller
         # Map the key to (server_name, event_id) -> Event
         self._events_cache: LRUCache[Tuple[str, str], EventBase] = LRUCache()
@@ -65,7 +65,7 @@ class FederationHandler:
     async def get_server_keys_from_notary(
         self, fetch_server_name: str, from_server_name: str, **kwargs
     ) -> ServerVerifyKeys:
-        minimum_valid_until_ts = int(time.time() * 1000) + (30 * 60 * 1000)  # Add 30 minutes
+        minimum_valid_until_ts = time.time_ns() // 1_000_000 + (30 * 60 * 1000)  # Add 30 minutes
 
         response = await self.api.get_server_notary_keys(
             fetch_server_name=fetch_server_name,
@@ -242,111 +242,132 @@ class FederationHandler:
         assert new_event_base is not None
         return {event_id: new_event_base}
 
-    async def get_events_from_server(
+    async def iter_events_from_server(
         self,
         origin_server: str,
         destination_server: str,
         events_list: Union[Sequence[str], Set[str]],
-    ) -> Dict[str, EventBase]:
+    ) -> AsyncIterator[Tuple[str, EventBase]]:
         """
-        Retrieve multiple Events from a given server. Uses Async Tasks and a Queue to
-        be efficient. Creates number of event_ids up to 10 Tasks for concurrency.
+        Retrieve multiple Events from a given server, yielding each Event as soon as it arrives. Callers can then
+        start working on the results while the rest are still being fetched.
 
         Args:
             origin_server: The server to auth the request with
             destination_server: The server to ask about the Event
             events_list: Either a Sequence or a Set of Event ID strings
 
-        Returns: A mapping of the Event ID to the Event(or EventError)
+        Returns: An async iterator of tuples of (Event ID, the Event(or EventError)), in order of completion
 
         """
-        # Keep both the response and the actual event, if there was an error it will be
-        # in the response and the event won't exist here
-        event_to_event_base: Dict[str, EventBase] = {}
-
-        async def _get_event_worker(queue: asyncio.Queue[str]) -> None:
-            while True:
-                worker_event_id: str = await queue.get()
+        fed_handler_logger.debug(
+            "get_events_from_server: requesting %d events from %s", len(events_list), destination_server
+        )
+        # Limit this to no more than three. Synapse in particular isn't capable of pulling more than 3 events
+        # from its database simultaneously. No sense is overloading it, and it's pretty quick usually.
+        request_semaphore = asyncio.Semaphore(3)
 
-                event_base_dict = await self.get_event_from_server(
+        async def _get_event_worker(worker_event_id: str) -> Dict[str, EventBase]:
+            async with request_semaphore:
+                return await self.get_event_from_server(
                     origin_server=origin_server,
                     destination_server=destination_server,
                     event_id=worker_event_id,
                 )
 
-                for r_event_id, event_base in event_base_dict.items():
-                    # Add this newly retrieved Event data to the outside dict that
-                    # is being returned.
-                    event_to_event_base[r_event_id] = event_base
-
-                queue.task_done()
-
-        fed_handler_logger.debug(
-            "get_events_from_server: requesting %d events from %s", len(events_list), destination_server
-        )
-        event_queue: asyncio.Queue[str] = asyncio.Queue()
+        reference_key = self.task_controller.setup_task_set()
         for event_id in events_list:
-            await event_queue.put(event_id)
+            self.task_controller.add_tasks(reference_key, _get_event_worker, event_id)
 
-        reference_key = self.task_controller.setup_task_set()
+        try:
+            for next_result in asyncio.as_completed(self.task_controller.tasks_sets[reference_key].tasks):
+                # Keep both the response and the actual event, if there was an error it will be
+                # in the response and the event won't exist here
+                for r_event_id, event_base in (await next_result).items():
+                    yield r_event_id, event_base
+        finally:
+            # Make sure to cancel all tasks, including if the caller stopped iterating early
+            await self.task_controller.cancel(reference_key)
 
-        # Limit this to no more than three. Synapse in particular isn't capable of pulling more than 3 events
-        # from its database simultaneously. No sense is overloading it, and it's pretty quick usually.
-        self.task_controller.add_tasks(reference_key, _get_event_worker, event_queue, limit=min(len(events_list), 3))
+    async def get_events_from_server(
+        self,
+        origin_server: str,
+        destination_server: str,
+        events_list: Union[Sequence[str], Set[str]],
+    ) -> Dict[str, EventBase]:
+        """
+        Retrieve multiple Events from a given server. Collects everything from iter_events_from_server(), so
+        no more than three Events are requested at a time.
+
+        Args:
+            origin_server: The server to auth the request with
+            destination_server: The server to ask about the Event
+            events_list: Either a Sequence or a Set of Event ID strings
 
-        await event_queue.join()
+        Returns: A mapping of the Event ID to the Event(or EventError)
 
-        # Cancel our worker tasks.
-        await self.task_controller.cancel(reference_key)
-        return event_to_event_base
+        """
+        return {
+            event_id: event_base
+            async for event_id, event_base in self.iter_events_from_server(
+                origin_server, destination_server, events_list
+            )
+        }
 
-    async def find_event_on_servers(
+    async def iter_find_event_on_servers(
         self, origin_server: str, event_id: str, servers_to_check: Collection[str]
-    ) -> Dict[str, EventBase]:
-        host_to_event_status_map: Dict[str, EventBase] = {}
+    ) -> AsyncIterator[Tuple[str, EventBase]]:
+        """
+        Ask each server for an Event, yielding each server's answer as soon as it arrives. One slow or unreachable
+        server then only holds up its own result, instead of everything that would be displayed.
 
-        host_queue: asyncio.Queue[str] = asyncio.Queue()
-        for host in servers_to_check:
-            host_queue.put_nowait(host)
+        Args:
+            origin_server: The server to auth the requests with
+            event_id: The Event ID to look for
+            servers_to_check: The servers to ask about the Event
 
-        async def _event_finding_worker(
-            queue: asyncio.Queue[str],
-        ) -> Tuple[str, EventBase]:
-            worker_host = await queue.get()
-            returned_events = await self.get_event_from_server(
-                origin_server=origin_server,
-                destination_server=worker_host,
-                event_id=event_id,
-            )
+        Returns: An async iterator of tuples of (server name, the Event(or EventError)), in order of completion
+
+        """
+        # Bound how many requests are in flight at once. Small rooms don't need the full
+        # allowance, and large rooms shouldn't have hundreds of handshakes pending together
+        request_semaphore = asyncio.Semaphore(
+            max(1, min(len(servers_to_check), MAX_NUMBER_OF_SERVERS_FOR_CONCURRENT_REQUEST))
+        )
+
+        async def _event_finding_worker(worker_host: str) -> Tuple[str, EventBase]:
+            async with request_semaphore:
+                returned_events = await self.get_event_from_server(
+                    origin_server=origin_server,
+                    destination_server=worker_host,
+                    event_id=event_id,
+                )
             inner_returned_event = returned_events.get(event_id)
             assert inner_returned_event is not None
-            queue.task_done()
             return worker_host, inner_returned_event
 
         # Create a collection of Task's, to run the coroutine in
         reference_task_key = self.task_controller.setup_task_set()
 
-        # These are one-off tasks, not workers. Create as many as we have servers to check
-        self.task_controller.add_tasks(
-            reference_task_key,
-            _event_finding_worker,
-            host_queue,
-            limit=len(servers_to_check),
-        )
-
-        results = await self.task_controller.get_task_results(reference_task_key)
-
-        for result in results:
-            if isinstance(result, BaseException):
-                raise result
-            response: EventBase
-            host, response = result
-            host_to_event_status_map[host] = response
+        # These are one-off tasks, not workers. Create one for each server to check, the semaphore
+        # above decides how many of them are actually making a request
+        for host in servers_to_check:
+            self.task_controller.add_tasks(reference_task_key, _event_finding_worker, host)
 
-        # Make sure to cancel all tasks
-        await self.task_controller.cancel(reference_task_key)
+        try:
+            for next_result in asyncio.as_completed(self.task_controller.tasks_sets[reference_task_key].tasks):
+                yield await next_result
+        finally:
+            # Make sure to cancel all tasks, including if the caller stopped iterating early
+            await self.task_controller.cancel(reference_task_key)
 
-        return host_to_event_status_map
+    async def find_event_on_servers(
+        self, origin_server: str, event_id: str, servers_to_check: Collection[str]
+    ) -> Dict[str, EventBase]:
+        return {
+            host: response
+            async for host, response in self.iter_find_event_on_servers(origin_server, event_id, servers_to_check)
+        }
 
     async def get_state_ids_from_server(
         self,
@@ -497,7 +518,7 @@ class FederationHandler:
         room_id: str,
         state_type_str: str,
     ) -> List[EventBase]:
-        now = int(time.time() * 1000)
+        now = time.time_ns() // 1_000_000
         event_id = None
         ts_response = await self.api.get_timestamp_to_event(
             origin_server,
@@ -641,28 +662,21 @@ class FederationHandler:
             event_id_in_timeline,
         )
         fed_handler_logger.debug("get_hosts_in_room_ordered: got %d events from state", len(state_events))
-        converted_state_events = []
-        for state_event in state_events:
-            # Won't be able to retrieve the room_version for this, and the event ids are not available or necessary
-            converted_state_events.append(
+        # One pass over the state: only member events are converted, and only joins are kept. Won't be able to
+        # retrieve the room_version for this, and the event ids are not available or necessary
+        joined_member_events = [
+            member_event
+            for member_event in (
                 determine_what_kind_of_event(None, room_version=None, data_to_use=state_event)
+                for state_event in state_events
+                if state_event.get("type") == "m.room.member"
             )
-
-        filtered_room_member_events = cast(
-            List[RoomMemberStateEvent],
-            filter_events_based_on_type(converted_state_events, "m.room.member"),
-        )
-        joined_member_events = cast(
-            List[RoomMemberStateEvent],
-            filter_state_events_based_on_membership(filtered_room_member_events, "join"),
-        )
+            if isinstance(member_event, RoomMemberStateEvent) and member_event.membership == "join"
+        ]
         fed_handler_logger.debug("get_hosts_in_room_ordered: got %d joined member events", len(joined_member_events))
-        joined_member_events.sort(key=lambda x: x.depth)
-        hosts_ordered = []
-        for member in joined_member_events:
-            host = get_domain_from_id(member.state_key)
-            if host not in hosts_ordered:
-                hosts_ordered.extend([host])
+        joined_member_events.sort(key=attrgetter("depth"))
+        # dict keeps the first, and so lowest depth, sighting of each host without a list scan per member
+        hosts_ordered = list(dict.fromkeys(get_domain_from_id(member.state_key) for member in joined_member_events))
 
         fed_handler_logger.debug("get_hosts_in_room_ordered: got %d hosts", len(hosts_ordered))
         return hosts_ordered
@@ -682,24 +696,6 @@ class FederationHandler:
         return list_of_event_bases
 
 
-def filter_events_based_on_type(events: List[EventBase], filter_by: str) -> List[EventBase]:
-    events_to_return = []
-    for event in events:
-        if event.event_type == filter_by:
-            events_to_return.append(event)
-    return events_to_return
-
-
-def filter_state_events_based_on_membership(
-    events: List[RoomMemberStateEvent], filter_by: str
-) -> List[RoomMemberStateEvent]:
-    events_to_return = []
-    for event in events:
-        if event.membership == filter_by:
-            events_to_return.append(event)
-    return events_to_return
-
-
 def parse_list_response_into_list_of_event_bases(
     list_from_response: List[Dict[str, Any]], room_version: Optional[int] = None
 ) -> List[EventBase]:
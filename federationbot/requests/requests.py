@@ -1,21 +1,19 @@
 from typing import Any, Sequence, Union
 import asyncio
 import ipaddress
-import json
 import logging
-import socket
 import time
 
-from aiohttp import ClientResponse, ClientSession, ClientTimeout, SocketTimeoutError, TCPConnector, client_exceptions
+from aiohttp import ClientResponse, ClientSession, ClientTimeout, SocketTimeoutError, client_exceptions
 from signedjson.key import decode_signing_key_base64
 from signedjson.sign import sign_json
 from yarl import URL
+import orjson
 
-from federationbot.errors import RedirectRetry, RequestClientError, RequestError, RequestServerError, RequestTimeout
+from federationbot.errors import RequestClientError, RequestError, RequestServerError, RequestTimeout
 from federationbot.resolver import IpAddressAndPort, ServerDiscoveryErrorResult, ServerDiscoveryResult, StatusEnum
 from federationbot.resolver.resolver import ServerDiscoveryResolver
 from federationbot.responses import MatrixError, MatrixFederationResponse, MatrixResponse
-from federationbot.tracing import make_fresh_trace_config
 
 logger = logging.getLogger(__name__)
 
@@ -74,39 +72,20 @@ CLIENT_TIMEOUT = ClientTimeout(
 )
 
 
-async def raise_for_status_on_redirect(response: ClientResponse) -> None:
-    if response.status in (301,):
-        raise RedirectRetry(response.headers.get("Location"))
-
-
 class FederationRequests:
     http_client: ClientSession
     server_discovery: ServerDiscoveryResolver
 
-    def __init__(self, server_signing_keys: dict[str, str]) -> None:
+    def __init__(self, server_signing_keys: dict[str, str], http_client: ClientSession) -> None:
         # resolver = ThreadedResolver()
         # resolver = CachingDNSResolver()
         # nameserver = Do53Nameserver("192.168.2.1")
         # self.dns_resolver = dns.asyncresolver.Resolver()
         # self.dns_resolver.nameservers = [nameserver]
         self.server_signing_keys = server_signing_keys
-        connector = TCPConnector(
-            use_dns_cache=True,
-            ttl_dns_cache=300,
-            family=socket.AddressFamily.AF_INET,  # type: ignore[no-member]
-            limit=10000,
-            limit_per_host=3,
-            # resolver=resolver,  # type: ignore[arg-type]
-            # happy_eyeballs_delay=None,
-            # interleave=3,
-            force_close=True,
-        )
-        self.http_client = ClientSession(
-            connector=connector,
-            trace_configs=[make_fresh_trace_config()],
-            raise_for_status=raise_for_status_on_redirect,
-        )
-        self.json_decoder = json.JSONDecoder()
+        # The session is owned by the caller, who is responsible for closing it. Requests are always made
+        # against an IP address, so the shared connector's DNS cache does not come into play here
+        self.http_client = http_client
         self.server_discovery = ServerDiscoveryResolver(self._request)
 
     async def request(
@@ -212,11 +191,10 @@ class FederationRequests:
             # There can be a range of status codes, but only 404 specifically is called out
             if 200 <= status_code < 600 and not status_code == 404:
                 try:
-                    text_content = await response.text()
-                    response_content = self.json_decoder.decode(text_content)
+                    response_content = orjson.loads(await response.read())
                     stop_time = time.time()
 
-                except json.decoder.JSONDecodeError as e:
+                except orjson.JSONDecodeError as e:
                     if run_diagnostics and diagnostics:
                         diagnostics.status.connection = StatusEnum.ERROR
                         diagnostics.output_list.append(f"    Code: {status_code}, Error: {e.msg}")
@@ -314,9 +292,8 @@ class FederationRequests:
         try:
             logger.debug("Trying request: %s%s", host_name, path)
 
-            # Because we have allow_redirects=False and with the ClientSession watching all responses for the
-            # 301, this may raise a RedirectRetry exception. We trap that on the outside of this method, so it
-            # can requery dns and log to diagnostics
+            # Because we have allow_redirects=False, a 301 comes back as the response itself. The caller checks
+            # for it, so it can requery dns and log to diagnostics
             response = await self.http_client.request(
                 method,
                 url_object,
@@ -326,9 +303,6 @@ class FederationRequests:
                 allow_redirects=False,
             )
 
-        except RedirectRetry as e:
-            raise e
-
         # Split the different exceptions up based on where the information is extracted from
         except client_exceptions.ClientConnectorCertificateError as e:
             # This is one of the errors I found while probing for SNI TLS
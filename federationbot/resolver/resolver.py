@@ -1,18 +1,17 @@
 from typing import Any
 from collections.abc import Callable, Coroutine
 from ipaddress import IPv4Address
-from json import JSONDecoder
 import asyncio
 import ipaddress
-import json
 import logging
 import time
 
 from aiohttp import ClientResponse, client_exceptions
 from yarl import URL
+import orjson
 
 from federationbot.cache import TTLCache
-from federationbot.errors import RedirectRetry, RequestError, WellKnownParsingError, WellKnownSchemeError
+from federationbot.errors import RequestError, WellKnownParsingError, WellKnownSchemeError
 from federationbot.resolver import (
     Diagnostics,
     IpAddressAndPort,
@@ -67,7 +66,6 @@ class ServerDiscoveryResolver:
     _had_well_known_cache: TTLCache[str, str]
     _well_known_cache: TTLCache[str, WellKnownLookupResult]
     server_discovery_cache: TTLCache[str, ServerDiscoveryResult]
-    json_decoder: JSONDecoder
     exp_dns_resolver: CachingDNSResolver
 
     def __init__(self, request_cb: Callable[..., Coroutine[Any, Any, ClientResponse]]) -> None:
@@ -93,7 +91,6 @@ class ServerDiscoveryResolver:
         #     connector=connector,
         #     trace_configs=[make_fresh_trace_config()],
         # )
-        self.json_decoder = json.JSONDecoder()
         self._had_well_known_cache = TTLCache()
         # well known should have a rather long time on it by default, failures will have
         # a shorter time to prevent consistent "re-lookups"
@@ -358,60 +355,58 @@ class ServerDiscoveryResolver:
             last_sni_host_name = server_name
             already_tried_redirects = set()
             while True:
-                try:
-                    list_of_coros: list[asyncio.Task] = []
-                    for ip_address in list_of_only_ipv4_addresses:
-
-                        coro = self._request(
-                            ip_address,
-                            last_server_name_tried,
-                            "/.well-known/matrix/server",
-                            host_header=last_host_header,
-                            sni_host_name=last_sni_host_name,
-                        )
-                        list_of_coros.append(asyncio.create_task(coro))
-
-                    try:
-                        done, pending = await asyncio.wait(list_of_coros, return_when=asyncio.FIRST_COMPLETED)
-                    except ValueError as e:
-                        logger.exception("%s, %s: %r", server_name, last_server_name_tried, e)
-                        raise RequestError("No addresses found?") from e
-
-                    for task in pending:
-                        task.cancel()
-                    response: ClientResponse = done.pop().result()
-
-                except RedirectRetry as e:
-                    # The request returned a 301 status code, we are allowed to follow those. Parse out the new server
-                    # name and request it's DNS then request again
-                    logger.info("Redirect detected for %s: pointing to %s", server_name, e.location)
-                    new_location_url = URL(e.location)
-                    # Found someone who somehow is redirecting to themselves. No idea how or why, but that's a Not Found
-                    new_host = new_location_url.host if new_location_url.host is not None else last_server_name_tried
-                    if new_host in already_tried_redirects:
-                        raise RequestError("Potential redirect loop, breaking")
-                    # The possibility exists that the host could be None here, but it's highly unlikely(unless the other
-                    # side messed up their reverse proxy that gave the 301). Mypy doesn't know it's unlikely, so explain
-                    assert new_host is not None
-                    diagnostics.log(f"  {last_server_name_tried} wants to redirect to {new_host}")
-                    last_sni_host_name = new_host
-                    last_host_header = new_host
-                    last_server_name_tried = new_host
-
-                    new_dns_responses = await self.exp_dns_resolver.resolve_reg_records(
-                        new_host, diagnostics=diagnostics
+                list_of_coros: list[asyncio.Task] = []
+                for ip_address in list_of_only_ipv4_addresses:
+
+                    coro = self._request(
+                        ip_address,
+                        last_server_name_tried,
+                        "/.well-known/matrix/server",
+                        host_header=last_host_header,
+                        sni_host_name=last_sni_host_name,
                     )
-                    already_tried_redirects.add(new_host)
+                    list_of_coros.append(asyncio.create_task(coro))
 
-                    if not new_dns_responses.get_hosts():
-                        return WellKnownLookupFailure(status_code=None, reason=new_dns_responses.get_errors()[0])
+                try:
+                    done, pending = await asyncio.wait(list_of_coros, return_when=asyncio.FIRST_COMPLETED)
+                except ValueError as e:
+                    logger.exception("%s, %s: %r", server_name, last_server_name_tried, e)
+                    raise RequestError("No addresses found?") from e
 
-                    list_of_only_ipv4_addresses = filter_to_only_ipv4_addresses(new_dns_responses.get_hosts())
+                for task in pending:
+                    task.cancel()
+                response: ClientResponse = done.pop().result()
 
-                else:
+                if response.status != 301:
                     logger.debug("request to %s%s completed", server_name, "/.well-known/matrix/server")
                     break
 
+                # The request returned a 301 status code, we are allowed to follow those. Parse out the new server
+                # name and request it's DNS then request again. The body of the redirect is not needed
+                location = response.headers.get("Location", "")
+                response.release()
+                logger.info("Redirect detected for %s: pointing to %s", server_name, location)
+                new_location_url = URL(location)
+                # Found someone who somehow is redirecting to themselves. No idea how or why, but that's a Not Found
+                new_host = new_location_url.host if new_location_url.host is not None else last_server_name_tried
+                if new_host in already_tried_redirects:
+                    raise RequestError("Potential redirect loop, breaking")
+                # The possibility exists that the host could be None here, but it's highly unlikely(unless the other
+                # side messed up their reverse proxy that gave the 301). Mypy doesn't know it's unlikely, so explain
+                assert new_host is not None
+                diagnostics.log(f"  {last_server_name_tried} wants to redirect to {new_host}")
+                last_sni_host_name = new_host
+                last_host_header = new_host
+                last_server_name_tried = new_host
+
+                new_dns_responses = await self.exp_dns_resolver.resolve_reg_records(new_host, diagnostics=diagnostics)
+                already_tried_redirects.add(new_host)
+
+                if not new_dns_responses.get_hosts():
+                    return WellKnownLookupFailure(status_code=None, reason=new_dns_responses.get_errors()[0])
+
+                list_of_only_ipv4_addresses = filter_to_only_ipv4_addresses(new_dns_responses.get_hosts())
+
         except RequestError as e:
             diagnostics.status.well_known = StatusEnum.ERROR
             diagnostics.log(f"    Error: {e.reason}")
@@ -428,12 +423,12 @@ class ServerDiscoveryResolver:
             # There can be a range of status codes, but only try and decode 200
             if status_code == 200:
                 try:
-                    content = await response.json()
+                    content = await response.json(loads=orjson.loads)
                 except client_exceptions.ContentTypeError:
                     diagnostics.log("    Response had Content-Type: " f"{headers.get('Content-Type', 'None Found')}")
                     diagnostics.log("    Expected Content-Type of 'application/json', will try work-around")
 
-                except json.decoder.JSONDecodeError:
+                except orjson.JSONDecodeError:
                     logger.warning("JSONDecodeError from request on %s to /.well-known/matrix/server", server_name)
                     diagnostics.log("    JSONDecodeError: Content-Type was correct, but contained unusable data")
                     diagnostics.status.well_known = StatusEnum.ERROR
@@ -449,9 +444,9 @@ class ServerDiscoveryResolver:
 
                 if not content:
                     try:
-                        text_result = await response.text()
-                        content = self.json_decoder.decode(text_result)
-                    except json.decoder.JSONDecodeError as e:
+                        text_result = await response.read()
+                        content = orjson.loads(text_result)
+                    except orjson.JSONDecodeError as e:
                         logger.info(f"text_result: {len(text_result)} bytes")
                         diagnostics.log(
                             f"    JSONDecodeError, work-around failed. Content length was: {len(text_result) if text_result else 0}"
@@ -463,16 +458,12 @@ class ServerDiscoveryResolver:
 
         try:
             host, port = parse_and_check_well_known_response(content)
-        except WellKnownSchemeError as e:
-            diagnostics.status.well_known = StatusEnum.ERROR
-            diagnostics.log(f"    Code: {status_code}, Error: {e.reason}")
-
-            return WellKnownSchemeFailure(status_code=status_code, reason=e.reason)
-        except WellKnownParsingError as e:
+        except (WellKnownSchemeError, WellKnownParsingError) as e:
             diagnostics.status.well_known = StatusEnum.ERROR
             diagnostics.log(f"    Code: {status_code}, Error: {e.reason}")
 
-            return WellKnownParseFailure(status_code=status_code, reason=e.reason)
+            failure = WellKnownSchemeFailure if isinstance(e, WellKnownSchemeError) else WellKnownParseFailure
+            return failure(status_code=status_code, reason=e.reason)
 
         if not host:
             diagnostics.status.well_known = StatusEnum.ERROR
@@ -54,12 +54,12 @@ class DiagnosticInfo:
 
     def error(self, comment: str, front_pad: str = "   ") -> None:
         """Add an error message to diagnostic results."""
-        self.list_of_results.extend([f"{front_pad}{comment}"])
+        self.list_of_results.append(f"{front_pad}{comment}")
 
     def add(self, comment: str, front_pad: str = "   ") -> None:
         """Add a diagnostic message if diagnostics are enabled."""
         if self.diagnostics_enabled:
-            self.list_of_results.extend([f"{front_pad}{comment}"])
+            self.list_of_results.append(f"{front_pad}{comment}")
 
     def mark_step_num(self, step_num: str, comment: str = "", front_pad: str = "") -> None:
         """Record the start of a new discovery step."""
@@ -95,7 +95,7 @@ class SignatureVerifyResult(Enum):
     UNKNOWN = auto()
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ServerKey:
     """
     Server signing key in both encoded and decoded forms.
@@ -113,7 +113,7 @@ class ServerKey:
         object.__setattr__(self, "decoded_key", decode_base64(self.encoded_key))
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class KeyContainer:
     """Container for a server key and its validity period."""
 
@@ -140,7 +140,7 @@ class KeyContainer:
         self.valid_until_ts = valid_until_ts if valid_until_ts is not None else int(key_data.get("expired_ts", 0))
 
 
-@dataclass
+@dataclass(slots=True)
 class ServerVerifyKeys:
     """
     Complete set of verification keys for a server.
@@ -16,13 +16,15 @@ to maintain backward compatibility with the original utils.py module.
 
 from .bitmap_progress import BitmapProgressBar, BitmapProgressBarStyle, ProgressBar
 from .colors import Colors
-from .display import DataSet, DisplayLineColumnConfig, Justify, pad
+from .display import DataSet, DisplayLineColumnConfig, Justify, pad, render_table_header
 from .formatting import (
     add_color,
     bold,
     br,
     combine_lines_to_fit_event,
     combine_lines_to_fit_event_html,
+    iter_lines_to_fit_event,
+    pretty_json,
     wrap_in_code_tags,
     wrap_in_details,
 )
@@ -48,8 +50,11 @@ __all__ = [
     "extract_max_value_len_from_dict",
     "full_dict_copy",
     "get_domain_from_id",
+    "iter_lines_to_fit_event",
     "pad",
+    "pretty_json",
     "pretty_print_timestamp",
+    "render_table_header",
     "round_down",
     "round_half_up",
     "round_up",
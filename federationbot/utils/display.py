@@ -205,6 +205,20 @@ def pad(
     return padding + orig_string if front else orig_string + padding
 
 
+def render_table_header(*columns: DisplayLineColumnConfig) -> str:
+    """
+    Render the header line of a space separated table and the delimiter under it.
+
+    Args:
+        columns: The columns in display order, already sized to their data
+
+    Returns:
+        The header and delimiter lines, each ending in a new line
+    """
+    header_line = " ".join(column.pad() for column in columns)
+    return f"{header_line}\n{'-' * len(header_line)}\n"
+
+
 class DataSet:
     """
     Hold and format a collection of data with optional headers and delimiters.
@@ -271,7 +285,7 @@ class DataSet:
         Returns:
             String of delimiter characters matching column width
         """
-        return f"{pad('', pad_to=self.dc.size, pad_with=self.vert_delimiter)}"
+        return self.vert_delimiter * self.dc.size
 
     def _recalculate_column_width(self) -> None:
         for line in self.preliminary_data:
@@ -291,7 +305,7 @@ class DataSet:
         self._recalculate_column_width()
         self.final_data = []
         for line in self.preliminary_data:
-            self.final_data.extend([f"{self.dc.pad(line)}"])
+            self.final_data.append(f"{self.dc.pad(line)}")
 
     def load_fresh_data(self, new_data: list[str]) -> None:
         """
@@ -7,11 +7,14 @@ size limitations, including:
 - Color application
 - Message chunking for large content
 - Details/summary tag wrapping
+- Indented JSON for raw response display
 """
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Iterable, Iterator
+
+import orjson
 
 if TYPE_CHECKING:
     from .colors import Colors
@@ -77,32 +80,54 @@ def combine_lines_to_fit_event(
     Returns:
         List of strings, each within message size limit
     """
-    if not list_of_all_lines:
-        return []
+    return list(iter_lines_to_fit_event(list_of_all_lines, header_line, insert_new_lines))
+
+
+def iter_lines_to_fit_event(
+    lines: Iterable[str],
+    header_line: str | None,
+    insert_new_lines: bool = False,
+) -> Iterator[str]:
+    """
+    Combine strings into message-sized chunks, yielding each chunk as soon as it is full.
+
+    The lazy form of combine_lines_to_fit_event(). Lines can be produced while the chunks
+    are sent, so only the chunk being filled is held in memory.
+
+    Args:
+        lines: Lines of text to combine
+        header_line: Optional header to prepend to each chunk
+        insert_new_lines: Whether to add newlines between lines
 
+    Yields:
+        Strings, each within message size limit
+    """
     newline = "\n" if insert_new_lines else ""
     header = f"{header_line}{newline}" if header_line else ""
     header_size = len(header)
+    # Read on every line, a local is cheaper to look up in the loop than the module constant
+    max_size = MAX_EVENT_SIZE_FOR_SENDING
 
-    result = []
     current_chunk = [header] if header else []
     current_size = header_size
+    has_lines = False
 
-    for line in list_of_all_lines:
+    for line in lines:
         line_with_nl = f"{line}{newline}"
         line_size = len(line_with_nl)
 
-        if current_size + line_size > MAX_EVENT_SIZE_FOR_SENDING:
-            result.append("".join(current_chunk))
+        # A chunk holding only the header has nothing to flush, an oversized line goes in as is
+        if current_size + line_size > max_size and current_size > header_size:
+            yield "".join(current_chunk)
             current_chunk = [header] if header else []
             current_size = header_size
 
         current_chunk.append(line_with_nl)
         current_size += line_size
+        has_lines = True
 
-    if current_chunk:
-        result.append("".join(current_chunk))
-    return result
+    if has_lines:
+        yield "".join(current_chunk)
 
 
 def combine_lines_to_fit_event_html(
@@ -146,6 +171,7 @@ def combine_lines_to_fit_event_html(
     pre_start = "<pre>" if apply_pre_tags else ""
     pre_end = "</pre>" if apply_pre_tags else ""
     chunk_overhead = len(pre_start) + len(rendered_headers) + len(pre_end)
+    max_size = MAX_EVENT_SIZE_FOR_SENDING
 
     result = []
     current_chunk = [pre_start, rendered_headers]
@@ -154,7 +180,7 @@ def combine_lines_to_fit_event_html(
     for rendered_line in rendered_lines:
         line_size = len(rendered_line)
 
-        if current_size + line_size > MAX_EVENT_SIZE_FOR_SENDING:
+        if current_size + line_size > max_size and current_size > chunk_overhead:
             current_chunk.append(pre_end)
             result.append("".join(current_chunk))
             current_chunk = [pre_start, rendered_headers]
@@ -170,6 +196,19 @@ def combine_lines_to_fit_event_html(
     return result
 
 
+def pretty_json(data: Any) -> str:
+    """
+    Render JSON data indented for display.
+
+    The stdlib encoder falls back to pure Python once indent is set, which is slow on
+    large responses like notary keys. orjson indents in C, at a fixed 2 spaces.
+
+    Returns:
+        The JSON as an indented string
+    """
+    return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+
+
 def wrap_in_code_block_markdown(existing_buffer: str) -> str:
     """
     Wrap a string with Markdown code block tags.
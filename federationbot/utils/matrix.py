@@ -2,14 +2,29 @@
 
 from __future__ import annotations
 
+from typing import Final
+from functools import lru_cache
+import html
+
 from mautrix.types import Format, MessageType, TextMessageEventContent
 from mautrix.util import markdown
 
+from .formatting import wrap_in_code_block_markdown
+
+# The leading character of a Matrix identifier decides what kind of identifier it is. The command
+# argument parsers run on every message, so they share this single lookup instead of chained checks
+_SIGIL_KIND: Final[dict[str, str]] = {"$": "event", "!": "room", "#": "alias", "@": "mxid"}
+_ROOM_KINDS: Final[frozenset[str]] = frozenset(("room", "alias"))
 
+
+# Rooms have far more members than servers, so the same few domains come up again and again
+@lru_cache(maxsize=65536)
 def get_domain_from_id(string: str) -> str:
     """
     Extract domain portion from a Matrix ID.
 
+    Results are cached, as this is called for every member when building lists of hosts.
+
     Example:
         "@user:example.com" -> "example.com"
 
@@ -19,6 +34,19 @@ def get_domain_from_id(string: str) -> str:
     return string.split(":", 1)[1]
 
 
+def classify_id(maybe_id: str) -> str | None:
+    """
+    Determine the kind of Matrix identifier from its leading sigil.
+
+    Example:
+        "!room:example.com" -> "room"
+
+    Returns:
+        One of "event", "room", "alias" or "mxid", None if there is no known sigil
+    """
+    return _SIGIL_KIND.get(maybe_id[:1])
+
+
 def is_event_id(maybe_event_id: str) -> str | None:
     """
     Check if a string is a valid event ID.
@@ -26,10 +54,7 @@ def is_event_id(maybe_event_id: str) -> str | None:
     Returns:
         Event ID if valid, None otherwise
     """
-    if maybe_event_id.startswith("$"):
-        return maybe_event_id
-
-    return None
+    return maybe_event_id if _SIGIL_KIND.get(maybe_event_id[:1]) == "event" else None
 
 
 def is_room_id(maybe_room_id: str) -> str | None:
@@ -39,10 +64,7 @@ def is_room_id(maybe_room_id: str) -> str | None:
     Returns:
         Room ID if valid, None otherwise
     """
-    if maybe_room_id.startswith("!") and ":" in maybe_room_id:
-        return maybe_room_id
-
-    return None
+    return maybe_room_id if _SIGIL_KIND.get(maybe_room_id[:1]) == "room" and ":" in maybe_room_id else None
 
 
 def is_room_alias(maybe_room_alias: str) -> str | None:
@@ -52,10 +74,7 @@ def is_room_alias(maybe_room_alias: str) -> str | None:
     Returns:
         Room alias if valid, None otherwise
     """
-    if maybe_room_alias.startswith("#") and ":" in maybe_room_alias:
-        return maybe_room_alias
-
-    return None
+    return maybe_room_alias if _SIGIL_KIND.get(maybe_room_alias[:1]) == "alias" and ":" in maybe_room_alias else None
 
 
 def is_room_id_or_alias(maybe_room: str) -> str | None:
@@ -65,10 +84,7 @@ def is_room_id_or_alias(maybe_room: str) -> str | None:
     Returns:
         Room ID or alias if valid, None otherwise
     """
-    result = is_room_id(maybe_room)
-    if result:
-        return result
-    return is_room_alias(maybe_room)
+    return maybe_room if _SIGIL_KIND.get(maybe_room[:1]) in _ROOM_KINDS and ":" in maybe_room else None
 
 
 def is_mxid(maybe_mxid: str) -> str | None:
@@ -78,7 +94,15 @@ def is_mxid(maybe_mxid: str) -> str | None:
     Returns:
         Matrix ID if valid, None otherwise
     """
-    return maybe_mxid if maybe_mxid.startswith("@") else None
+    # Callers go straight on to take the domain from it, so it must have one
+    return maybe_mxid if _SIGIL_KIND.get(maybe_mxid[:1]) == "mxid" and ":" in maybe_mxid else None
+
+
+# Pages can be close to the event size limit, so only keep a few. The renderer is pure, and the same
+# page is rendered again whenever a command is repeated or a message is edited to unchanged text
+@lru_cache(maxsize=64)
+def _render_markdown(message: str, allow_html: bool) -> str:
+    return markdown.render(message, allow_html=allow_html)
 
 
 def make_into_text_event(message: str, allow_html: bool = False, ignore_body: bool = False) -> TextMessageEventContent:
@@ -92,5 +116,24 @@ def make_into_text_event(message: str, allow_html: bool = False, ignore_body: bo
         msgtype=MessageType.NOTICE,
         body=message if not ignore_body else "no alt text available",
         format=Format.HTML,
-        formatted_body=markdown.render(message, allow_html=allow_html),
+        formatted_body=_render_markdown(message, allow_html),
+    )
+
+
+def make_into_code_block_event(message: str) -> TextMessageEventContent:
+    """
+    Create a TextMessageEventContent object showing the message as a code block.
+
+    The HTML for a code block is built directly rather than running the Markdown renderer
+    over it, as only the content needs escaping. Meant for progress displays that are
+    edited over and over.
+
+    Returns:
+        TextMessageEventContent object
+    """
+    return TextMessageEventContent(
+        msgtype=MessageType.NOTICE,
+        body=wrap_in_code_block_markdown(message),
+        format=Format.HTML,
+        formatted_body=f'<pre><code class="language-text">{html.escape(message)}\n</code></pre>\n' if message else "",
     )
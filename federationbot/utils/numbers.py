@@ -19,13 +19,19 @@ def is_int(maybe_int: str) -> int | None:
     Returns:
         Integer if valid, None otherwise
     """
+    # Check the digits up front, as letting int() raise for every non-number is the slow path. int() also
+    # allows surrounding whitespace and underscores between digits, so only those few fall back to it
+    maybe_int = maybe_int.strip()
+    digits = maybe_int[1:] if maybe_int[:1] in ("-", "+") else maybe_int
+    if digits.isdecimal():
+        return int(maybe_int)
+    if "_" not in digits:
+        return None
     try:
-        result = int(maybe_int)
+        return int(maybe_int)
     except ValueError:
         return None
 
-    return result
-
 
 def round_up(n: float, decimals: int = 0) -> float:
     """
@@ -8,12 +8,19 @@ Functions for handling time-related operations:
 
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import datetime, timedelta
+from functools import lru_cache
 
+# Naive, so the rendered string carries no offset. Everything displayed from here is labelled UTC
+_UNIX_EPOCH_UTC = datetime(1970, 1, 1)  # noqa: DTZ001
 
+
+@lru_cache(maxsize=4096)
 def pretty_print_timestamp(timestamp: int) -> str:
     """
-    Convert millisecond timestamp to human readable datetime string.
+    Convert millisecond timestamp to human readable UTC datetime string.
+
+    Cached, as the same key expiry timestamps recur across many servers in one render.
 
     Args:
         timestamp: Unix timestamp in milliseconds
@@ -21,4 +28,5 @@ def pretty_print_timestamp(timestamp: int) -> str:
     Returns:
         Human readable datetime string
     """
-    return str(datetime.fromtimestamp(float(timestamp / 1000)))  # noqa: DTZ006
+    # Adding to the epoch is exact to the millisecond and skips the local timezone lookup of fromtimestamp()
+    return (_UNIX_EPOCH_UTC + timedelta(milliseconds=timestamp)).isoformat(sep=" ")